@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-call latency of a fresh AsyncClient per request versus the
+shared, pooled client used by make_goodday_request.
+
+    python benchmarks/bench_http_client.py --calls 200
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import time
+
+import httpx
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from mock_goodday_server import MockGooddayServer  # noqa: E402
+
+
+def summarize(label: str, samples: list[float], connections: int) -> None:
+    samples_ms = sorted(s * 1000 for s in samples)
+    p95 = samples_ms[int(len(samples_ms) * 0.95) - 1]
+    print(
+        f"{label:<22} mean={statistics.mean(samples_ms):7.2f}ms "
+        f"p50={statistics.median(samples_ms):7.2f}ms p95={p95:7.2f}ms "
+        f"connections={connections}"
+    )
+
+
+async def per_call_client(url: str, calls: int) -> list[float]:
+    samples = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        async with httpx.AsyncClient() as client:
+            response = await client.get(url, headers={"gd-api-token": "bench"}, timeout=30.0)
+            response.raise_for_status()
+            response.json()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+async def pooled_client(calls: int) -> list[float]:
+    from goodday_mcp.http_client import aclose_clients
+    from goodday_mcp.main import make_goodday_request
+
+    samples = []
+    try:
+        for _ in range(calls):
+            start = time.perf_counter()
+            await make_goodday_request("users")
+            samples.append(time.perf_counter() - start)
+    finally:
+        await aclose_clients()
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.0, help="Mock server latency in seconds")
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    with MockGooddayServer(latency=args.latency) as server:
+        os.environ["GOODDAY_API_BASE"] = server.base_url
+        os.environ.setdefault("GOODDAY_API_TOKEN", "bench")
+
+        before = server.connection_count
+        samples = asyncio.run(per_call_client(f"{server.base_url}/users", args.calls))
+        summarize("AsyncClient per call", samples, server.connection_count - before)
+
+        before = server.connection_count
+        samples = asyncio.run(pooled_client(args.calls))
+        summarize("shared pooled client", samples, server.connection_count - before)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+End-to-end benchmark of every MCP tool against the local mock Goodday API.
+
+Each registered tool is called through the MCP tool dispatcher with sample
+arguments, and the suite reports upstream requests per call, wall time,
+p50/p95 latency and response size. Save a run with --json and pass it to
+--check on a later run to fail when a tool starts making more upstream
+requests (e.g. a new N+1 loop).
+
+    python benchmarks/bench_tools.py --latency 0.02 --iterations 10
+    python benchmarks/bench_tools.py --cold --json baseline.json
+    python benchmarks/bench_tools.py --cold --check baseline.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from mock_goodday_server import add_server_arguments, server_from_args  # noqa: E402
+
+# Sample arguments per tool, valid for the default mock organization
+SCENARIOS = {
+    "get_projects": {},
+    "get_project": {"project_id": "p1"},
+    "create_project": {"name": "Benchmark project", "created_by_user_id": "u0", "project_template_id": "tpl0"},
+    "get_project_tasks": {"project_id": "p1", "subfolders": True},
+    "get_user_assigned_tasks": {"user_id": "u1"},
+    "get_user_action_required_tasks": {"user_id": "u1"},
+    "get_task": {"task_id": "p1t3"},
+    "create_task": {"project_id": "p1", "title": "Benchmark task", "from_user_id": "u0", "to_user_id": "u1"},
+    "update_task_status": {"task_id": "p1t3", "user_id": "u0", "status_id": "s-progress"},
+    "add_task_comment": {"task_id": "p1t3", "user_id": "u0", "message": "Benchmark comment"},
+    "get_users": {},
+    "get_user": {"user_id": "u1"},
+    "get_project_users": {"project_id": "p1"},
+    "get_task_details": {"task_short_id": "P3-6", "project_name": "Project 3"},
+    "get_task_messages": {"task_short_id": "P5-4"},
+    "get_goodday_sprint_tasks": {"project_name": "Project 2", "sprint_name": "101"},
+    "get_goodday_sprint_summary": {"project_name": "Project 2", "sprint_name": "Sprint 100"},
+    "get_goodday_smart_query": {"query": "show tasks assigned to user1@example.com"},
+    "search_goodday_tasks": {"query": "payment report", "limit": 10},
+    "search_project_documents": {"project_name": "Project 4", "include_content": True},
+    "get_document_content": {"document_id": "p4d1"},
+    "get_server_diagnostics": {},
+}
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of a non-empty sample list."""
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(len(ordered) * fraction) - 1)]
+
+
+def reset_caches(main) -> None:
+    """Forget everything the server has cached in memory, as after a restart."""
+    main.tenants.clear()
+
+
+async def run_tool(main, server, name: str, arguments: dict, iterations: int, cold: bool) -> dict:
+    latencies, requests, sizes = [], [], []
+    errors = 0
+    start = time.perf_counter()
+    for _ in range(iterations):
+        if cold:
+            reset_caches(main)
+        before = server.request_count
+        call_start = time.perf_counter()
+        try:
+            content = await main.mcp.call_tool(name, arguments)
+            sizes.append(sum(len(getattr(item, "text", "").encode("utf-8")) for item in content))
+        except Exception as e:
+            errors += 1
+            sizes.append(0)
+            logging.getLogger(__name__).warning("%s failed: %s", name, e)
+        latencies.append(time.perf_counter() - call_start)
+        requests.append(server.request_count - before)
+    return {
+        "tool": name,
+        "calls": iterations,
+        "first_requests": requests[0],
+        "mean_requests": sum(requests) / iterations,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "wall_ms": (time.perf_counter() - start) * 1000,
+        "mean_bytes": sum(sizes) / iterations,
+        "errors": errors,
+    }
+
+
+async def run_suite(server, args) -> tuple[list[dict], list[str]]:
+    from goodday_mcp import main
+    from goodday_mcp.http_client import aclose_clients
+
+    tool_names = [tool.name for tool in main.mcp._tool_manager.list_tools()]
+    if args.tools:
+        tool_names = [name for name in tool_names if name in args.tools]
+    missing = [name for name in tool_names if name not in SCENARIOS]
+    results = []
+    try:
+        for name in tool_names:
+            if name in SCENARIOS:
+                results.append(await run_tool(main, server, name, SCENARIOS[name], args.iterations, args.cold))
+    finally:
+        await aclose_clients()
+    return results, missing
+
+
+def print_report(results: list[dict], server, wall: float) -> None:
+    header = f"{'tool':<32} {'calls':>5} {'req 1st':>7} {'req/call':>8} {'p50 ms':>8} {'p95 ms':>8} {'wall ms':>9} {'bytes':>8} {'errors':>6}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(
+            f"{r['tool']:<32} {r['calls']:>5} {r['first_requests']:>7} {r['mean_requests']:>8.2f} "
+            f"{r['p50_ms']:>8.2f} {r['p95_ms']:>8.2f} {r['wall_ms']:>9.1f} {r['mean_bytes']:>8.0f} {r['errors']:>6}"
+        )
+    print("-" * len(header))
+    print(
+        f"total: {server.request_count} upstream requests over {server.connection_count} connections "
+        f"({server.injected_errors} injected errors) in {wall:.2f}s"
+    )
+
+
+def check_regressions(results: list[dict], baseline_path: str) -> list[str]:
+    """Return a description of every tool making more upstream requests than in the baseline."""
+    with open(baseline_path) as f:
+        baseline = {r["tool"]: r for r in json.load(f)["results"]}
+    regressions = []
+    for r in results:
+        previous = baseline.get(r["tool"])
+        if previous and r["mean_requests"] > previous["mean_requests"] + 1e-9:
+            regressions.append(
+                f"{r['tool']}: {previous['mean_requests']:.2f} -> {r['mean_requests']:.2f} upstream requests per call"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=10, help="Calls per tool")
+    parser.add_argument("--cold", action="store_true", help="Clear in-memory caches before every call")
+    parser.add_argument("--tools", nargs="*", help="Only benchmark these tools")
+    parser.add_argument("--json", dest="json_path", help="Write results to this file")
+    parser.add_argument("--check", dest="baseline_path", help="Fail if upstream requests per call exceed this baseline")
+    add_server_arguments(parser)
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    logging.getLogger("mcp").setLevel(logging.WARNING)
+
+    with server_from_args(args) as server:
+        os.environ["GOODDAY_API_BASE"] = server.base_url
+        os.environ["GOODDAY_API_TOKEN"] = "bench"
+        os.environ["GOODDAY_SEARCH_URL"] = server.search_url
+        os.environ["GOODDAY_SEARCH_BEARER_TOKEN"] = "bench"
+        # Measure the in-memory behaviour only; the on-disk cache would carry over between runs
+        os.environ.pop("GOODDAY_CACHE_PATH", None)
+
+        start = time.perf_counter()
+        results, missing = asyncio.run(run_suite(server, args))
+        print_report(results, server, time.perf_counter() - start)
+
+    if missing:
+        print(f"no benchmark scenario for: {', '.join(missing)}")
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=2)
+    if args.baseline_path:
+        regressions = check_regressions(results, args.baseline_path)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions or missing:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,472 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Goodday API used by the benchmarks.
+
+Serves a deterministic synthetic organization over HTTP/1.1 with keep-alive,
+with configurable latency, organization size and error injection, plus a
+stand-in for the search webhook at /search. Run it directly to point a
+development server at it:
+
+    python benchmarks/mock_goodday_server.py --port 8765 --latency 0.05
+    GOODDAY_API_BASE=http://127.0.0.1:8765/2.0 GOODDAY_API_TOKEN=test goodday-mcp
+"""
+
+import argparse
+import json
+import random
+import socket
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+STATUSES = [
+    {"id": "s-open", "name": "Open", "isClosed": False},
+    {"id": "s-progress", "name": "In Progress", "isClosed": False},
+    {"id": "s-review", "name": "In Review", "isClosed": False},
+    {"id": "s-done", "name": "Done", "isClosed": True},
+]
+TASK_TYPES = [{"id": "tt-task", "name": "Task"}, {"id": "tt-bug", "name": "Bug"}, {"id": "tt-story", "name": "Story"}]
+WORDS = [
+    "login", "payment", "report", "export", "search", "cache", "sync", "api", "dashboard", "email",
+    "invoice", "upload", "profile", "billing", "timeout", "mobile", "webhook", "import", "audit", "onboarding",
+]
+
+
+def build_org(
+    users: int = 20,
+    projects: int = 10,
+    sprints_per_project: int = 2,
+    tasks_per_project: int = 25,
+    messages_per_task: int = 1,
+    documents_per_project: int = 3,
+    seed: int = 7,
+) -> dict:
+    """Build a deterministic synthetic organization.
+
+    Each project gets sprint sub-projects (systemType PROJECT, named "Sprint N")
+    and its tasks are spread across the project and its sprints.
+    """
+    rng = random.Random(seed)
+    org = {"users": [], "projects": [], "tasks": {}, "messages": {}, "documents": {}}
+    user_count = max(users, 1)
+    for u in range(users):
+        org["users"].append({
+            "id": f"u{u}",
+            "name": f"User {u}",
+            "email": f"user{u}@example.com",
+            "role": {"name": "Member"},
+            "status": "active",
+        })
+    for p in range(projects):
+        project_id = f"p{p}"
+        org["projects"].append({
+            "id": project_id,
+            "name": f"Project {p}",
+            "systemType": "FOLDER",
+            "parentProjectId": None,
+            "status": {"name": "Active"},
+            "health": "green",
+            "progress": rng.randint(0, 100),
+        })
+        org["tasks"][project_id] = []
+        containers = [project_id]
+        for s in range(sprints_per_project):
+            sprint_id = f"{project_id}s{s}"
+            org["projects"].append({
+                "id": sprint_id,
+                "name": f"Sprint {100 + s}",
+                "systemType": "PROJECT",
+                "parentProjectId": project_id,
+                "startDate": f"2025-{1 + s % 12:02d}-01",
+                "endDate": f"2025-{1 + s % 12:02d}-14",
+                "status": {"name": "Active"},
+            })
+            org["tasks"][sprint_id] = []
+            containers.append(sprint_id)
+        for t in range(tasks_per_project):
+            task_id = f"{project_id}t{t}"
+            container = containers[t % len(containers)]
+            status = STATUSES[t % len(STATUSES)]
+            title = " ".join(rng.sample(WORDS, 3))
+            org["tasks"][container].append({
+                "id": task_id,
+                "shortId": f"P{p}-{t}",
+                "name": f"Task {t}: {title}",
+                "projectId": container,
+                "status": {"id": status["id"], "name": status["name"]},
+                "taskType": TASK_TYPES[t % len(TASK_TYPES)],
+                "project": {"name": f"Project {p}"},
+                "assignedToUserId": f"u{t % user_count}",
+                "actionRequiredUserId": f"u{(t + 1) % user_count}",
+                "createdByUserId": f"u{(t + 2) % user_count}",
+                "priority": t % 10 + 1,
+                "startDate": f"2025-01-{1 + t % 28:02d}",
+                "endDate": f"2025-02-{1 + t % 28:02d}",
+                "closed": status["isClosed"],
+                "momentClosed": "2025-02-01T00:00:00Z" if status["isClosed"] else None,
+                "recentActivityMoment": f"2025-01-{1 + (messages_per_task - 1) % 28:02d}T10:00:00Z",
+            })
+            org["messages"][task_id] = [
+                {
+                    "id": f"{task_id}m{m}",
+                    "message": f"{'Description' if m == 0 else 'Comment'} {m} of task {t}: {title}",
+                    "fromUserId": f"u{(t + m) % user_count}",
+                    "toUserId": f"u{t % user_count}",
+                    "dateCreated": f"2025-01-{1 + m % 28:02d}T10:00:00Z",
+                }
+                for m in range(messages_per_task)
+            ]
+        for d in range(documents_per_project):
+            document_id = f"{project_id}d{d}"
+            org["documents"][document_id] = {
+                "id": document_id,
+                "name": f"Document {d}",
+                "projectId": project_id,
+                "createdByUserId": f"u{d % user_count}",
+                "momentCreated": "2025-01-01T00:00:00Z",
+                "content": f"Content of document {d} in project {p}. " * 20,
+            }
+    return org
+
+
+class MockGooddayServer:
+    """Threaded mock Goodday API.
+
+    Args:
+        latency: Seconds added to every request
+        jitter: Further uniformly random seconds added to every request
+        error_rate: Fraction of requests answered with HTTP 503
+        rate_limit_rate: Fraction of requests answered with HTTP 429 and a Retry-After header
+        retry_after: Value of the Retry-After header sent with injected 429s
+        org: Organization from build_org; a default one is built if omitted
+        seed: Seed for latency jitter and error injection
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        retry_after: float = 0.1,
+        org: dict = None,
+        seed: int = 7,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.org = org or build_org()
+        self.request_count = 0
+        self.connection_count = 0
+        self.injected_errors = 0
+        self.requests_by_path: dict[str, int] = {}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._next_id = 0
+        self._tasks_by_id = {task["id"]: task for tasks in self.org["tasks"].values() for task in tasks}
+        self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def base_url(self) -> str:
+        return f"{self.url}/2.0"
+
+    @property
+    def search_url(self) -> str:
+        return f"{self.url}/search"
+
+    def start(self) -> "MockGooddayServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "MockGooddayServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def reset_counters(self) -> None:
+        with self._lock:
+            self.request_count = 0
+            self.injected_errors = 0
+            self.requests_by_path.clear()
+
+    def _subtree(self, project_id: str) -> list[str]:
+        """Return a project ID and the IDs of all its descendants."""
+        ids = [project_id]
+        for project in self.org["projects"]:
+            if project.get("parentProjectId") == project_id:
+                ids.extend(self._subtree(project["id"]))
+        return ids
+
+    def _new_id(self, prefix: str) -> str:
+        with self._lock:
+            self._next_id += 1
+            return f"{prefix}{self._next_id}"
+
+    def _activity_moment(self) -> str:
+        """Return a fresh timestamp for a task's recentActivityMoment after a write."""
+        return datetime.now(timezone.utc).isoformat(timespec="microseconds")
+
+    def route(self, method: str, path: str, body: dict = None):
+        """Resolve an API request to a (status, payload) pair."""
+        split = urlsplit(path)
+        query = parse_qs(split.query)
+        parts = [p for p in split.path.split("/") if p]
+        if parts[:1] == ["search"]:
+            return 200, self._search(query)
+        parts = parts[1:]  # drop the "2.0" prefix
+        body = body or {}
+        org = self.org
+
+        def flag(name: str) -> bool:
+            return query.get(name, ["false"])[0] == "true"
+
+        if method == "POST" and parts == ["tasks"]:
+            project_id = body.get("projectId")
+            if project_id not in org["tasks"]:
+                return 404, {"error": "Project not found"}
+            task_id = self._new_id("t-new")
+            task = {
+                "id": task_id,
+                "shortId": task_id.upper(),
+                "name": body.get("title"),
+                "projectId": project_id,
+                "status": {"id": STATUSES[0]["id"], "name": STATUSES[0]["name"]},
+                "assignedToUserId": body.get("toUserId"),
+                "priority": body.get("priority"),
+                "closed": False,
+                "recentActivityMoment": self._activity_moment(),
+            }
+            org["tasks"][project_id].append(task)
+            org["messages"][task_id] = [{"id": f"{task_id}m0", "message": body.get("message", ""), "fromUserId": body.get("fromUserId")}]
+            self._tasks_by_id[task_id] = task
+            return 200, task
+        if method == "POST" and parts == ["projects", "new-project"]:
+            project = {
+                "id": self._new_id("p-new"),
+                "name": body.get("name"),
+                "systemType": "FOLDER",
+                "parentProjectId": body.get("parentProjectId"),
+            }
+            org["projects"].append(project)
+            org["tasks"][project["id"]] = []
+            return 200, project
+        if method in ("POST", "PUT") and len(parts) == 3 and parts[0] == "task":
+            task = self._tasks_by_id.get(parts[1])
+            if not task:
+                return 404, {"error": "Task not found"}
+            if parts[2] == "status":
+                status = next((s for s in STATUSES if s["id"] == body.get("statusId")), STATUSES[0])
+                task["status"] = {"id": status["id"], "name": status["name"]}
+                task["closed"] = status["isClosed"]
+                task["momentClosed"] = "2025-03-01T00:00:00Z" if status["isClosed"] else None
+            if body.get("message"):
+                org["messages"].setdefault(task["id"], []).append(
+                    {"id": self._new_id("m"), "message": body["message"], "fromUserId": body.get("userId")}
+                )
+            task["recentActivityMoment"] = self._activity_moment()
+            return 200, {"ok": True}
+        if method != "GET":
+            return 404, {"error": f"Unknown endpoint: {path}"}
+
+        if parts == ["users"]:
+            return 200, org["users"]
+        if parts == ["projects"]:
+            if flag("rootOnly"):
+                return 200, [p for p in org["projects"] if not p.get("parentProjectId")]
+            return 200, org["projects"]
+        if len(parts) == 2 and parts[0] == "user":
+            user = next((u for u in org["users"] if u["id"] == parts[1]), None)
+            return (200, user) if user else (404, {"error": "User not found"})
+        if len(parts) == 3 and parts[0] == "user" and parts[2] in ("assigned-tasks", "action-required-tasks"):
+            field = "assignedToUserId" if parts[2] == "assigned-tasks" else "actionRequiredUserId"
+            tasks = [t for t in self._tasks_by_id.values() if t.get(field) == parts[1]]
+            if not flag("closed"):
+                tasks = [t for t in tasks if not t.get("closed")]
+            return 200, tasks
+        if len(parts) == 2 and parts[0] == "project":
+            project = next((p for p in org["projects"] if p["id"] == parts[1]), None)
+            return (200, project) if project else (404, {"error": "Project not found"})
+        if len(parts) == 3 and parts[0] == "project" and parts[2] == "users":
+            return 200, org["users"][:5]
+        if len(parts) == 3 and parts[0] == "project" and parts[2] == "tasks":
+            if parts[1] not in org["tasks"]:
+                return 404, {"error": "Project not found"}
+            project_ids = self._subtree(parts[1]) if flag("subfolders") else [parts[1]]
+            tasks = [t for project_id in project_ids for t in org["tasks"].get(project_id, [])]
+            if not flag("closed"):
+                tasks = [t for t in tasks if not t.get("closed")]
+            return 200, tasks
+        if len(parts) == 3 and parts[0] == "project" and parts[2] == "documents":
+            project_ids = set(self._subtree(parts[1]) if flag("subfolders") else [parts[1]])
+            return 200, [
+                {k: v for k, v in doc.items() if k != "content"}
+                for doc in org["documents"].values()
+                if doc["projectId"] in project_ids
+            ]
+        if len(parts) == 2 and parts[0] == "document":
+            document = org["documents"].get(parts[1])
+            return (200, document) if document else (404, {"error": "Document not found"})
+        if len(parts) == 2 and parts[0] == "task":
+            task = self._tasks_by_id.get(parts[1])
+            return (200, task) if task else (404, {"error": "Task not found"})
+        if len(parts) == 3 and parts[0] == "task" and parts[2] == "messages":
+            return 200, org["messages"].get(parts[1], [])
+        return 404, {"error": f"Unknown endpoint: {path}"}
+
+    def _search(self, query: dict) -> dict:
+        """Keyword match over task names standing in for the vector search webhook."""
+        terms = query.get("query", [""])[0].lower().split()
+        limit = int(query.get("limit", ["10"])[0])
+        include_closed = query.get("include_closed", ["false"])[0].lower() == "true"
+        results = []
+        for task in self._tasks_by_id.values():
+            if task.get("closed") and not include_closed:
+                continue
+            name = (task.get("name") or "").lower()
+            score = sum(term in name for term in terms) / max(len(terms), 1)
+            if score:
+                results.append({**task, "score": score})
+        results.sort(key=lambda t: t["score"], reverse=True)
+        return {"results": results[:limit]}
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                with server._lock:
+                    server.connection_count += 1
+
+            def _respond(self, method: str):
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                with server._lock:
+                    server.request_count += 1
+                    path = urlsplit(self.path).path
+                    server.requests_by_path[path] = server.requests_by_path.get(path, 0) + 1
+                    roll = server._rng.random()
+                    delay = server.latency + server._rng.uniform(0, server.jitter)
+                if delay:
+                    time.sleep(delay)
+                headers = {}
+                if roll < server.rate_limit_rate:
+                    status, payload = 429, {"error": "Rate limit exceeded"}
+                    headers["Retry-After"] = str(server.retry_after)
+                elif roll < server.rate_limit_rate + server.error_rate:
+                    status, payload = 503, {"error": "Service unavailable"}
+                else:
+                    try:
+                        status, payload = server.route(method, self.path, json.loads(raw) if raw else None)
+                    except ValueError:
+                        status, payload = 400, {"error": "Invalid JSON body"}
+                if status in (429, 503):
+                    with server._lock:
+                        server.injected_errors += 1
+                encoded = json.dumps(payload).encode()
+                try:
+                    self.send_response(status)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(encoded)))
+                    for name, value in headers.items():
+                        self.send_header(name, value)
+                    self.end_headers()
+                    self.wfile.write(encoded)
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client cancelled the request (e.g. an early-stopping scan)
+                    self.close_connection = True
+
+            def do_GET(self):
+                self._respond("GET")
+
+            def do_POST(self):
+                self._respond("POST")
+
+            def do_PUT(self):
+                self._respond("PUT")
+
+            def do_DELETE(self):
+                self._respond("DELETE")
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def add_server_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the latency, organization size and error injection options of the mock server."""
+    parser.add_argument("--latency", type=float, default=0.0, help="Per-request latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random per-request latency in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests failing with 503")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of requests failing with 429")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--projects", type=int, default=10)
+    parser.add_argument("--sprints", type=int, default=2, help="Sprints per project")
+    parser.add_argument("--tasks", type=int, default=25, help="Tasks per project")
+    parser.add_argument("--messages", type=int, default=1, help="Messages per task")
+    parser.add_argument("--documents", type=int, default=3, help="Documents per project")
+
+
+def server_from_args(args: argparse.Namespace, host: str = "127.0.0.1", port: int = 0) -> MockGooddayServer:
+    """Build a mock server from options added by add_server_arguments."""
+    org = build_org(
+        users=args.users,
+        projects=args.projects,
+        sprints_per_project=args.sprints,
+        tasks_per_project=args.tasks,
+        messages_per_task=args.messages,
+        documents_per_project=args.documents,
+    )
+    return MockGooddayServer(
+        host,
+        port,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        org=org,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local mock Goodday API server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    add_server_arguments(parser)
+    args = parser.parse_args()
+
+    server = server_from_args(args, args.host, args.port)
+    print(f"Mock Goodday API listening on {server.base_url} (search webhook: {server.search_url})")
+    try:
+        server.start()
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Resolution of the Goodday API token a request is made with.
+
+Over stdio the server acts for the single token in GOODDAY_API_TOKEN. Over
+the HTTP transports each client sends its own token in the ``gd-api-token``
+(or ``Authorization: Bearer``) header; it is scoped to the tool call so one
+client's upstream requests and cached data never use another's credentials.
+"""
+
+import os
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, Optional
+
+TOKEN_HEADER = "gd-api-token"
+
+_request_token: ContextVar[Optional[str]] = ContextVar("goodday_request_token", default=None)
+_env_token_allowed = True
+
+
+def token_from_headers(headers: Any) -> Optional[str]:
+    """Extract a client's Goodday token from HTTP request headers."""
+    token = (headers.get(TOKEN_HEADER) or "").strip()
+    if token:
+        return token
+    scheme, _, value = (headers.get("authorization") or "").partition(" ")
+    if scheme.lower() == "bearer" and value.strip():
+        return value.strip()
+    return None
+
+
+@contextmanager
+def request_token(token: Optional[str]) -> Iterator[None]:
+    """Use token for Goodday requests made within the enclosed tool call."""
+    reset = _request_token.set(token)
+    try:
+        yield
+    finally:
+        _request_token.reset(reset)
+
+
+def allow_env_token(allowed: bool) -> None:
+    """Set whether requests without a client token fall back to GOODDAY_API_TOKEN."""
+    global _env_token_allowed
+    _env_token_allowed = allowed
+
+
+def current_api_token() -> str:
+    """Return the token for the current request, raising ValueError if there is none."""
+    token = _request_token.get()
+    if token:
+        return token
+    if not _env_token_allowed:
+        raise ValueError(f"A Goodday API token is required: send it in the {TOKEN_HEADER} header")
+    token = os.getenv("GOODDAY_API_TOKEN")
+    if not token:
+        raise ValueError("GOODDAY_API_TOKEN environment variable is required")
+    return token
@@ -0,0 +1,184 @@
+"""
+Async in-memory caching for the Goodday MCP server.
+
+TTLCache serves fresh entries directly, serves stale entries while a single
+background refresh runs, and coalesces concurrent misses for the same key
+onto one in-flight fetch.
+"""
+
+import asyncio
+import logging
+import re
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def compile_pattern(pattern: str) -> re.Pattern:
+    """Compile an endpoint pattern in which '*' matches any text and everything else is literal."""
+    return re.compile("^" + ".*".join(re.escape(part) for part in pattern.split("*")) + "$")
+
+
+class TTLCache:
+    """Keyed async cache with a TTL and a stale-while-revalidate window.
+
+    Args:
+        ttl: Seconds an entry is served without refreshing
+        max_stale: Further seconds an expired entry may be served while it refreshes
+        should_cache: Predicate deciding whether a fetched value is stored
+        max_entries: Entries kept before the least recently stored is dropped; 0 keeps all
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        max_stale: float = 0.0,
+        should_cache: Optional[Callable[[Any], bool]] = None,
+        max_entries: int = 0,
+    ):
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.max_entries = max_entries
+        self._should_cache = should_cache or (lambda value: value is not None)
+        self._entries: dict[str, tuple[float, Any]] = {}
+        self._inflight: dict[str, asyncio.Task] = {}
+        # Bumped on invalidation so fetches started earlier do not store their results
+        self._generation = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    async def get(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached value for key, calling fetch when it is missing or expired."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            age = time.monotonic() - entry[0]
+            if age < self.ttl:
+                self.hits += 1
+                return entry[1]
+            if age < self.ttl + self.max_stale:
+                self.stale_hits += 1
+                self._refresh(key, fetch)
+                return entry[1]
+        self.misses += 1
+        # Shield so a cancelled caller does not cancel the fetch other callers share
+        return await asyncio.shield(self._refresh(key, fetch))
+
+    def peek(self, key: str) -> Any:
+        """Return the cached value for key regardless of age, or None."""
+        entry = self._entries.get(key)
+        return entry[1] if entry is not None else None
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a value as freshly fetched."""
+        if self._should_cache(value):
+            # Re-inserted so the dict stays ordered from least to most recently stored
+            self._entries.pop(key, None)
+            self._entries[key] = (time.monotonic(), value)
+            if self.max_entries:
+                while len(self._entries) > self.max_entries:
+                    del self._entries[next(iter(self._entries))]
+
+    def invalidate(self, pattern: Optional[str] = None) -> None:
+        """Drop entries matching pattern ('*' is a wildcard), or every entry when pattern is None."""
+        self._generation += 1
+        if pattern is None:
+            self._entries.clear()
+            self._inflight.clear()
+            return
+        matcher = compile_pattern(pattern)
+        for key in [key for key in self._entries if matcher.match(key)]:
+            del self._entries[key]
+        for key in [key for key in self._inflight if matcher.match(key)]:
+            del self._inflight[key]
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "inflight": len(self._inflight),
+        }
+
+    def _refresh(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        """Start a fetch for key unless one is already running, and return it."""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._load(key, fetch))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        return task
+
+    async def _load(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        generation = self._generation
+        value = await fetch()
+        if generation == self._generation:
+            self.set(key, value)
+        return value
+
+    def _finish(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled() and task.exception() is not None:
+            # Waiting callers re-raise the error; background refreshes only log it
+            logger.warning("Cache refresh for %s failed: %s", key, task.exception())
+
+
+class SingleFlight:
+    """Coalesce concurrent identical calls onto one in-flight execution.
+
+    Every caller of the same key receives the same result object (or the same
+    exception), so results must be treated as read-only.
+    """
+
+    def __init__(self):
+        self._inflight: dict[str, asyncio.Task] = {}
+        self._waiters: dict[str, int] = {}
+        self.calls = 0
+        self.executions = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Run fn for key, or join the execution already in flight for it."""
+        self.calls += 1
+        task = self._inflight.get(key)
+        if task is None:
+            self.executions += 1
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            self._waiters[key] = 0
+            task.add_done_callback(lambda done: self._finish(key, done))
+        self._waiters[key] += 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            if self._inflight.get(key) is task:
+                self._waiters[key] -= 1
+
+    def forget(self, pattern: str) -> None:
+        """Stop new callers from joining in-flight executions whose key matches pattern."""
+        matcher = compile_pattern(pattern)
+        for key in [key for key in self._inflight if matcher.match(key)]:
+            del self._inflight[key]
+            del self._waiters[key]
+
+    def inflight(self) -> dict[str, int]:
+        """Return the number of callers currently waiting on each in-flight key."""
+        return dict(self._waiters)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "coalesced": self.calls - self.executions,
+            "dedup_ratio": (self.calls - self.executions) / self.calls if self.calls else 0.0,
+            "inflight": self.inflight(),
+        }
+
+    def _finish(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+            del self._waiters[key]
+        if not task.cancelled():
+            task.exception()
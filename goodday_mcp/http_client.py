@@ -0,0 +1,78 @@
+"""
+Shared HTTP client management for the Goodday MCP server.
+
+Each upstream (the Goodday API and the optional search webhook) gets one
+long-lived ``httpx.AsyncClient`` per server process, created lazily on first
+use, so connections are pooled and kept alive across tool calls instead of
+paying a fresh TCP+TLS handshake on every request.
+"""
+
+import os
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+
+import httpx
+
+DEFAULT_TIMEOUT = 30.0
+
+_clients: dict[str, httpx.AsyncClient] = {}
+# Number of MCP sessions currently open; HTTP transports run the lifespan once per session
+_sessions = 0
+
+
+def _env_int(name: str, default: int) -> int:
+    """Read an integer setting from the environment, falling back to default."""
+    try:
+        return int(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    """Read a float setting from the environment, falling back to default."""
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def get_pool_limits() -> httpx.Limits:
+    """Build connection pool limits from the GOODDAY_HTTP_* environment variables."""
+    return httpx.Limits(
+        max_connections=_env_int("GOODDAY_HTTP_MAX_CONNECTIONS", 20),
+        max_keepalive_connections=_env_int("GOODDAY_HTTP_MAX_KEEPALIVE", 10),
+        keepalive_expiry=_env_float("GOODDAY_HTTP_KEEPALIVE_EXPIRY", 30.0),
+    )
+
+
+def get_client(name: str = "goodday") -> httpx.AsyncClient:
+    """Return the shared client for an upstream, creating it on first use."""
+    client = _clients.get(name)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            limits=get_pool_limits(),
+            timeout=_env_float("GOODDAY_HTTP_TIMEOUT", DEFAULT_TIMEOUT),
+        )
+        _clients[name] = client
+    return client
+
+
+async def aclose_clients() -> None:
+    """Close every shared client and release its pooled connections."""
+    clients = list(_clients.values())
+    _clients.clear()
+    for client in clients:
+        await client.aclose()
+
+
+@asynccontextmanager
+async def client_lifespan(server: Any) -> AsyncIterator[dict]:
+    """FastMCP lifespan that closes the shared clients when the last open session ends."""
+    global _sessions
+    _sessions += 1
+    try:
+        yield {}
+    finally:
+        _sessions -= 1
+        if _sessions == 0:
+            await aclose_clients()
@@ -1,22 +1,159 @@
-from typing import Any, Optional, List
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional, List
+import argparse
+import asyncio
+import contextvars
 import httpx
+import logging
 import os
 import re
+import time
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone, timedelta
 from mcp.server.fastmcp import FastMCP
 
-# Initialize FastMCP server
-mcp = FastMCP("goodday-mcp")
+from .auth import allow_env_token, current_api_token, request_token, token_from_headers
+from .cache import TTLCache
+from .http_client import client_lifespan, get_client
+from .mirror import MirrorSync, OrgMirror
+from .name_matcher import NameMatcher
+from .output import (
+    DOCUMENT_CONTENT_FIELDS, DOCUMENT_FIELDS, MESSAGE_FIELDS, PROJECT_FIELDS, SEARCH_RESULT_FIELDS,
+    SPRINT_SUMMARY_TASK_FIELDS, SPRINT_TASK_FIELDS, TASK_DETAIL_FIELDS, TASK_FIELDS, USER_FIELDS,
+    parse_fields, prune, render_json, select, to_json, validate_output_format, wants_json,
+)
+from .pagination import decode_cursor, encode_cursor, fit_json, paginate, truncate_text
+from .persistent_cache import ResponseCache
+from .retry import RetryPolicy, TokenBucket, parse_retry_after, retry_budget
+from .search_index import TaskSearchIndex
+from .sprint_index import SprintIndex
+from .task_index import TaskLocation
+from .task_query import TaskListIndex, parse_date, parse_sort
+from .tenants import Tenant, TenantRegistry
+from .tracing import start_metrics_server, tracer
+from .user_index import UserIndex
+from .vector_search import LocalVectorIndex
+
+logger = logging.getLogger(__name__)
 
 # Constants
-GOODDAY_API_BASE = "https://api.goodday.work/2.0"
+GOODDAY_API_BASE = os.getenv("GOODDAY_API_BASE", "https://api.goodday.work/2.0").rstrip("/")
 USER_AGENT = "goodday-mcp/1.1.0"
+# Total seconds a single tool call may spend waiting to retry upstream requests
+TOOL_CALL_BUDGET = float(os.getenv("GOODDAY_TOOL_TIME_BUDGET", "60"))
+# Maximum number of concurrent upstream requests a single tool fans out to
+FANOUT_CONCURRENCY = max(1, int(os.getenv("GOODDAY_FANOUT_CONCURRENCY", "12")))
+# Users/projects listings are cached for this many seconds, then served stale while refreshing
+DIRECTORY_CACHE_TTL = float(os.getenv("GOODDAY_DIRECTORY_TTL", "300"))
+DIRECTORY_CACHE_MAX_STALE = float(os.getenv("GOODDAY_DIRECTORY_MAX_STALE", "3600"))
+# Client-side request rate per API token (0 disables throttling)
+RATE_LIMIT = float(os.getenv("GOODDAY_RATE_LIMIT", "0"))
+RATE_BURST = float(os.getenv("GOODDAY_RATE_BURST", "10"))
+# In-memory state is kept for at most this many API tokens, evicting the least recently used
+MAX_TENANTS = max(1, int(os.getenv("GOODDAY_MAX_TENANTS", "32")))
+TENANT_IDLE_TTL = float(os.getenv("GOODDAY_TENANT_IDLE_TTL", "3600"))
+# Prefetch the directory and hot task lists of GOODDAY_API_TOKEN in the background at startup
+WARM_UP = os.getenv("GOODDAY_WARMUP", "false").strip().lower() in ("1", "true", "yes")
+WARM_UP_PROJECTS = [p.strip() for p in os.getenv("GOODDAY_WARMUP_PROJECTS", "").split(",") if p.strip()]
+WARM_UP_SPRINTS = max(0, int(os.getenv("GOODDAY_WARMUP_SPRINTS", "1")))
+# search_goodday_tasks backend: "webhook" (GOODDAY_SEARCH_URL), "local" (in-process BM25 index)
+# or "vector" (memory-mapped embeddings at GOODDAY_VECTOR_PATH, requires NumPy)
+SEARCH_BACKEND = os.getenv("GOODDAY_SEARCH_BACKEND", "webhook").strip().lower()
+# Seconds between full re-syncs of the local search index
+SEARCH_INDEX_TTL = float(os.getenv("GOODDAY_SEARCH_INDEX_TTL", "300"))
+# Closest project names offered when a project name is not found or ambiguous
+PROJECT_CANDIDATES = 5
+# Users suggested when a fuzzy user lookup fails; whole-name-word matches list every user they match
+USER_CANDIDATES = 5
+# A user named in a smart query: an email address or a single name word
+USER_PATTERN = r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+|\w+"
+# Task listings are returned this many tasks per page, within this many bytes per response (at least MIN_RESPONSE_BYTES)
+PAGE_SIZE = max(1, int(os.getenv("GOODDAY_PAGE_SIZE", "50")))
+MIN_RESPONSE_BYTES = 1024
+MAX_RESPONSE_BYTES = max(MIN_RESPONSE_BYTES, int(os.getenv("GOODDAY_MAX_RESPONSE_BYTES", "100000")))
+# Seconds a downloaded task listing is paged and filtered without downloading it again, and listings kept per API token
+LISTING_CACHE_TTL = float(os.getenv("GOODDAY_LISTING_TTL", "120"))
+LISTING_CACHE_SIZE = max(1, int(os.getenv("GOODDAY_LISTING_CACHE_SIZE", "8")))
+# Bytes of the response budget kept for the next-page marker or the JSON envelope
+PAGE_FOOTER_BYTES = 300
+
+# Optional on-disk cache of GET responses (enabled by GOODDAY_CACHE_PATH)
+response_cache = ResponseCache.from_env()
+
+# Retries for rate-limited and transient failures
+retry_policy = RetryPolicy(
+    max_attempts=int(os.getenv("GOODDAY_RETRY_MAX_ATTEMPTS", "4")),
+    base_delay=float(os.getenv("GOODDAY_RETRY_BASE_DELAY", "0.5")),
+    max_delay=float(os.getenv("GOODDAY_RETRY_MAX_DELAY", "30")),
+)
+
+class GooddayMCP(FastMCP):
+    """FastMCP server that scopes per-tool-call state: the retry budget, upstream call tracing and the client's API token."""
+
+    async def call_tool(self, name: str, arguments: dict[str, Any]):
+        if mirror_sync:
+            mirror_sync.ensure_started()
+        with retry_budget(TOOL_CALL_BUDGET), tracer.trace_tool(name), request_token(self._client_token()):
+            return await super().call_tool(name, arguments)
+
+    def _client_token(self) -> Optional[str]:
+        """Return the Goodday token sent by an HTTP client, or None over stdio."""
+        try:
+            request = self._mcp_server.request_context.request
+        except LookupError:
+            return None
+        headers = getattr(request, "headers", None)
+        return token_from_headers(headers) if headers is not None else None
+
+@asynccontextmanager
+async def server_lifespan(server: FastMCP) -> AsyncIterator[dict]:
+    """Session lifespan: the shared HTTP clients, plus background work that starts with the first session."""
+    async with client_lifespan(server) as context:
+        # Started without awaiting, so the MCP handshake is not held up
+        start_warm_up()
+        if mirror_sync:
+            mirror_sync.ensure_started()
+        yield context
 
-async def make_goodday_request(endpoint: str, method: str = "GET", data: dict = None, subfolders: bool = True) -> dict[str, Any] | list[Any] | None:
-    """Make a request to the Goodday API with proper error handling."""
-    api_token = os.getenv("GOODDAY_API_TOKEN")
-    if not api_token:
-        raise ValueError("GOODDAY_API_TOKEN environment variable is required")
+# Initialize FastMCP server
+mcp = GooddayMCP("goodday-mcp", lifespan=server_lifespan)
+
+def new_tenant(fingerprint: str) -> Tenant:
+    """Create the in-memory state for a newly seen API token."""
+    return Tenant(
+        fingerprint,
+        # Cache for the organization directory (users and projects listings) visible to the token
+        directory_cache=TTLCache(
+            ttl=DIRECTORY_CACHE_TTL,
+            max_stale=DIRECTORY_CACHE_MAX_STALE,
+            should_cache=lambda value: isinstance(value, list),
+        ),
+        listing_cache=TTLCache(
+            ttl=LISTING_CACHE_TTL,
+            should_cache=lambda value: isinstance(value, TaskListIndex),
+            max_entries=LISTING_CACHE_SIZE,
+        ),
+        rate_limiter=TokenBucket(rate=RATE_LIMIT, burst=RATE_BURST),
+    )
+
+tenants = TenantRegistry(new_tenant, max_tenants=MAX_TENANTS, idle_ttl=TENANT_IDLE_TTL)
+
+def current_tenant() -> Tenant:
+    """Return the in-memory state of the API token the current request is made with."""
+    return tenants.get(current_api_token())
+
+async def make_goodday_request(
+    endpoint: str,
+    method: str = "GET",
+    data: dict = None,
+    subfolders: bool = True,
+    bypass_cache: bool = False
+) -> dict[str, Any] | list[Any] | None:
+    """Make a request to the Goodday API with proper error handling.
+
+    A GET with bypass_cache skips the persistent response cache, but still stores its result there.
+    """
+    api_token = current_api_token()
+    tenant = tenants.get(api_token)
     
     headers = {
         "User-Agent": USER_AGENT,
@@ -34,23 +171,60 @@ async def make_goodday_request(endpoint: str, method: str = "GET", data: dict =
     
     url = f"{GOODDAY_API_BASE}/{endpoint.lstrip('/')}"
     
-    async with httpx.AsyncClient() as client:
+    if method.upper() == "GET":
+        if response_cache and not bypass_cache:
+            cached = response_cache.get(api_token, endpoint)
+            if cached is not None:
+                tenant.observe(endpoint, cached)
+                return cached
+
+        async def fetch():
+            generation = response_cache.generation if response_cache else None
+            result = await _send_goodday_request(tenant, "GET", endpoint, url, headers)
+            if response_cache:
+                response_cache.put(api_token, endpoint, result, generation)
+            return result
+
+        return await tenant.coalescer.do(f"GET {endpoint}", fetch)
+    return await _send_goodday_request(tenant, method, endpoint, url, headers, data)
+
+async def _send_goodday_request(tenant: Tenant, method: str, endpoint: str, url: str, headers: dict, data: dict = None) -> dict[str, Any] | list[Any] | None:
+    """Send a request to the Goodday API, retrying per retry_policy, and parse the JSON response."""
+    client = get_client("goodday")
+    attempt = 0
+    while True:
+        await tenant.rate_limiter.acquire()
+        started = time.perf_counter()
         try:
             if method.upper() == "POST":
-                response = await client.post(url, headers=headers, json=data, timeout=30.0)
+                response = await client.post(url, headers=headers, json=data)
             elif method.upper() == "PUT":
-                response = await client.put(url, headers=headers, json=data, timeout=30.0)
+                response = await client.put(url, headers=headers, json=data)
             elif method.upper() == "DELETE":
-                response = await client.delete(url, headers=headers, timeout=30.0)
+                response = await client.delete(url, headers=headers)
             else:
-                response = await client.get(url, headers=headers, timeout=30.0)
+                response = await client.get(url, headers=headers)
+            tracer.record("goodday", method, endpoint, response.status_code, len(response.content), time.perf_counter() - started)
+
+            if response.is_error and await retry_policy.should_retry(
+                method, attempt, response.status_code, parse_retry_after(response.headers.get("Retry-After"))
+            ):
+                attempt += 1
+                continue
 
             response.raise_for_status()
-            return response.json()
+            result = response.json()
+            if method.upper() == "GET":
+                tenant.observe(endpoint, result)
+            return result
 
         except httpx.HTTPStatusError as e:
             raise Exception(f"HTTP error {e.response.status_code}: {e.response.text}")
         except httpx.RequestError as e:
+            tracer.record("goodday", method, endpoint, None, 0, time.perf_counter() - started)
+            if await retry_policy.should_retry(method, attempt):
+                attempt += 1
+                continue
             raise Exception(f"Request error: {str(e)}")
         except Exception as e:
             raise Exception(f"Unexpected error: {str(e)}")
@@ -74,22 +248,250 @@ async def make_search_request(method: str = "GET", params: dict = None) -> dict:
     
     url = str(search_url).strip()
     
-    async with httpx.AsyncClient() as client:
-        try:
-            if method.upper() == "GET":
-                response = await client.get(url, headers=headers, params=params, timeout=30.0)
-            else:
-                response = await client.request(method.upper(), url, headers=headers, params=params, timeout=30.0)
-            
-            response.raise_for_status()
-            return response.json()
+    client = get_client("search")
+    started = time.perf_counter()
+    try:
+        if method.upper() == "GET":
+            response = await client.get(url, headers=headers, params=params)
+        else:
+            response = await client.request(method.upper(), url, headers=headers, params=params)
+        tracer.record("search", method, "search", response.status_code, len(response.content), time.perf_counter() - started)
         
-        except httpx.HTTPStatusError as e:
-            raise Exception(f"Search API HTTP error {e.response.status_code}: {e.response.text}")
-        except httpx.RequestError as e:
-            raise Exception(f"Search API request error: {str(e)}")
-        except Exception as e:
-            raise Exception(f"Search API unexpected error: {str(e)}")
+        response.raise_for_status()
+        return response.json()
+    
+    except httpx.HTTPStatusError as e:
+        raise Exception(f"Search API HTTP error {e.response.status_code}: {e.response.text}")
+    except httpx.RequestError as e:
+        tracer.record("search", method, "search", None, 0, time.perf_counter() - started)
+        raise Exception(f"Search API request error: {str(e)}")
+    except Exception as e:
+        raise Exception(f"Search API unexpected error: {str(e)}")
+
+# Optional local mirror of the organization for GOODDAY_API_TOKEN (enabled by GOODDAY_MIRROR_PATH)
+org_mirror = OrgMirror.from_env()
+
+async def fetch_for_mirror(endpoint: str, subfolders: bool) -> Any:
+    """Fetch an endpoint for the mirror sync with the token the mirror belongs to."""
+    with request_token(os.getenv("GOODDAY_API_TOKEN")):
+        return await make_goodday_request(endpoint, subfolders=subfolders)
+
+mirror_sync = MirrorSync(
+    org_mirror,
+    fetch_for_mirror,
+    active_interval=float(os.getenv("GOODDAY_MIRROR_ACTIVE_INTERVAL", "300")),
+    archived_interval=float(os.getenv("GOODDAY_MIRROR_ARCHIVED_INTERVAL", "86400")),
+    concurrency=int(os.getenv("GOODDAY_MIRROR_CONCURRENCY", "4")),
+) if org_mirror else None
+
+warm_up_status: dict[str, Any] = {"state": "pending" if WARM_UP else "disabled"}
+_warm_up_task: Optional[asyncio.Task] = None
+
+def start_warm_up() -> None:
+    """Start the background warm-up once per process, if it is enabled."""
+    global _warm_up_task
+    if WARM_UP and _warm_up_task is None and os.getenv("GOODDAY_API_TOKEN"):
+        # Run in a fresh context so no tool call's budget or tracing applies to it
+        _warm_up_task = contextvars.Context().run(asyncio.ensure_future, warm_up())
+
+async def warm_up() -> None:
+    """Fetch the users and projects listings, then the task lists of hot projects and their current sprints."""
+    started = time.perf_counter()
+    warm_up_status["state"] = "running"
+    try:
+        with request_token(os.getenv("GOODDAY_API_TOKEN")):
+            _, projects, _ = await asyncio.gather(
+                get_directory("users"),
+                get_directory("projects"),
+                get_directory("projects?archived=true"),
+            )
+            endpoints = []
+            # Task lists of mirrored projects are answered from the mirror instead
+            if isinstance(projects, list) and not mirror_for_request():
+                for name in WARM_UP_PROJECTS:
+                    project = next((p for p in projects if isinstance(p, dict) and p.get("id") == name), None)
+                    if project is None:
+                        project, _ = await find_project_by_name(name)
+                    if project is None:
+                        logger.warning("Warm-up project %r not found", name)
+                        continue
+                    # The endpoints get_project_tasks and get_goodday_sprint_tasks request by default,
+                    # through the caches those tools read
+                    endpoints.append((f"project/{project['id']}/tasks", fetch_listing))
+                    endpoints.extend(
+                        (f"project/{sprint['id']}/tasks?closed=true", make_goodday_request)
+                        for sprint in sprint_index(projects).recent(project["id"], WARM_UP_SPRINTS)
+                    )
+
+            async def fetch(item):
+                endpoint, load = item
+                try:
+                    await load(endpoint)
+                    return True
+                except Exception as e:
+                    logger.warning("Warm-up of %s failed: %s", endpoint, e)
+                    return False
+
+            warmed = await gather_limited(fetch, endpoints)
+        warm_up_status.update(state="done", task_lists=sum(warmed), failed=len(warmed) - sum(warmed))
+    except Exception as e:
+        warm_up_status.update(state="failed", error=str(e))
+        logger.warning("Warm-up failed: %s", e)
+    warm_up_status["seconds"] = round(time.perf_counter() - started, 3)
+
+def mirror_for_request() -> Optional[OrgMirror]:
+    """Return the org mirror if it is enabled and belongs to the current request's token."""
+    if org_mirror and org_mirror.serves(current_api_token()):
+        return org_mirror
+    return None
+
+def search_webhook_serves(api_token: str) -> bool:
+    """Whether the search webhook, which indexes the account of GOODDAY_API_TOKEN, may answer for api_token."""
+    return api_token == os.getenv("GOODDAY_API_TOKEN")
+
+def invalidate_cached(*patterns: str) -> None:
+    """Drop cached GET responses for endpoints matching patterns after a write ('*' matches any text)."""
+    api_token = current_api_token()
+    tenant = tenants.get(api_token)
+    mirror = mirror_for_request()
+    for pattern in patterns:
+        tenant.directory_cache.invalidate(pattern)
+        tenant.listing_cache.invalidate(pattern)
+        tenant.coalescer.forget(f"GET {pattern}")
+        if response_cache:
+            response_cache.invalidate(api_token, pattern)
+        if mirror:
+            mirror.invalidate(pattern)
+
+async def project_lineage(project_id: str) -> Optional[List[str]]:
+    """Return a project ID followed by its ancestors, whose subfolder task lists include its tasks.
+
+    Returns None when the projects listing cannot be loaded or does not list the project.
+    """
+    try:
+        projects_data = await get_directory("projects")
+    except Exception as e:
+        logger.warning("Unable to load projects to find the ancestors of %s: %s", project_id, e)
+        return None
+    if not isinstance(projects_data, list):
+        return None
+    parents = {p.get("id"): p.get("parentProjectId") for p in projects_data if isinstance(p, dict)}
+    if project_id not in parents:
+        return None
+    lineage = []
+    while project_id and project_id not in lineage:
+        lineage.append(project_id)
+        project_id = parents.get(project_id)
+    return lineage
+
+async def task_list_patterns(project_id: str) -> List[str]:
+    """Patterns of the cached task lists that include a project's tasks."""
+    lineage = await project_lineage(project_id)
+    if lineage is None:
+        # The ancestors whose subfolder task lists include these tasks are unknown
+        return ["project/*/tasks*"]
+    return [f"project/{pid}/tasks*" for pid in lineage]
+
+async def in_project(location: TaskLocation, project_id: str) -> bool:
+    """Whether an indexed task lives in a project or one of its subfolders."""
+    return project_id in (await project_lineage(location.project_id) or [location.project_id])
+
+async def invalidate_task_writes(task_id: str, status_changed: bool = False) -> None:
+    """Invalidate cached data affected by a change to an existing task."""
+    location = current_tenant().task_index.get_by_task_id(task_id)
+    patterns = [
+        f"task/{task_id}",
+        f"task/{task_id}/messages*",
+        *(await task_list_patterns(location.project_id) if location else ["project/*/tasks*"]),
+    ]
+    if status_changed:
+        # A status change can close the task or move action-required to another user
+        patterns += ["user/*/assigned-tasks*", "user/*/action-required-tasks*"]
+    invalidate_cached(*patterns)
+
+async def get_directory(endpoint: str) -> Any:
+    """Fetch a users or projects listing through the shared directory cache."""
+    directory_cache = current_tenant().directory_cache
+    # A listing already held in memory is being refreshed, which the on-disk copy must not answer
+    refresh = directory_cache.peek(endpoint) is not None
+    return await directory_cache.get(endpoint, lambda: make_goodday_request(endpoint, bypass_cache=refresh))
+
+async def fetch_listing(endpoint: str) -> Any:
+    """Fetch a task listing as a TaskListIndex (or the error response).
+
+    The listing and its indexes are reused while fresh, so later pages and
+    other filters over the same listing do not download it again.
+    """
+    async def fetch():
+        data = await make_goodday_request(endpoint)
+        return TaskListIndex(data) if isinstance(data, list) else data
+
+    return await current_tenant().listing_cache.get(endpoint, fetch)
+
+async def resolve_assignees(assignee: str, listing: TaskListIndex) -> tuple[Optional[List[str]], Optional[str]]:
+    """Resolve comma-separated user IDs, names or emails to user IDs, or return the message for one not found."""
+    user_ids = []
+    for identifier in (part.strip() for part in assignee.split(",")):
+        if not identifier:
+            continue
+        if identifier in listing.assignees():
+            user_ids.append(identifier)
+            continue
+        user, candidates = await find_users(identifier)
+        if not user:
+            return None, user_not_found(identifier, candidates)
+        user_ids.append(user.get("id"))
+    return user_ids, None
+
+def check_max_bytes(max_bytes: Optional[int]) -> None:
+    """Raise ValueError if max_bytes leaves too little room for a task after the page footer."""
+    if max_bytes is not None and max_bytes < MIN_RESPONSE_BYTES:
+        raise ValueError(f"max_bytes must be at least {MIN_RESPONSE_BYTES}, got {max_bytes}")
+
+def render_task_page(
+    tasks: List[dict],
+    listing: str,
+    offset: int,
+    page_size: Optional[int],
+    max_bytes: Optional[int],
+    as_json: bool,
+    fields: Optional[str]
+) -> str:
+    """Render the page of a task listing starting at offset, with the cursor of the next page if there is one."""
+    page_size = page_size or PAGE_SIZE
+    budget = (max_bytes or MAX_RESPONSE_BYTES) - PAGE_FOOTER_BYTES
+    if as_json:
+        selected = select(tasks, parse_fields(fields, TASK_FIELDS))
+        page = paginate(selected, offset, page_size, budget, to_json, fit_json, ",")
+        footer = {"total": page.total}
+        if page.next_offset is not None:
+            footer["nextCursor"] = encode_cursor(listing, page.next_offset)
+        return '{"tasks":[' + ",".join(page.parts) + "]," + to_json(footer)[1:]
+
+    page = paginate(
+        tasks, offset, page_size, budget, format_task,
+        lambda task, limit: truncate_text(format_task(task), limit), "\n---\n",
+    )
+    if not page.parts:
+        return "No more tasks."
+    result = "\n---\n".join(page.parts)
+    end = page.next_offset if page.next_offset is not None else page.total
+    if page.next_offset is not None:
+        cursor = encode_cursor(listing, page.next_offset)
+        result += f'\n\n**More tasks available:** showing {page.start + 1}-{end} of {page.total}. Pass cursor="{cursor}" for the next page.'
+    elif page.start > 0:
+        result += f"\n\n**End of tasks:** showing {page.start + 1}-{end} of {page.total}."
+    return result
+
+async def gather_limited(func: Callable[[Any], Awaitable[Any]], items: list, limit: Optional[int] = None) -> list:
+    """Run func over items concurrently, at most `limit` at a time, preserving input order."""
+    semaphore = asyncio.Semaphore(limit or FANOUT_CONCURRENCY)
+
+    async def run(item):
+        async with semaphore:
+            return await func(item)
+
+    return await asyncio.gather(*(run(item) for item in items))
 
 def format_task(task: dict) -> str:
     """Format a task into a readable string with safe checks."""
@@ -164,7 +566,7 @@ def format_timestamp_ist(timestamp_str: str) -> str:
 
 async def get_user_mapping() -> dict:
     """Get mapping of user IDs to names."""
-    data = await make_goodday_request("users")
+    data = await get_directory("users")
     user_id_to_name = {}
     if isinstance(data, list):
         for u in data:
@@ -174,7 +576,7 @@ async def get_user_mapping() -> dict:
 
 async def get_project_mapping() -> dict:
     """Get mapping of project IDs to names."""
-    data = await make_goodday_request("projects")
+    data = await get_directory("projects")
     project_id_to_name = {}
     if isinstance(data, list):
         for p in data:
@@ -182,115 +584,153 @@ async def get_project_mapping() -> dict:
                 project_id_to_name[p.get("id")] = p.get("name", "Unknown")
     return project_id_to_name
 
+def directory_index(key: str, listing: list, signature: Callable[[dict], Any], build: Callable[[], Any]) -> Any:
+    """Return the tenant's index built from a directory listing, rebuilding it only when the listing changed."""
+    tenant = current_tenant()
+    cached = tenant.directory_indexes.get(key)
+    if cached is not None and cached[0] is listing:
+        return cached[2]
+    # A refreshed listing is a new object; rebuild only if its contents differ
+    listing_signature = hash(tuple(signature(item) for item in listing if isinstance(item, dict)))
+    if cached is not None and cached[1] == listing_signature:
+        index = cached[2]
+    else:
+        index = build()
+    tenant.directory_indexes[key] = (listing, listing_signature, index)
+    return index
+
+def project_matcher(projects_data: list) -> NameMatcher:
+    """Name matcher over projects, leaving out system projects such as sprints."""
+    return directory_index(
+        "project_names",
+        projects_data,
+        lambda p: (p.get("id"), p.get("name"), p.get("systemType")),
+        lambda: NameMatcher(p for p in projects_data if isinstance(p, dict) and p.get("systemType") != "PROJECT"),
+    )
+
+def sprint_index(projects_data: list) -> SprintIndex:
+    """Index of the sprints below every project, rebuilt when the projects listing changes."""
+    return directory_index(
+        "sprints",
+        projects_data,
+        lambda p: (p.get("id"), p.get("name"), p.get("systemType"), p.get("parentProjectId"), p.get("startDate"), p.get("endDate")),
+        lambda: SprintIndex(projects_data),
+    )
+
+def user_index(users_data: list) -> UserIndex:
+    """Index of users by email, ID and name, rebuilt when the users listing changes."""
+    return directory_index(
+        "users",
+        users_data,
+        lambda u: (u.get("id"), u.get("name"), u.get("email")),
+        lambda: UserIndex(users_data),
+    )
+
 async def find_project_by_name(project_name: str) -> tuple[Optional[dict], List[str]]:
-    """Find project by name (case-insensitive)."""
-    projects_data = await make_goodday_request("projects")
+    """Find a project by name, returning it (None if not found or ambiguous) and the closest project names.
+
+    Names are ranked exact match first, then prefix, word, substring and
+    near-miss spelling matches; several candidates in the best non-exact tier count as ambiguous.
+    """
+    projects_data = await get_directory("projects")
     if not projects_data or not isinstance(projects_data, list):
         return None, []
-    
-    # Filter out system projects (like sprints) to avoid overwhelming the AI
-    filtered_projects = [
-        proj for proj in projects_data 
-        if isinstance(proj, dict) and proj.get("systemType") != "PROJECT"
-    ]
-    
-    project_name_lower = project_name.lower().strip()
-    matched_project = None
-    for proj in filtered_projects:
-        if not isinstance(proj, dict):
-            continue
-        current_project_name = proj.get("name", "").lower().strip()
-        if current_project_name == project_name_lower:
-            matched_project = proj
-            break
-        if (
-            project_name_lower in current_project_name
-            or current_project_name in project_name_lower
-        ):
-            matched_project = proj
-            break
-    
-    available_projects = [
-        p.get("name", "Unknown")
-        for p in projects_data
-        if isinstance(p, dict)
-    ]
-    return matched_project, available_projects
+    match, candidates = project_matcher(projects_data).resolve(project_name, limit=PROJECT_CANDIDATES)
+    return (match.item if match else None), [candidate.name for candidate in candidates]
+
+def project_not_found(project_name: str, candidates: List[str]) -> str:
+    """Message for a project name that matched no project, or several equally well."""
+    if not candidates:
+        return f"Project '{project_name}' not found."
+    return f"Project '{project_name}' not found or ambiguous. Closest matches: {', '.join(candidates)}"
 
 async def find_sprint_by_name(parent_project_id: str, sprint_name: str) -> tuple[Optional[dict], List[str]]:
-    """Find sprint project by name within a parent project."""
-    projects_data = await make_goodday_request("projects")
+    """Find a sprint below a parent project by name, number, "current" or "latest".
+
+    Returns the sprint (None if not found) and the names of the project's sprints, newest first.
+    """
+    projects_data = await get_directory("projects")
     if not projects_data or not isinstance(projects_data, list):
         return None, []
-    
-    normalized_sprint_name = sprint_name.lower().strip()
-    if not normalized_sprint_name.startswith("sprint"):
-        normalized_sprint_name = f"sprint {normalized_sprint_name}"
-
-    available_sprints = []
-    search_number = re.search(r"(\d+)", normalized_sprint_name)
-    exact_match = None
-    substring_match = None
-
-    for proj in projects_data:
-        if isinstance(proj, dict) and proj.get("systemType") == "PROJECT":
-            sprint_proj_name = proj.get("name", "").lower().strip()
-            if sprint_proj_name.startswith("sprint"):
-                available_sprints.append(proj.get("name", ""))
-                project_number = re.search(r"(\d+)", sprint_proj_name)
-                # Prefer exact number match
-                if (
-                    search_number
-                    and project_number
-                    and search_number.group(1) == project_number.group(1)
-                ):
-                    exact_match = proj
-                # Fallback: search number as substring anywhere in the sprint name
-                elif (
-                    search_number and search_number.group(1) in sprint_proj_name
-                ):
-                    if not substring_match:
-                        substring_match = proj
-                elif normalized_sprint_name == sprint_proj_name:
-                    if not exact_match:
-                        exact_match = proj
-                elif (
-                    normalized_sprint_name in sprint_proj_name
-                    or sprint_proj_name in normalized_sprint_name
-                ):
-                    if not substring_match:
-                        substring_match = proj
-
-    if exact_match:
-        return exact_match, available_sprints
-    if substring_match:
-        return substring_match, available_sprints
-    return None, available_sprints
+    sprints = sprint_index(projects_data)
+    available_sprints = [sprint.get("name", "") for sprint in sprints.sprints(parent_project_id)]
+    return sprints.find(parent_project_id, sprint_name), available_sprints
 
-async def find_user_by_name_or_email(user_identifier: str) -> Optional[dict]:
-    """Find user by name or email (case-insensitive)."""
-    users_data = await make_goodday_request("users")
+async def find_users(user_identifier: str) -> tuple[Optional[dict], List[dict]]:
+    """Find a user by email, ID, name or name word, returning it (None if not found or ambiguous) and the candidates.
+
+    Uses the cached users listing, so a warm lookup makes no API call.
+    """
+    users_data = await get_directory("users")
     if not users_data or not isinstance(users_data, list):
+        return None, []
+    return user_index(users_data).find(user_identifier, limit=USER_CANDIDATES)
+
+async def find_user_by_name_or_email(user_identifier: str) -> Optional[dict]:
+    """Find user by name or email (case-insensitive), or None if not found or ambiguous."""
+    user, _ = await find_users(user_identifier)
+    return user
+
+def user_not_found(user_identifier: str, candidates: List[dict]) -> str:
+    """Message for a user identifier that matched no user, or several equally well."""
+    if not candidates:
+        return f"User '{user_identifier}' not found."
+    names = ", ".join(
+        f"{u.get('name', 'Unknown')} <{u['email']}>" if u.get("email") else u.get("name", "Unknown")
+        for u in candidates
+    )
+    return f"User '{user_identifier}' not found or ambiguous. Matching users: {names}"
+
+async def scan_projects_for_task(task_short_id: str, projects_data: list) -> Optional[TaskLocation]:
+    """Scan root project task lists concurrently, stopping at the first project containing the task."""
+    semaphore = asyncio.Semaphore(FANOUT_CONCURRENCY)
+
+    async def scan(project_id: str) -> Optional[TaskLocation]:
+        async with semaphore:
+            tasks_data = await make_goodday_request(f"project/{project_id}/tasks")
+        if isinstance(tasks_data, list):
+            for task in tasks_data:
+                if isinstance(task, dict) and task.get("shortId") == task_short_id:
+                    # The task's own project, so the result does not depend on which listing answered first
+                    return TaskLocation(task.get("id"), task.get("projectId") or project_id)
         return None
-    
-    user_identifier_lower = user_identifier.lower().strip()
-    for user in users_data:
-        if isinstance(user, dict):
-            user_name = user.get("name", "").lower().strip()
-            user_email = user.get("email", "").lower().strip()
-            if user_identifier_lower in user_name or user_identifier_lower in user_email:
-                return user
-    return None
+
+    project_ids = {p.get("id") for p in projects_data if isinstance(p, dict)}
+    # Root task lists include subfolder tasks, so every task is fetched once
+    pending = {
+        asyncio.ensure_future(scan(proj["id"]))
+        for proj in projects_data
+        if isinstance(proj, dict) and proj.get("id") and proj.get("parentProjectId") not in project_ids
+    }
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                # A failing project is skipped rather than failing the whole lookup
+                if future.exception() is None and future.result():
+                    return future.result()
+        return None
+    finally:
+        for future in pending:
+            future.cancel()
 
 # Project Management Tools
 @mcp.tool()
-async def get_projects(archived: bool = False, root_only: bool = False) -> str:
+async def get_projects(
+    archived: bool = False,
+    root_only: bool = False,
+    output_format: Optional[str] = None,
+    fields: Optional[str] = None
+) -> str:
     """Get list of projects from Goodday.
 
     Args:
         archived: Set to true to retrieve archived/closed projects
         root_only: Set to true to return only root projects
+        output_format: "markdown" (default) or "json" for compact JSON
+        fields: Comma-separated fields to include in JSON output, as dotted paths (e.g. "shortId,status.name"), or "*" for all
     """
+    as_json = wants_json(output_format)
     params = []
     if archived:
         params.append("archived=true")
@@ -301,10 +741,11 @@ async def get_projects(archived: bool = False, root_only: bool = False) -> str:
     if params:
         endpoint += "?" + "&".join(params)
     
-    data = await make_goodday_request(endpoint)
+    data = await make_goodday_request(endpoint, bypass_cache=True)
+    current_tenant().directory_cache.set(endpoint, data)
     
     if not data:
-        return "No projects found."
+        return "[]" if as_json else "No projects found."
         
     if isinstance(data, dict):
         if "error" in data:
@@ -314,16 +755,21 @@ async def get_projects(archived: bool = False, root_only: bool = False) -> str:
     elif not isinstance(data, list):
         return f"Unexpected response format: {type(data).__name__} - {str(data)}"
     
+    if as_json:
+        return render_json(data, fields, PROJECT_FIELDS)
     projects = [format_project(project) for project in data]
     return "\n---\n".join(projects)
 
 @mcp.tool()
-async def get_project(project_id: str) -> str:
+async def get_project(project_id: str, output_format: Optional[str] = None, fields: Optional[str] = None) -> str:
     """Get details of a specific project.
 
     Args:
         project_id: The ID of the project to retrieve
+        output_format: "markdown" (default) or "json" for compact JSON
+        fields: Comma-separated fields to include in JSON output, as dotted paths (e.g. "shortId,status.name"), or "*" for all
     """
+    as_json = wants_json(output_format)
     data = await make_goodday_request(f"project/{project_id}")
     
     if not data:
@@ -332,6 +778,8 @@ async def get_project(project_id: str) -> str:
     if isinstance(data, dict) and "error" in data:
         return f"Unable to fetch project: {data.get('error', 'Unknown error')}"
     
+    if as_json:
+        return render_json(data, fields, PROJECT_FIELDS)
     return format_project(data)
 
 @mcp.tool()
@@ -378,7 +826,10 @@ async def create_project(
     if deadline:
         data["deadline"] = deadline
     
+    # Looked up before the projects listing is invalidated, so it need not be fetched again
+    lineage = await project_lineage(parent_project_id) if parent_project_id else []
     result = await make_goodday_request("projects/new-project", "POST", data)
+    invalidate_cached("projects*", *(f"project/{pid}" for pid in lineage) if lineage is not None else ["project/*"])
     
     if not result:
         return "Unable to create project: No response received"
@@ -390,14 +841,47 @@ async def create_project(
 
 # Task Management Tools
 @mcp.tool()
-async def get_project_tasks(project_id: str, closed: bool = False, subfolders: bool = False) -> str:
-    """Get tasks from a specific project.
+async def get_project_tasks(
+    project_id: str,
+    closed: bool = False,
+    subfolders: bool = False,
+    status: Optional[str] = None,
+    assignee: Optional[str] = None,
+    min_priority: Optional[int] = None,
+    max_priority: Optional[int] = None,
+    due_after: Optional[str] = None,
+    due_before: Optional[str] = None,
+    task_type: Optional[str] = None,
+    text: Optional[str] = None,
+    sort: Optional[str] = None,
+    page_size: Optional[int] = None,
+    cursor: Optional[str] = None,
+    max_bytes: Optional[int] = None,
+    output_format: Optional[str] = None,
+    fields: Optional[str] = None
+) -> str:
+    """Get tasks from a specific project, optionally filtered and sorted, a page at a time.
 
     Args:
         project_id: The ID of the project
         closed: Set to true to retrieve all open and closed tasks
         subfolders: Set to true to return tasks from project subfolders
+        status: Comma-separated status names to include (case-insensitive, e.g. "In Progress,In Review")
+        assignee: Comma-separated IDs, names or emails of the users the tasks are assigned to
+        min_priority: Lowest priority to include
+        max_priority: Highest priority to include
+        due_after: Include tasks due on or after this date (YYYY-MM-DD); the deadline is used, or the end date without one
+        due_before: Include tasks due on or before this date (YYYY-MM-DD)
+        task_type: Comma-separated task type names to include (case-insensitive, e.g. "Bug")
+        text: Text the task ID or name must contain (case-insensitive)
+        sort: Comma-separated sort keys (priority, due, start, name, status, shortId), "-" prefix for descending, e.g. "-priority,due"
+        page_size: Maximum number of tasks to return (default: GOODDAY_PAGE_SIZE, 50)
+        cursor: Cursor from the previous page's "more tasks available" marker, to get the next page
+        max_bytes: Maximum response size in bytes, at least 1024 (default: GOODDAY_MAX_RESPONSE_BYTES); the page ends early to stay within it
+        output_format: "markdown" (default) or "json" for compact JSON
+        fields: Comma-separated fields to include in JSON output, as dotted paths (e.g. "shortId,status.name"), or "*" for all
     """
+    as_json = wants_json(output_format)
     params = []
     if closed:
         params.append("closed=true")
@@ -407,29 +891,71 @@ async def get_project_tasks(project_id: str, closed: bool = False, subfolders: b
     endpoint = f"project/{project_id}/tasks"
     if params:
         endpoint += "?" + "&".join(params)
-    
-    data = await make_goodday_request(endpoint)
+    filters = {
+        "statuses": status.split(",") if status else None,
+        "task_types": task_type.split(",") if task_type else None,
+        "min_priority": min_priority,
+        "max_priority": max_priority,
+        "due_after": parse_date(due_after, "due_after"),
+        "due_before": parse_date(due_before, "due_before"),
+        "text": text,
+        "sort": parse_sort(sort),
+    }
+    # A cursor only resumes the listing with the same filters and sort order
+    listing_key = endpoint + to_json({**filters, "assignee": assignee})
+    offset = decode_cursor(cursor, listing_key) if cursor else 0
+    check_max_bytes(max_bytes)
+    
+    # Subfolder tasks are always requested upstream, so the mirror includes them too
+    mirror = mirror_for_request()
+    data = mirror.project_tasks(project_id, closed) if mirror else None
+    if data is None:
+        data = await fetch_listing(endpoint)
+    elif isinstance(data, list):
+        data = TaskListIndex(data)
     
     if not data:
-        return "No tasks found."
+        return '{"tasks":[],"total":0}' if as_json else "No tasks found."
     
     if isinstance(data, dict) and "error" in data:
         return f"Unable to fetch tasks: {data.get('error', 'Unknown error')}"
     
-    if not isinstance(data, list):
+    if not isinstance(data, TaskListIndex):
         return f"Unexpected response format: {str(data)}"
     
-    tasks = [format_task(task) for task in data]
-    return "\n---\n".join(tasks)
+    if assignee:
+        assignee_ids, unknown_user = await resolve_assignees(assignee, data)
+        if unknown_user:
+            return unknown_user
+        filters["assignee_ids"] = assignee_ids
+    tasks = data.query(**filters)
+    if not tasks:
+        return '{"tasks":[],"total":0}' if as_json else f"No tasks match the filters ({len(data)} tasks in the listing)."
+    
+    return render_task_page(tasks, listing_key, offset, page_size, max_bytes, as_json, fields)
 
 @mcp.tool()
-async def get_user_assigned_tasks(user_id: str, closed: bool = False) -> str:
-    """Get tasks assigned to a specific user.
+async def get_user_assigned_tasks(
+    user_id: str,
+    closed: bool = False,
+    page_size: Optional[int] = None,
+    cursor: Optional[str] = None,
+    max_bytes: Optional[int] = None,
+    output_format: Optional[str] = None,
+    fields: Optional[str] = None
+) -> str:
+    """Get tasks assigned to a specific user, a page at a time.
 
     Args:
         user_id: The ID of the user
         closed: Set to true to retrieve all open and closed tasks
+        page_size: Maximum number of tasks to return (default: GOODDAY_PAGE_SIZE, 50)
+        cursor: Cursor from the previous page's "more tasks available" marker, to get the next page
+        max_bytes: Maximum response size in bytes, at least 1024 (default: GOODDAY_MAX_RESPONSE_BYTES); the page ends early to stay within it
+        output_format: "markdown" (default) or "json" for compact JSON
+        fields: Comma-separated fields to include in JSON output, as dotted paths (e.g. "shortId,status.name"), or "*" for all
     """
+    as_json = wants_json(output_format)
     params = []
     if closed:
         params.append("closed=true")
@@ -437,32 +963,41 @@ async def get_user_assigned_tasks(user_id: str, closed: bool = False) -> str:
     endpoint = f"user/{user_id}/assigned-tasks"
     if params:
         endpoint += "?" + "&".join(params)
+    offset = decode_cursor(cursor, endpoint) if cursor else 0
+    check_max_bytes(max_bytes)
     
-    data = await make_goodday_request(endpoint)
+    mirror = mirror_for_request()
+    data = mirror.user_assigned_tasks(user_id, closed) if mirror else None
+    if data is None:
+        data = await fetch_listing(endpoint)
+    elif isinstance(data, list):
+        data = TaskListIndex(data)
     
     if not data:
-        return "No assigned tasks found."
+        return '{"tasks":[],"total":0}' if as_json else "No assigned tasks found."
     
     if isinstance(data, dict) and "error" in data:
         return f"Unable to fetch assigned tasks: {data.get('error', 'Unknown error')}"
     
-    if not isinstance(data, list):
+    if not isinstance(data, TaskListIndex):
         return f"Unexpected response format: {str(data)}"
     
-    tasks = [format_task(task) for task in data]
-    return "\n---\n".join(tasks)
+    return render_task_page(data.tasks, endpoint, offset, page_size, max_bytes, as_json, fields)
 
 @mcp.tool()
-async def get_user_action_required_tasks(user_id: str) -> str:
+async def get_user_action_required_tasks(user_id: str, output_format: Optional[str] = None, fields: Optional[str] = None) -> str:
     """Get action required tasks for a specific user.
 
     Args:
         user_id: The ID of the user
+        output_format: "markdown" (default) or "json" for compact JSON
+        fields: Comma-separated fields to include in JSON output, as dotted paths (e.g. "shortId,status.name"), or "*" for all
     """
+    as_json = wants_json(output_format)
     data = await make_goodday_request(f"user/{user_id}/action-required-tasks")
     
     if not data:
-        return "No action required tasks found."
+        return "[]" if as_json else "No action required tasks found."
     
     if isinstance(data, dict) and "error" in data:
         return f"Unable to fetch action required tasks: {data.get('error', 'Unknown error')}"
@@ -470,16 +1005,21 @@ async def get_user_action_required_tasks(user_id: str) -> str:
     if not isinstance(data, list):
         return f"Unexpected response format: {str(data)}"
     
+    if as_json:
+        return render_json(data, fields, TASK_FIELDS)
     tasks = [format_task(task) for task in data]
     return "\n---\n".join(tasks)
 
 @mcp.tool()
-async def get_task(task_id: str) -> str:
+async def get_task(task_id: str, output_format: Optional[str] = None, fields: Optional[str] = None) -> str:
     """Get details of a specific task.
 
     Args:
         task_id: The ID of the task to retrieve
+        output_format: "markdown" (default) or "json" for compact JSON
+        fields: Comma-separated fields to include in JSON output, as dotted paths (e.g. "shortId,status.name"), or "*" for all
     """
+    as_json = wants_json(output_format)
     data = await make_goodday_request(f"task/{task_id}")
     
     if not data:
@@ -488,6 +1028,8 @@ async def get_task(task_id: str) -> str:
     if isinstance(data, dict) and "error" in data:
         return f"Unable to fetch task: {data.get('error', 'Unknown error')}"
     
+    if as_json:
+        return render_json(data, fields, TASK_FIELDS)
     return format_task(data)
 
 @mcp.tool()
@@ -551,6 +1093,15 @@ async def create_task(
         data["priority"] = priority
     
     result = await make_goodday_request("tasks", "POST", data)
+    affected_users = {uid for uid in (from_user_id, to_user_id) if uid}
+    invalidate_cached(
+        *await task_list_patterns(project_id),
+        *(f"user/{uid}/assigned-tasks*" for uid in affected_users),
+        *(f"user/{uid}/action-required-tasks*" for uid in affected_users),
+        *([f"task/{parent_task_id}"] if parent_task_id else []),
+    )
+    if isinstance(result, dict):
+        current_tenant().task_index.add(result.get("shortId"), result.get("id"), project_id)
     
     if not result:
         return "Unable to create task: No response received"
@@ -579,6 +1130,7 @@ async def update_task_status(task_id: str, user_id: str, status_id: str, message
         data["message"] = message
     
     result = await make_goodday_request(f"task/{task_id}/status", "PUT", data)
+    await invalidate_task_writes(task_id, status_changed=True)
     
     if not result:
         return "Unable to update task status: No response received"
@@ -603,6 +1155,7 @@ async def add_task_comment(task_id: str, user_id: str, message: str) -> str:
     }
     
     result = await make_goodday_request(f"task/{task_id}/comment", "POST", data)
+    await invalidate_task_writes(task_id)
     
     if not result:
         return "Unable to add comment: No response received"
@@ -614,12 +1167,19 @@ async def add_task_comment(task_id: str, user_id: str, message: str) -> str:
 
 # User Management Tools
 @mcp.tool()
-async def get_users() -> str:
-    """Get list of organization users."""
-    data = await make_goodday_request("users")
+async def get_users(output_format: Optional[str] = None, fields: Optional[str] = None) -> str:
+    """Get list of organization users.
+
+    Args:
+        output_format: "markdown" (default) or "json" for compact JSON
+        fields: Comma-separated fields to include in JSON output, as dotted paths (e.g. "shortId,status.name"), or "*" for all
+    """
+    as_json = wants_json(output_format)
+    data = await make_goodday_request("users", bypass_cache=True)
+    current_tenant().directory_cache.set("users", data)
     
     if not data:
-        return "No users found."
+        return "[]" if as_json else "No users found."
     
     if isinstance(data, dict) and "error" in data:
         return f"Unable to fetch users: {data.get('error', 'Unknown error')}"
@@ -627,16 +1187,21 @@ async def get_users() -> str:
     if not isinstance(data, list):
         return f"Unexpected response format: {str(data)}"
     
+    if as_json:
+        return render_json(data, fields, USER_FIELDS)
     users = [format_user(user) for user in data]
     return "\n---\n".join(users)
 
 @mcp.tool()
-async def get_user(user_id: str) -> str:
+async def get_user(user_id: str, output_format: Optional[str] = None, fields: Optional[str] = None) -> str:
     """Get details of a specific user.
 
     Args:
         user_id: The ID of the user to retrieve
+        output_format: "markdown" (default) or "json" for compact JSON
+        fields: Comma-separated fields to include in JSON output, as dotted paths (e.g. "shortId,status.name"), or "*" for all
     """
+    as_json = wants_json(output_format)
     data = await make_goodday_request(f"user/{user_id}")
     
     if not data:
@@ -645,19 +1210,24 @@ async def get_user(user_id: str) -> str:
     if isinstance(data, dict) and "error" in data:
         return f"Unable to fetch user: {data.get('error', 'Unknown error')}"
     
+    if as_json:
+        return render_json(data, fields, USER_FIELDS)
     return format_user(data)
 
 @mcp.tool()
-async def get_project_users(project_id: str) -> str:
+async def get_project_users(project_id: str, output_format: Optional[str] = None, fields: Optional[str] = None) -> str:
     """Get users associated with a specific project.
 
     Args:
         project_id: The ID of the project
+        output_format: "markdown" (default) or "json" for compact JSON
+        fields: Comma-separated fields to include in JSON output, as dotted paths (e.g. "shortId,status.name"), or "*" for all
     """
+    as_json = wants_json(output_format)
     data = await make_goodday_request(f"project/{project_id}/users")
     
     if not data:
-        return "No users found for this project."
+        return "[]" if as_json else "No users found for this project."
     
     if isinstance(data, dict) and "error" in data:
         return f"Unable to fetch project users: {data.get('error', 'Unknown error')}"
@@ -665,61 +1235,86 @@ async def get_project_users(project_id: str) -> str:
     if not isinstance(data, list):
         return f"Unexpected response format: {str(data)}"
     
+    if as_json:
+        return render_json(data, fields, USER_FIELDS)
     users = [format_user(user) for user in data]
     return "\n---\n".join(users)
 
 # Enhanced Task Management Tools
 @mcp.tool()
-async def get_task_details(task_short_id: str, project_name: str) -> str:
+async def get_task_details(
+    task_short_id: str,
+    project_name: str,
+    output_format: Optional[str] = None,
+    fields: Optional[str] = None
+) -> str:
     """Get comprehensive task details including subtasks, custom fields, and full metadata.
 
     Args:
         task_short_id: The short ID of the task (e.g., RAD-434)
         project_name: The name of the project containing the task (required, case-insensitive)
+        output_format: "markdown" (default) or "json" for compact JSON
+        fields: Comma-separated fields to include in JSON output, as dotted paths (e.g. "shortId,status.name"), or "*" for all
     """
+    as_json = wants_json(output_format)
     # Find the project
-    matched_project, available_projects = await find_project_by_name(project_name)
+    matched_project, project_candidates = await find_project_by_name(project_name)
     if not matched_project:
-        return f"Project '{project_name}' not found. Available projects: {', '.join(available_projects[:10])}{'...' if len(available_projects) > 10 else ''}"
+        return project_not_found(project_name, project_candidates)
     
     project_id = matched_project.get("id")
     found_in_project = matched_project.get("name")
 
-    # Find the task
-    tasks_data = await make_goodday_request(f"project/{project_id}/tasks")
-    if not tasks_data or not isinstance(tasks_data, list):
-        return f"Unable to fetch tasks for project '{found_in_project}'."
-    
-    task_id = None
-    task_data = None
-    for task in tasks_data:
-        if isinstance(task, dict) and task.get("shortId") == task_short_id:
-            task_id = task.get("id")
-            task_data = task
-            break
-    
-    if not task_id or not task_data:
+    # Find the task, skipping the project task list when the shortId is already indexed
+    location = current_tenant().task_index.get(task_short_id)
+    indexed = location is not None and await in_project(location, project_id)
+    if not indexed:
+        tasks_data = await make_goodday_request(f"project/{project_id}/tasks")
+        if not tasks_data or not isinstance(tasks_data, list):
+            return f"Unable to fetch tasks for project '{found_in_project}'."
+        location = current_tenant().task_index.get(task_short_id)
+
+    if not location or not await in_project(location, project_id):
         return f"Task with short ID '{task_short_id}' not found in project '{found_in_project}'."
+    task_id = location.task_id
 
-    # Get detailed task information
-    detailed_data = await make_goodday_request(f"task/{task_id}")
+    # Fetch task details, messages and the user mapping concurrently
+    try:
+        detailed_data, messages_data, user_id_to_name = await asyncio.gather(
+            make_goodday_request(f"task/{task_id}"),
+            make_goodday_request(f"task/{task_id}/messages"),
+            get_user_mapping(),
+        )
+    except Exception:
+        if not indexed:
+            raise
+        # The indexed task was deleted or moved since it was listed; forget it and look it up again
+        current_tenant().task_index.remove(task_short_id)
+        return await get_task_details(task_short_id, project_name, output_format, fields)
     if not detailed_data:
         return f"No details found for task '{task_short_id}'."
     
     if isinstance(detailed_data, dict) and "error" in detailed_data:
         return f"Unable to fetch task details: {detailed_data.get('error', 'Unknown error')}"
 
-    # Get task messages for description
-    messages_data = await make_goodday_request(f"task/{task_id}/messages")
+    # Use the first message as the description
     first_message = "No description"
     if messages_data and isinstance(messages_data, list) and len(messages_data) > 0:
         first_msg = messages_data[0]
         if isinstance(first_msg, dict):
             first_message = first_msg.get("message", "No description")
-
-    # Get user mapping
-    user_id_to_name = await get_user_mapping()
     
+    if as_json:
+        details = {
+            **detailed_data,
+            "project": {"id": project_id, "name": found_in_project},
+            "assignedToUserName": user_id_to_name.get(detailed_data.get("assignedToUserId")),
+            "actionRequiredUserName": user_id_to_name.get(detailed_data.get("actionRequiredUserId")),
+            "createdByUserName": user_id_to_name.get(detailed_data.get("createdByUserId")),
+            "description": first_message if first_message != "No description" else None,
+        }
+        return render_json(details, fields, TASK_DETAIL_FIELDS)
+
     def user_display(user_id):
         if not user_id:
             return "N/A"
@@ -771,59 +1366,72 @@ async def get_task_details(task_short_id: str, project_name: str) -> str:
     return f"**Task Details for '{task_short_id}' in project '{found_in_project}':**\n\n{formatted_details}"
 
 @mcp.tool()
-async def get_task_messages(task_short_id: str, project_name: Optional[str] = None) -> str:
+async def get_task_messages(
+    task_short_id: str,
+    project_name: Optional[str] = None,
+    output_format: Optional[str] = None,
+    fields: Optional[str] = None
+) -> str:
     """Retrieve all messages/comments for a specific task.
 
     Args:
         task_short_id: The short ID of the task (e.g., RAD-434)
         project_name: Optional project name for disambiguation
+        output_format: "markdown" (default) or "json" for compact JSON
+        fields: Comma-separated message fields to include in JSON output (e.g. "dateCreated,fromUserName,message"), or "*" for all
     """
+    as_json = wants_json(output_format)
     task_id = None
     found_in_project = None
     
     # If project name is provided, use it to find the project
     if project_name:
-        matched_project, available_projects = await find_project_by_name(project_name)
+        matched_project, project_candidates = await find_project_by_name(project_name)
         if not matched_project:
-            return f"Project '{project_name}' not found. Available projects: {', '.join(available_projects[:10])}{'...' if len(available_projects) > 10 else ''}"
+            return project_not_found(project_name, project_candidates)
         project_id = matched_project.get("id")
         found_in_project = matched_project.get("name")
         
-        # Find the task in the specified project
-        tasks_data = await make_goodday_request(f"project/{project_id}/tasks")
-        if isinstance(tasks_data, list):
-            for task in tasks_data:
-                if isinstance(task, dict) and task.get("shortId") == task_short_id:
-                    task_id = task.get("id")
-                    break
+        # Find the task in the specified project, unless the shortId is already indexed there
+        location = current_tenant().task_index.get(task_short_id)
+        indexed = location is not None and await in_project(location, project_id)
+        if not indexed:
+            await make_goodday_request(f"project/{project_id}/tasks")
+            location = current_tenant().task_index.get(task_short_id)
+        if location and await in_project(location, project_id):
+            task_id = location.task_id
         
         if not task_id:
             return f"Task with short ID '{task_short_id}' not found in project '{found_in_project}'."
     else:
-        # Search across all projects
-        projects_data = await make_goodday_request("projects")
-        if not projects_data or not isinstance(projects_data, list):
-            return "Unable to fetch projects."
-        
-        for proj in projects_data:
-            if isinstance(proj, dict):
-                proj_id = proj.get("id")
-                tasks_data = await make_goodday_request(f"project/{proj_id}/tasks")
-                if isinstance(tasks_data, list):
-                    for task in tasks_data:
-                        if isinstance(task, dict) and task.get("shortId") == task_short_id:
-                            task_id = task.get("id")
-                            found_in_project = proj.get("name")
-                            break
-            if task_id:
-                break
+        # Use the shortId index, falling back to a parallel scan across all projects
+        location = current_tenant().task_index.get(task_short_id)
+        indexed = location is not None
+        if not location:
+            projects_data = await get_directory("projects")
+            if not projects_data or not isinstance(projects_data, list):
+                return "Unable to fetch projects."
+            location = await scan_projects_for_task(task_short_id, projects_data)
         
-        if not task_id:
+        if not location:
             return f"Task with short ID '{task_short_id}' not found in any project."
+        
+        task_id = location.task_id
+        project_id_to_name = await get_project_mapping()
+        found_in_project = project_id_to_name.get(location.project_id, location.project_id)
 
     # Get task messages
-    messages_data = await make_goodday_request(f"task/{task_id}/messages")
+    try:
+        messages_data = await make_goodday_request(f"task/{task_id}/messages")
+    except Exception:
+        if not indexed:
+            raise
+        # The indexed task was deleted or moved since it was listed; forget it and look it up again
+        current_tenant().task_index.remove(task_short_id)
+        return await get_task_messages(task_short_id, project_name, output_format, fields)
     if not messages_data:
+        if as_json and isinstance(messages_data, list):
+            return to_json({"task": task_short_id, "project": found_in_project, "messages": []})
         return f"No messages found for task '{task_short_id}'."
     
     if isinstance(messages_data, dict) and "error" in messages_data:
@@ -835,6 +1443,21 @@ async def get_task_messages(task_short_id: str, project_name: Optional[str] = No
     # Get user mapping
     user_id_to_name = await get_user_mapping()
     
+    if as_json:
+        messages = [
+            {
+                **msg,
+                "fromUserName": user_id_to_name.get(msg.get("fromUserId")),
+                "toUserName": user_id_to_name.get(msg.get("toUserId")),
+            }
+            for msg in messages_data if isinstance(msg, dict)
+        ]
+        return to_json({
+            "task": task_short_id,
+            "project": found_in_project,
+            "messages": select(messages, parse_fields(fields, MESSAGE_FIELDS)),
+        })
+
     def user_display(user_id):
         if not user_id:
             return "N/A"
@@ -862,18 +1485,27 @@ async def get_task_messages(task_short_id: str, project_name: Optional[str] = No
 
 # Sprint Management Tools
 @mcp.tool()
-async def get_goodday_sprint_tasks(project_name: str, sprint_name: str, include_closed: bool = True) -> str:
+async def get_goodday_sprint_tasks(
+    project_name: str,
+    sprint_name: str,
+    include_closed: bool = True,
+    output_format: Optional[str] = None,
+    fields: Optional[str] = None
+) -> str:
     """Get tasks from a specific sprint by project name and sprint name/number.
 
     Args:
         project_name: The name of the main project (e.g., "ASTRA")
-        sprint_name: The name or number of the sprint (e.g., "Sprint 233", "233")
+        sprint_name: The name or number of the sprint (e.g., "Sprint 233", "233"), or "current" / "latest"
         include_closed: Whether to include closed tasks (default: True)
+        output_format: "markdown" (default) or "json" for compact JSON
+        fields: Comma-separated task fields to include in JSON output (e.g. "shortId,status.name"), or "*" for all
     """
+    as_json = wants_json(output_format)
     # Find main project
-    matched_project, available_projects = await find_project_by_name(project_name)
+    matched_project, project_candidates = await find_project_by_name(project_name)
     if not matched_project:
-        return f"Project '{project_name}' not found. Available projects: {', '.join(available_projects[:10])}{'...' if len(available_projects) > 10 else ''}"
+        return project_not_found(project_name, project_candidates)
 
     main_project_id = matched_project.get("id")
     actual_project_name = matched_project.get("name")
@@ -882,7 +1514,7 @@ async def get_goodday_sprint_tasks(project_name: str, sprint_name: str, include_
     sprint_project, available_sprints = await find_sprint_by_name(main_project_id, sprint_name)
     if not sprint_project:
         if available_sprints:
-            return f"Sprint '{sprint_name}' not found. Available sprints: {', '.join(available_sprints)}"
+            return f"Sprint '{sprint_name}' not found in '{actual_project_name}'. Available sprints: {', '.join(available_sprints[:10])}{'...' if len(available_sprints) > 10 else ''}"
         else:
             return f"No sprints found under project '{actual_project_name}'."
 
@@ -897,8 +1529,13 @@ async def get_goodday_sprint_tasks(project_name: str, sprint_name: str, include_
     if params:
         endpoint += "?" + "&".join(params)
 
-    tasks_data = await make_goodday_request(endpoint)
+    mirror = mirror_for_request()
+    tasks_data = mirror.project_tasks(sprint_id, include_closed) if mirror else None
+    if tasks_data is None:
+        tasks_data = await make_goodday_request(endpoint)
     if not tasks_data:
+        if as_json and isinstance(tasks_data, list):
+            return to_json({"project": actual_project_name, "sprint": actual_sprint_name, "tasks": []})
         return f"No tasks found in sprint '{actual_sprint_name}'."
     
     if isinstance(tasks_data, dict) and "error" in tasks_data:
@@ -916,6 +1553,17 @@ async def get_goodday_sprint_tasks(project_name: str, sprint_name: str, include_
         name = user_id_to_name.get(user_id)
         return name if name else f"User {user_id}"
 
+    if as_json:
+        tasks = [
+            {**task, "assignedToUserName": user_id_to_name.get(task.get("assignedToUserId"))}
+            for task in tasks_data if isinstance(task, dict)
+        ]
+        return to_json({
+            "project": actual_project_name,
+            "sprint": actual_sprint_name,
+            "tasks": select(tasks, parse_fields(fields, SPRINT_TASK_FIELDS)),
+        })
+
     # Format tasks
     formatted_tasks = []
     for task in tasks_data:
@@ -939,17 +1587,25 @@ async def get_goodday_sprint_tasks(project_name: str, sprint_name: str, include_
     return f"**Tasks in Sprint '{actual_sprint_name}' (Project: '{actual_project_name}') - {len(tasks_data)} tasks:**\n\n{result}"
 
 @mcp.tool()
-async def get_goodday_sprint_summary(project_name: str, sprint_name: str) -> str:
+async def get_goodday_sprint_summary(
+    project_name: str,
+    sprint_name: str,
+    output_format: Optional[str] = None,
+    fields: Optional[str] = None
+) -> str:
     """Generate a comprehensive sprint summary with task details, status distribution, and key metrics.
 
     Args:
         project_name: The name of the main project (e.g., "ASTRA")
-        sprint_name: The name or number of the sprint (e.g., "Sprint 233", "233")
+        sprint_name: The name or number of the sprint (e.g., "Sprint 233", "233"), or "current" / "latest"
+        output_format: "markdown" (default) or "json" for compact JSON
+        fields: Comma-separated task fields to include in JSON output (e.g. "shortId,status.name"), or "*" for all
     """
+    as_json = wants_json(output_format)
     # Find main project
-    matched_project, available_projects = await find_project_by_name(project_name)
+    matched_project, project_candidates = await find_project_by_name(project_name)
     if not matched_project:
-        return f"Project '{project_name}' not found. Available projects: {', '.join(available_projects[:10])}{'...' if len(available_projects) > 10 else ''}"
+        return project_not_found(project_name, project_candidates)
 
     main_project_id = matched_project.get("id")
     actual_project_name = matched_project.get("name")
@@ -958,7 +1614,7 @@ async def get_goodday_sprint_summary(project_name: str, sprint_name: str) -> str
     sprint_project, available_sprints = await find_sprint_by_name(main_project_id, sprint_name)
     if not sprint_project:
         if available_sprints:
-            return f"Sprint '{sprint_name}' not found. Available sprints: {', '.join(available_sprints)}"
+            return f"Sprint '{sprint_name}' not found in '{actual_project_name}'. Available sprints: {', '.join(available_sprints[:10])}{'...' if len(available_sprints) > 10 else ''}"
         else:
             return f"No sprints found under project '{actual_project_name}'."
 
@@ -990,23 +1646,9 @@ async def get_goodday_sprint_summary(project_name: str, sprint_name: str) -> str
     status_counts = {}
     user_task_counts = {}
     task_summaries = []
+    summary_tasks = []
 
-    for task in tasks_data:
-        if not isinstance(task, dict):
-            continue
-
-        task_short_id = task.get("shortId", "N/A")
-        task_name = task.get("name", "No title")
-        status = task.get("status", {}) if isinstance(task.get("status"), dict) else {}
-        status_name = status.get("name", "Unknown Status")
-        assigned_user_id = task.get("assignedToUserId")
-        assigned_user = user_display(assigned_user_id)
-
-        # Count statistics
-        status_counts[status_name] = status_counts.get(status_name, 0) + 1
-        user_task_counts[assigned_user] = user_task_counts.get(assigned_user, 0) + 1
-
-        # Get task description
+    async def get_task_description(task: dict) -> str:
         task_description = "No description available"
         task_id = task.get("id")
         if task_id:
@@ -1019,6 +1661,31 @@ async def get_goodday_sprint_summary(project_name: str, sprint_name: str) -> str
                         task_description = first_msg.get("message", "No description available")
             except Exception:
                 pass
+        return task_description
+
+    # Fetch task descriptions concurrently; failures fall back per task
+    sprint_tasks = [task for task in tasks_data if isinstance(task, dict)]
+    task_descriptions = await gather_limited(get_task_description, sprint_tasks)
+
+    for task, task_description in zip(sprint_tasks, task_descriptions):
+        task_short_id = task.get("shortId", "N/A")
+        task_name = task.get("name", "No title")
+        status = task.get("status", {}) if isinstance(task.get("status"), dict) else {}
+        status_name = status.get("name", "Unknown Status")
+        assigned_user_id = task.get("assignedToUserId")
+        assigned_user = user_display(assigned_user_id)
+
+        # Count statistics
+        status_counts[status_name] = status_counts.get(status_name, 0) + 1
+        user_task_counts[assigned_user] = user_task_counts.get(assigned_user, 0) + 1
+
+        if as_json:
+            summary_tasks.append({
+                **task,
+                "assignedToUserName": user_id_to_name.get(assigned_user_id),
+                "description": task_description if task_description != "No description available" else None,
+            })
+            continue
 
         task_summary = f"""
 **{task_short_id}**: {task_name}
@@ -1028,6 +1695,16 @@ async def get_goodday_sprint_summary(project_name: str, sprint_name: str) -> str
 """.strip()
         task_summaries.append(task_summary)
 
+    if as_json:
+        return to_json({
+            "project": actual_project_name,
+            "sprint": actual_sprint_name,
+            "total": len(tasks_data),
+            "statuses": dict(sorted(status_counts.items())),
+            "assignees": dict(sorted(user_task_counts.items(), key=lambda x: x[1], reverse=True)),
+            "tasks": select(summary_tasks, parse_fields(fields, SPRINT_SUMMARY_TASK_FIELDS)),
+        })
+
     # Build summary
     summary_parts = []
     summary_parts.append(f"**Sprint Overview:**\n- **Sprint**: {actual_sprint_name}\n- **Project**: {actual_project_name}\n- **Total Tasks**: {len(tasks_data)}")
@@ -1048,46 +1725,215 @@ async def get_goodday_sprint_summary(project_name: str, sprint_name: str) -> str
 
 # Smart Query Tool
 @mcp.tool()
-async def get_goodday_smart_query(query: str) -> str:
+async def get_goodday_smart_query(query: str, output_format: Optional[str] = None, fields: Optional[str] = None) -> str:
     """Natural language interface for common project management queries.
 
     Args:
         query: Natural language query (e.g., "show me all tasks assigned to John", "what projects do I have")
+        output_format: "markdown" (default) or "json" for compact JSON
+        fields: Comma-separated fields to include in JSON output, as dotted paths (e.g. "shortId,status.name"), or "*" for all
     """
+    # The format is applied by the tool the query is routed to; reject a bad one even if no tool is reached
+    validate_output_format(output_format)
     query_lower = query.lower().strip()
     
     # Parse common query patterns
     if "projects" in query_lower and ("my" in query_lower or "i have" in query_lower):
-        return await get_projects()
+        return await get_projects(output_format=output_format, fields=fields)
     elif "users" in query_lower or "team members" in query_lower:
-        return await get_users()
+        return await get_users(output_format=output_format, fields=fields)
     elif "assigned to" in query_lower:
         # Extract user name from query
-        user_match = re.search(r"assigned to (\w+)", query_lower)
+        user_match = re.search(rf"assigned to ({USER_PATTERN})", query_lower)
         if user_match:
             user_name = user_match.group(1)
-            user = await find_user_by_name_or_email(user_name)
+            user, candidates = await find_users(user_name)
             if user:
-                return await get_user_assigned_tasks(user.get("id"))
+                return await get_user_assigned_tasks(user.get("id"), output_format=output_format, fields=fields)
             else:
-                return f"User '{user_name}' not found."
+                return user_not_found(user_name, candidates)
         else:
             return "Please specify a user name for assigned tasks query."
     elif "action required" in query_lower:
         # Extract user name from query
-        user_match = re.search(r"action required (?:for|by) (\w+)", query_lower)
+        user_match = re.search(rf"action required (?:for|by) ({USER_PATTERN})", query_lower)
         if user_match:
             user_name = user_match.group(1)
-            user = await find_user_by_name_or_email(user_name)
+            user, candidates = await find_users(user_name)
             if user:
-                return await get_user_action_required_tasks(user.get("id"))
+                return await get_user_action_required_tasks(user.get("id"), output_format=output_format, fields=fields)
             else:
-                return f"User '{user_name}' not found."
+                return user_not_found(user_name, candidates)
         else:
             return "Please specify a user name for action required tasks query."
     else:
         return f"Query not recognized. Try queries like:\n- 'show me all projects'\n- 'show me all users'\n- 'show tasks assigned to [user]'\n- 'show action required tasks for [user]'"
 
+def project_subtree_ids(root_ids: set, projects: list) -> set:
+    """Return the given project IDs together with the IDs of all their descendant folders and sprints."""
+    children: dict = {}
+    for p in projects:
+        if isinstance(p, dict):
+            children.setdefault(p.get("parentProjectId"), []).append(p.get("id"))
+    subtree = set()
+    pending = list(root_ids)
+    while pending:
+        project_id = pending.pop()
+        if project_id not in subtree:
+            subtree.add(project_id)
+            pending.extend(children.get(project_id, []))
+    return subtree
+
+async def refresh_search_index(index: TaskSearchIndex) -> None:
+    """Re-sync the local search index from the task lists of all root projects."""
+    projects = await get_directory("projects")
+    if not isinstance(projects, list):
+        raise Exception("Unable to list projects for the search index")
+    project_ids = {p.get("id") for p in projects if isinstance(p, dict)}
+    # Root task lists include subfolder tasks, so every task is fetched once
+    roots = [
+        p["id"] for p in projects
+        if isinstance(p, dict) and p.get("id") and p.get("parentProjectId") not in project_ids
+    ]
+
+    async def fetch(project_id):
+        # Downloaded task lists are indexed through Tenant.observe
+        try:
+            return isinstance(await make_goodday_request(f"project/{project_id}/tasks?closed=true"), list)
+        except Exception as e:
+            logger.warning("Search index sync of project %s failed: %s", project_id, e)
+            return False
+
+    index.begin_refresh()
+    complete = False
+    try:
+        complete = all(await gather_limited(fetch, roots))
+    finally:
+        # Only sweep removed tasks when every project was listed
+        index.finish_refresh(sweep=complete)
+    # Messages are crawled afterwards, so a search waiting for this refresh does not wait for them too
+    tenant = current_tenant()
+    if "search-index messages" not in tenant.coalescer.inflight():
+        contextvars.Context().run(asyncio.ensure_future, crawl_search_messages_in_background(tenant, current_api_token()))
+
+async def crawl_search_messages(index: TaskSearchIndex) -> None:
+    """Fetch the messages of tasks that have had activity since their messages were indexed."""
+    async def fetch(task_id):
+        # Downloaded messages are indexed through Tenant.observe
+        try:
+            await make_goodday_request(f"task/{task_id}/messages")
+        except Exception as e:
+            logger.warning("Search index sync of task %s messages failed: %s", task_id, e)
+
+    await gather_limited(fetch, index.stale_messages())
+
+async def crawl_search_messages_in_background(tenant: Tenant, api_token: str) -> None:
+    """Crawl the messages of changed tasks without holding up any tool call."""
+    try:
+        with request_token(api_token):
+            await tenant.coalescer.do("search-index messages", lambda: crawl_search_messages(tenant.search_index))
+    except Exception as e:
+        logger.warning("Search index message crawl failed: %s", e)
+
+async def refresh_search_index_in_background(tenant: Tenant, api_token: str) -> None:
+    """Re-sync a stale search index without holding up the tool call that noticed it."""
+    try:
+        with request_token(api_token):
+            await tenant.coalescer.do("search-index refresh", lambda: refresh_search_index(tenant.search_index))
+    except Exception as e:
+        logger.warning("Search index refresh failed: %s", e)
+
+async def get_search_index() -> TaskSearchIndex:
+    """Return the current token's local search index, building it on first use."""
+    api_token = current_api_token()
+    tenant = tenants.get(api_token)
+    if tenant.search_index is None:
+        tenant.search_index = TaskSearchIndex()
+    index = tenant.search_index
+    if index.refreshed_at is None:
+        await tenant.coalescer.do("search-index refresh", lambda: refresh_search_index(index))
+    elif time.monotonic() - index.refreshed_at > SEARCH_INDEX_TTL and "search-index refresh" not in tenant.coalescer.inflight():
+        # Run in a fresh context so the refresh is not attributed to (or budgeted by) this tool call
+        contextvars.Context().run(asyncio.ensure_future, refresh_search_index_in_background(tenant, api_token))
+    return index
+
+async def resolve_search_filters(project_name: Optional[str], user_name: Optional[str]) -> tuple[Optional[set], Optional[set]]:
+    """Resolve search filters to the IDs of matching projects (with their subfolders) and users; None means no filter."""
+    project_ids = None
+    if project_name:
+        projects = await get_directory("projects") or []
+        needle = project_name.lower()
+        matched = {
+            p.get("id") for p in projects
+            if isinstance(p, dict) and needle in (p.get("name") or "").lower()
+        }
+        project_ids = project_subtree_ids(matched, projects)
+
+    user_ids = None
+    if user_name:
+        users = await get_directory("users") or []
+        needle = user_name.lower()
+        user_ids = {
+            u.get("id") for u in users
+            if isinstance(u, dict) and (needle in (u.get("name") or "").lower() or needle in (u.get("email") or "").lower())
+        }
+    return project_ids, user_ids
+
+async def search_tasks_locally(
+    query: str,
+    limit: int,
+    project_name: Optional[str],
+    user_name: Optional[str],
+    include_closed: bool,
+) -> list:
+    """Search the local BM25 index, returning tasks shaped like the search webhook's results."""
+    index = await get_search_index()
+    project_ids, user_ids = await resolve_search_filters(project_name, user_name)
+    hits = index.search(query, limit, project_ids=project_ids, user_ids=user_ids, include_closed=include_closed)
+    project_id_to_name = await get_project_mapping() if hits else {}
+    results = []
+    for hit in hits:
+        task = dict(hit.task)
+        task["score"] = hit.score
+        if hit.description and not task.get("message"):
+            task["message"] = hit.description
+        if not isinstance(task.get("project"), dict):
+            task["project"] = {"name": project_id_to_name.get(task.get("projectId"), "Unknown Project")}
+        results.append(task)
+    return results
+
+# Memory-mapped vector index written by goodday-vector-index --store local
+vector_index = LocalVectorIndex.from_env() if SEARCH_BACKEND == "vector" else None
+
+async def search_tasks_by_vector(
+    query: str,
+    limit: int,
+    project_name: Optional[str],
+    user_name: Optional[str],
+    include_closed: bool,
+) -> list:
+    """Search the local vector index, returning tasks shaped like the search webhook's results."""
+    if vector_index is None:
+        raise ValueError("GOODDAY_VECTOR_PATH environment variable is required for the vector search backend")
+    if not vector_index.serves(current_api_token()):
+        raise ValueError("The local vector index was built with a different Goodday API token")
+    project_ids, user_ids = await resolve_search_filters(project_name, user_name)
+    hits = await vector_index.search(query, limit, project_ids=project_ids, user_ids=user_ids, include_closed=include_closed)
+    project_id_to_name = await get_project_mapping() if hits else {}
+    return [
+        {
+            "id": hit.metadata.get("taskId"),
+            "shortId": hit.metadata.get("shortId"),
+            "name": hit.metadata.get("name"),
+            "status": {"name": hit.metadata.get("status") or "Unknown"},
+            "project": {"name": project_id_to_name.get(hit.metadata.get("projectId"), "Unknown Project")},
+            "assignedToUserId": hit.metadata.get("assignedToUserId"),
+            "message": hit.content,
+            "score": hit.score,
+        }
+        for hit in hits
+    ]
+
 # Vector Search Tool
 @mcp.tool()
 async def search_goodday_tasks(
@@ -1095,17 +1941,28 @@ async def search_goodday_tasks(
     limit: int = 10, 
     project_name: Optional[str] = None, 
     user_name: Optional[str] = None,
-    include_closed: bool = False
+    include_closed: bool = False,
+    output_format: Optional[str] = None,
+    fields: Optional[str] = None
 ) -> str:
     """Search for tasks using vector similarity search with optional filters.
 
+    With GOODDAY_SEARCH_BACKEND=local, tasks are instead ranked by keyword relevance
+    (BM25) over task names, IDs and comments from an in-process index, and with
+    GOODDAY_SEARCH_BACKEND=vector by similarity over a local memory-mapped vector index.
+    The webhook only answers for the server's own GOODDAY_API_TOKEN; other clients'
+    tokens are searched with the local index.
+
     Args:
         query: Search query (natural language)
         limit: Maximum number of results to return (default: 10, max: 50)
         project_name: Optional project name filter (case-insensitive partial match)
         user_name: Optional user name/email filter for assigned tasks
         include_closed: Whether to include closed/completed tasks (default: False)
+        output_format: "markdown" (default) or "json" for compact JSON
+        fields: Comma-separated fields to include in JSON output, as dotted paths (e.g. "shortId,status.name"), or "*" for all
     """
+    as_json = wants_json(output_format)
     # Validate limit
     if limit > 50:
         limit = 50
@@ -1127,7 +1984,15 @@ async def search_goodday_tasks(
 
     try:
         # Make search request
-        search_results = await make_search_request("GET", search_params)
+        if SEARCH_BACKEND == "local":
+            search_results = {"results": await search_tasks_locally(query, limit, project_name, user_name, include_closed)}
+        elif SEARCH_BACKEND == "vector":
+            search_results = {"results": await search_tasks_by_vector(query, limit, project_name, user_name, include_closed)}
+        elif search_webhook_serves(current_api_token()):
+            search_results = await make_search_request("GET", search_params)
+        else:
+            # Other clients' tokens must not see the server account's webhook results; use their own local index
+            search_results = {"results": await search_tasks_locally(query, limit, project_name, user_name, include_closed)}
         
         if not search_results:
             return "No results found for your search query."
@@ -1151,17 +2016,27 @@ async def search_goodday_tasks(
             return f"Unexpected search results format: {type(search_results)}"
 
         if not results:
-            return "No tasks found matching your search criteria."
+            return "[]" if as_json else "No tasks found matching your search criteria."
 
         # Get user mapping for display
         user_id_to_name = await get_user_mapping()
         
+        if as_json:
+            results = [
+                {**task, "assignedToUserName": user_id_to_name.get(task.get("assignedToUserId"))}
+                for task in results if isinstance(task, dict)
+            ]
+            return render_json(results, fields, SEARCH_RESULT_FIELDS)
+
         def user_display(user_id):
             if not user_id:
                 return "Unassigned"
             name = user_id_to_name.get(user_id)
             return name if name else f"User {user_id}"
 
+        # BM25 scores are keyword relevance, not a bounded similarity
+        score_label = "Relevance" if SEARCH_BACKEND == "local" else "Similarity"
+
         # Format results
         formatted_results = []
         for i, task in enumerate(results, 1):
@@ -1203,9 +2078,9 @@ async def search_goodday_tasks(
             # Handle similarity score if available
             score_info = ""
             if "score" in task:
-                score_info = f" (Similarity: {task['score']:.3f})"
+                score_info = f" ({score_label}: {task['score']:.3f})"
             elif "_score" in task:
-                score_info = f" (Similarity: {task['_score']:.3f})"
+                score_info = f" ({score_label}: {task['_score']:.3f})"
 
             formatted_result = f"""
 **{i}. {task_id}**: {task_name}{score_info}
@@ -1237,16 +2112,27 @@ async def search_goodday_tasks(
 
 # Document Management Tools
 @mcp.tool()
-async def search_project_documents(project_name: str, document_name: Optional[str] = None, include_content: bool = False) -> str:
+async def search_project_documents(
+    project_name: str,
+    document_name: Optional[str] = None,
+    include_content: bool = False,
+    max_content_bytes: Optional[int] = None,
+    output_format: Optional[str] = None,
+    fields: Optional[str] = None
+) -> str:
     """Search for documents in a specific project.
 
     Args:
         project_name: The name of the project to search in (case-insensitive)
         document_name: Optional document name to filter by (case-insensitive partial match)
         include_content: Whether to include the full content of each document
+        max_content_bytes: Optional cap on the total bytes of document content returned; documents beyond it are truncated or elided
+        output_format: "markdown" (default) or "json" for compact JSON
+        fields: Comma-separated fields to include in JSON output, as dotted paths (e.g. "shortId,status.name"), or "*" for all
     """
+    as_json = wants_json(output_format)
     # Find project
-    projects_data = await make_goodday_request("projects?archived=true")
+    projects_data = await get_directory("projects?archived=true")
     if not projects_data or not isinstance(projects_data, list):
         return "Unable to fetch projects."
 
@@ -1290,23 +2176,45 @@ async def search_project_documents(project_name: str, document_name: Optional[st
     user_id_to_name = await get_user_mapping()
     project_id_to_name = await get_project_mapping()
 
+    async def get_content(doc_id: str) -> str:
+        try:
+            content_data = await make_goodday_request(f"document/{doc_id}")
+            if content_data:
+                if isinstance(content_data, dict):
+                    return content_data.get('content', content_data.get('text', str(content_data)))
+                return str(content_data)
+        except Exception as e:
+            return f"Error fetching content: {str(e)}"
+        return ""
+
+    # Prefetch document contents concurrently
+    doc_contents = {}
+    if include_content:
+        content_ids = [
+            doc.get('id') for doc in documents_data
+            if isinstance(doc, dict) and doc.get('id', 'N/A') != 'N/A'
+        ]
+        doc_contents = dict(zip(content_ids, await gather_limited(get_content, content_ids)))
+    remaining_bytes = max_content_bytes
+
     # Format documents
+    json_docs = []
     formatted_docs = []
     for doc in documents_data:
         if isinstance(doc, dict):
             doc_id = doc.get('id', 'N/A')
-            doc_content = ""
+            doc_content = str(doc_contents.get(doc_id, ""))
             
-            if include_content and doc_id != 'N/A':
-                try:
-                    content_data = await make_goodday_request(f"document/{doc_id}")
-                    if content_data:
-                        if isinstance(content_data, dict):
-                            doc_content = content_data.get('content', content_data.get('text', str(content_data)))
-                        else:
-                            doc_content = str(content_data)
-                except Exception as e:
-                    doc_content = f"Error fetching content: {str(e)}"
+            if include_content and remaining_bytes is not None:
+                content_bytes = doc_content.encode("utf-8")
+                if len(content_bytes) <= remaining_bytes:
+                    remaining_bytes -= len(content_bytes)
+                elif remaining_bytes > 0:
+                    doc_content = content_bytes[:remaining_bytes].decode("utf-8", errors="ignore")
+                    doc_content += f"\n[... truncated: {remaining_bytes} of {len(content_bytes)} bytes shown, content budget reached ...]"
+                    remaining_bytes = 0
+                else:
+                    doc_content = f"[content elided: {len(content_bytes)} bytes, content budget reached]"
             
             project_id_val = doc.get('projectId', 'N/A')
             project_name_val = project_id_to_name.get(project_id_val, f"Project {project_id_val}") if project_id_val != 'N/A' else 'N/A'
@@ -1314,6 +2222,15 @@ async def search_project_documents(project_name: str, document_name: Optional[st
             created_by_id = doc.get('createdByUserId', 'N/A')
             created_by_name = user_id_to_name.get(created_by_id, f"User {created_by_id}") if created_by_id != 'N/A' else 'N/A'
             
+            if as_json:
+                json_docs.append({
+                    **doc,
+                    "projectName": project_id_to_name.get(doc.get('projectId')),
+                    "createdByUserName": user_id_to_name.get(doc.get('createdByUserId')),
+                    "content": doc_content if include_content else None,
+                })
+                continue
+
             formatted_doc = f"""
 **Document ID:** {doc_id}
 **Name:** {doc.get('name', 'N/A')}
@@ -1327,17 +2244,23 @@ async def search_project_documents(project_name: str, document_name: Optional[st
             
             formatted_docs.append(formatted_doc.strip())
 
+    if as_json:
+        return render_json(json_docs, fields, DOCUMENT_FIELDS)
+
     result = "\n---\n".join(formatted_docs)
     filter_text = f" matching '{document_name}'" if document_name else ""
     return f"**Documents in project '{actual_project_name}'{filter_text}:**\n\n{result}"
 
 @mcp.tool()
-async def get_document_content(document_id: str) -> str:
+async def get_document_content(document_id: str, output_format: Optional[str] = None, fields: Optional[str] = None) -> str:
     """Get the content of a specific document by its ID.
 
     Args:
         document_id: The ID of the document to retrieve
+        output_format: "markdown" (default) or "json" for compact JSON
+        fields: Comma-separated fields to include in JSON output, as dotted paths (e.g. "shortId,status.name"), or "*" for all
     """
+    as_json = wants_json(output_format)
     data = await make_goodday_request(f"document/{document_id}")
 
     if not data:
@@ -1346,6 +2269,9 @@ async def get_document_content(document_id: str) -> str:
     if isinstance(data, dict) and "error" in data:
         return f"Unable to fetch document: {data.get('error', 'Unknown error')}"
 
+    if as_json:
+        return render_json(data if isinstance(data, dict) else {"content": str(data)}, fields, DOCUMENT_CONTENT_FIELDS)
+
     if isinstance(data, dict):
         content = data.get('content', data.get('text', str(data)))
     else:
@@ -1353,9 +2279,114 @@ async def get_document_content(document_id: str) -> str:
 
     return f"**Document Content:**\n\n{content}"
 
+@mcp.tool()
+async def get_server_diagnostics(tool_name: Optional[str] = None, output_format: Optional[str] = None) -> str:
+    """Get upstream API call counts, latency percentiles and cache statistics of this server.
+
+    Args:
+        tool_name: Optional tool name to limit the per-endpoint breakdown to
+        output_format: "markdown" (default) or "json" for compact JSON
+    """
+    as_json = wants_json(output_format)
+    snapshot = tracer.snapshot()
+
+    tool_lines = []
+    for name, stats in sorted(snapshot["tools"].items(), key=lambda item: -item[1]["calls"]):
+        if tool_name and name != tool_name:
+            continue
+        tool_lines.append(
+            f"- **{name}**: {stats['calls']} calls, {stats['errors']} errors, "
+            f"{stats['upstream_requests_mean']:.1f} upstream requests/call (max {stats['upstream_requests_max']:.0f}), "
+            f"p50 {stats['p50_seconds'] * 1000:.0f}ms, p95 {stats['p95_seconds'] * 1000:.0f}ms"
+        )
+
+    endpoint_lines = []
+    for entry in sorted(snapshot["endpoints"], key=lambda e: -e["requests"]):
+        if tool_name and entry["tool"] != tool_name:
+            continue
+        statuses = ", ".join(f"{status}: {count}" for status, count in sorted(entry["statuses"].items()))
+        endpoint_lines.append(
+            f"- {entry['tool']} → {entry['method']} {entry['upstream']}:{entry['endpoint']}: "
+            f"{entry['requests']} requests ({statuses}), {entry['bytes']} bytes, "
+            f"p50 {entry['p50_seconds'] * 1000:.0f}ms, p95 {entry['p95_seconds'] * 1000:.0f}ms"
+        )
+
+    tenant = current_tenant()
+    if as_json:
+        caches = {
+            "directory_cache": tenant.directory_cache.stats(),
+            "listing_cache": tenant.listing_cache.stats(),
+            "request_coalescing": tenant.coalescer.stats(),
+            "task_index": {"tasks": len(tenant.task_index)},
+            "tenants": tenants.stats(),
+            "search_index": tenant.search_index.stats() if tenant.search_index is not None else None,
+            "vector_index": vector_index.stats() if vector_index else None,
+            "warm_up": warm_up_status if WARM_UP else None,
+            "response_cache": response_cache.stats() if response_cache else None,
+            "org_mirror": {**org_mirror.stats(), "sync": mirror_sync.stats()} if mirror_sync else None,
+        }
+        return to_json(prune({
+            "tools": {name: stats for name, stats in snapshot["tools"].items() if not tool_name or name == tool_name},
+            "endpoints": [entry for entry in snapshot["endpoints"] if not tool_name or entry["tool"] == tool_name],
+            "caches": caches,
+        }))
+
+    cache_lines = [
+        f"- **Directory cache**: {tenant.directory_cache.stats()}",
+        f"- **Listing cache**: {tenant.listing_cache.stats()}",
+        f"- **Request coalescing**: {tenant.coalescer.stats()}",
+        f"- **Task index**: {len(tenant.task_index)} tasks",
+        f"- **Tenants**: {tenants.stats()}",
+    ]
+    if tenant.search_index is not None:
+        cache_lines.append(f"- **Search index**: {tenant.search_index.stats()}")
+    if vector_index:
+        cache_lines.append(f"- **Vector index**: {vector_index.stats()}")
+    if WARM_UP:
+        cache_lines.append(f"- **Warm-up**: {warm_up_status}")
+    if response_cache:
+        cache_lines.append(f"- **Response cache**: {response_cache.stats()}")
+    if mirror_sync:
+        cache_lines.append(f"- **Org mirror**: {org_mirror.stats()}, sync: {mirror_sync.stats()}")
+
+    return f"""**Server Diagnostics:**
+
+**Tools:**
+{chr(10).join(tool_lines) or "No tool calls recorded."}
+
+**Upstream Endpoints:**
+{chr(10).join(endpoint_lines) or "No upstream requests recorded."}
+
+**Caches:**
+{chr(10).join(cache_lines)}"""
+
 def run_cli():
     """CLI entry point for the goodday-mcp server."""
-    mcp.run(transport='stdio')
+    parser = argparse.ArgumentParser(prog="goodday-mcp", description="Goodday MCP server")
+    parser.add_argument(
+        "--transport",
+        choices=["stdio", "sse", "streamable-http"],
+        default=os.getenv("GOODDAY_TRANSPORT", "stdio"),
+        help="MCP transport; sse and streamable-http serve many clients from one process (default: stdio)",
+    )
+    parser.add_argument("--host", default=os.getenv("GOODDAY_HOST", "127.0.0.1"), help="Interface to bind for HTTP transports")
+    parser.add_argument("--port", type=int, default=int(os.getenv("GOODDAY_PORT", "8000")), help="Port to bind for HTTP transports")
+    parser.add_argument(
+        "--allow-shared-token",
+        action="store_true",
+        help="Over HTTP, use GOODDAY_API_TOKEN for clients that do not send their own token",
+    )
+    args = parser.parse_args()
+
+    metrics_port = os.getenv("GOODDAY_METRICS_PORT")
+    if metrics_port:
+        start_metrics_server(int(metrics_port), os.getenv("GOODDAY_METRICS_HOST", "127.0.0.1"))
+    if args.transport != "stdio":
+        mcp.settings.host = args.host
+        mcp.settings.port = args.port
+        # Every HTTP client must act with its own Goodday token unless explicitly allowed otherwise
+        allow_env_token(args.allow_shared_token)
+    mcp.run(transport=args.transport)
 
 if __name__ == "__main__":
     run_cli()
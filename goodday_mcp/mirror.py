@@ -0,0 +1,374 @@
+"""
+Opt-in local SQLite mirror of a Goodday organization.
+
+MirrorSync keeps users, projects and tasks of the server's own API token in
+a SQLite file, re-downloading each project's task list in the background on
+a schedule (active projects often, archived projects rarely) and writing
+only the rows that changed. OrgMirror answers task list queries from the
+file as long as every project involved was synced within a staleness bound.
+"""
+
+import asyncio
+import contextvars
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+from .persistent_cache import token_fingerprint
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS users (
+    id TEXT PRIMARY KEY,
+    body TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS projects (
+    id TEXT PRIMARY KEY,
+    parent_id TEXT,
+    archived INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    body TEXT NOT NULL,
+    synced_at REAL
+);
+CREATE INDEX IF NOT EXISTS projects_parent_id ON projects (parent_id);
+CREATE TABLE IF NOT EXISTS tasks (
+    id TEXT PRIMARY KEY,
+    project_id TEXT NOT NULL,
+    assigned_to TEXT,
+    closed INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    hash TEXT NOT NULL,
+    body TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tasks_project_id ON tasks (project_id, position);
+CREATE INDEX IF NOT EXISTS tasks_assigned_to ON tasks (assigned_to);
+"""
+
+_PROJECT_TASKS_PATTERN = re.compile(r"^project/([^/*?]+)/tasks")
+
+
+def is_closed(task: dict) -> bool:
+    """Whether a task from a task list response is closed."""
+    return bool(task.get("momentClosed") or task.get("closed"))
+
+
+def _body_hash(body: str) -> str:
+    return hashlib.sha1(body.encode("utf-8")).hexdigest()
+
+
+class OrgMirror:
+    """SQLite store of one token's users, projects and tasks.
+
+    Args:
+        path: SQLite database file, created on first use
+        owner: The API token the mirror is synced with; only this token is served from it
+        max_staleness: Seconds since an active project's last sync within which it is served
+        archived_interval: Seconds since an archived project's last sync within which it is served
+    """
+
+    def __init__(self, path: str, owner: str, max_staleness: float = 600.0, archived_interval: float = 86400.0):
+        self.path = path
+        self.owner = token_fingerprint(owner)
+        self.max_staleness = max_staleness
+        self.archived_interval = archived_interval
+        self._conn: Optional[sqlite3.Connection] = None
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_env(cls) -> Optional["OrgMirror"]:
+        """Build the mirror from GOODDAY_MIRROR_* variables, or return None if it is disabled."""
+        path = os.getenv("GOODDAY_MIRROR_PATH")
+        owner = os.getenv("GOODDAY_API_TOKEN")
+        if not path or not owner:
+            return None
+        return cls(
+            os.path.expanduser(path),
+            owner,
+            max_staleness=float(os.getenv("GOODDAY_MIRROR_MAX_STALENESS", "600")),
+            archived_interval=float(os.getenv("GOODDAY_MIRROR_ARCHIVED_INTERVAL", "86400")),
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, isolation_level=None, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            row = conn.execute("SELECT value FROM meta WHERE key = 'owner'").fetchone()
+            if row is None or row[0] != self.owner:
+                # Data synced with another token must never be served to this one
+                conn.executescript("DELETE FROM users; DELETE FROM projects; DELETE FROM tasks; DELETE FROM meta;")
+                conn.execute("INSERT INTO meta (key, value) VALUES ('owner', ?)", (self.owner,))
+            self._conn = conn
+        return self._conn
+
+    def serves(self, api_token: str) -> bool:
+        """Whether queries made with api_token may be answered from the mirror."""
+        return token_fingerprint(api_token) == self.owner
+
+    def replace_users(self, users: list) -> None:
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM users")
+            conn.executemany(
+                "INSERT OR REPLACE INTO users (id, body) VALUES (?, ?)",
+                [(u["id"], json.dumps(u)) for u in users if isinstance(u, dict) and u.get("id")],
+            )
+
+    def replace_projects(self, projects: list, archived_ids: set) -> None:
+        """Store the project listing, keeping the sync time of projects that are still present."""
+        conn = self._connect()
+        synced = dict(conn.execute("SELECT id, synced_at FROM projects").fetchall())
+        rows = [
+            (p["id"], p.get("parentProjectId"), int(p["id"] in archived_ids), i, json.dumps(p), synced.get(p["id"]))
+            for i, p in enumerate(projects)
+            if isinstance(p, dict) and p.get("id")
+        ]
+        kept = {row[0] for row in rows}
+        with conn:
+            conn.execute("DELETE FROM projects")
+            conn.executemany(
+                "INSERT INTO projects (id, parent_id, archived, position, body, synced_at) VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            conn.executemany("DELETE FROM tasks WHERE project_id = ?", [(pid,) for pid in synced if pid not in kept])
+
+    def apply_project_tasks(self, project_id: str, tasks: list, synced_at: float) -> tuple[int, int]:
+        """Apply a project's direct task list as a delta and return (changed, removed) row counts."""
+        conn = self._connect()
+        existing = dict(conn.execute("SELECT id, hash FROM tasks WHERE project_id = ?", (project_id,)).fetchall())
+        upserts = []
+        seen = set()
+        for position, task in enumerate(tasks):
+            if not isinstance(task, dict) or not task.get("id"):
+                continue
+            body = json.dumps(task, sort_keys=True)
+            digest = _body_hash(f"{position}:{body}")
+            seen.add(task["id"])
+            if existing.get(task["id"]) != digest:
+                upserts.append((task["id"], project_id, task.get("assignedToUserId"), int(is_closed(task)), position, digest, body))
+        removed = [(task_id,) for task_id in existing if task_id not in seen]
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO tasks (id, project_id, assigned_to, closed, position, hash, body) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                upserts,
+            )
+            conn.executemany("DELETE FROM tasks WHERE id = ?", removed)
+            conn.execute("UPDATE projects SET synced_at = ? WHERE id = ?", (synced_at, project_id))
+        return len(upserts), len(removed)
+
+    def due_projects(self, now: float, active_interval: float, archived_interval: float) -> list[str]:
+        """Return the projects whose task lists should be synced now, least recently synced first."""
+        rows = self._connect().execute(
+            "SELECT id, archived, synced_at FROM projects ORDER BY COALESCE(synced_at, 0), position"
+        ).fetchall()
+        return [
+            project_id
+            for project_id, archived, synced_at in rows
+            if synced_at is None or now - synced_at >= (archived_interval if archived else active_interval)
+        ]
+
+    def mark_stale(self, project_ids: Optional[list] = None) -> None:
+        """Stop serving projects (all of them if project_ids is None) until they are synced again."""
+        conn = self._connect()
+        with conn:
+            if project_ids is None:
+                conn.execute("UPDATE projects SET synced_at = NULL")
+            else:
+                conn.executemany("UPDATE projects SET synced_at = NULL WHERE id = ?", [(pid,) for pid in project_ids])
+
+    def invalidate(self, pattern: str) -> None:
+        """Mark the projects affected by an invalidated endpoint pattern as stale.
+
+        User task lists need no handling of their own: they are only served
+        while every project is fresh, and a write marks its project stale.
+        """
+        match = _PROJECT_TASKS_PATTERN.match(pattern)
+        if match:
+            self.mark_stale([match.group(1)])
+        elif pattern.startswith("project/*/tasks") or pattern == "*":
+            self.mark_stale()
+
+    def _is_fresh(self, rows: list, now: float) -> bool:
+        return bool(rows) and all(
+            synced_at is not None
+            and now - synced_at < (max(self.max_staleness, self.archived_interval) if archived else self.max_staleness)
+            for _, archived, synced_at in rows
+        )
+
+    def project_tasks(self, project_id: str, closed: bool = False) -> Optional[list]:
+        """Return a project's tasks including its subfolders, or None if they are not fresh."""
+        try:
+            conn = self._connect()
+            rows = conn.execute(
+                """
+                WITH RECURSIVE subtree(id, depth, path) AS (
+                    SELECT id, 0, printf('%08d', position) FROM projects WHERE id = ?
+                    UNION ALL
+                    SELECT p.id, s.depth + 1, s.path || '/' || printf('%08d', p.position)
+                    FROM projects p JOIN subtree s ON p.parent_id = s.id
+                    WHERE s.depth < 32
+                )
+                SELECT s.id, p.archived, p.synced_at FROM subtree s JOIN projects p ON p.id = s.id ORDER BY s.path
+                """,
+                (project_id,),
+            ).fetchall()
+            if not self._is_fresh(rows, time.time()):
+                self.misses += 1
+                return None
+            order = {row[0]: i for i, row in enumerate(rows)}
+            placeholders = ",".join("?" * len(rows))
+            query = f"SELECT project_id, body FROM tasks WHERE project_id IN ({placeholders})"
+            if not closed:
+                query += " AND closed = 0"
+            tasks = conn.execute(query + " ORDER BY position", list(order)).fetchall()
+        except sqlite3.Error as e:
+            logger.warning("Mirror read failed: %s", e)
+            return None
+        self.hits += 1
+        tasks.sort(key=lambda row: order[row[0]])
+        return [json.loads(body) for _, body in tasks]
+
+    def user_assigned_tasks(self, user_id: str, closed: bool = False) -> Optional[list]:
+        """Return the tasks assigned to a user across the organization, or None if not every project is fresh."""
+        try:
+            conn = self._connect()
+            rows = conn.execute("SELECT id, archived, synced_at FROM projects").fetchall()
+            if not self._is_fresh(rows, time.time()):
+                self.misses += 1
+                return None
+            query = "SELECT body FROM tasks WHERE assigned_to = ?"
+            if not closed:
+                query += " AND closed = 0"
+            tasks = conn.execute(query + " ORDER BY project_id, position", (user_id,)).fetchall()
+        except sqlite3.Error as e:
+            logger.warning("Mirror read failed: %s", e)
+            return None
+        self.hits += 1
+        return [json.loads(body) for (body,) in tasks]
+
+    def stats(self) -> dict[str, Any]:
+        try:
+            conn = self._connect()
+            projects, fresh = conn.execute(
+                "SELECT COUNT(*), COUNT(synced_at) FROM projects"
+            ).fetchone()
+            tasks = conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+        except sqlite3.Error:
+            projects, fresh, tasks = None, None, None
+        return {"path": self.path, "projects": projects, "synced_projects": fresh, "tasks": tasks, "hits": self.hits, "misses": self.misses}
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+class MirrorSync:
+    """Background delta sync of an OrgMirror.
+
+    Args:
+        mirror: The mirror to keep up to date
+        fetch: Coroutine function fetching a Goodday endpoint as (endpoint, subfolders)
+        active_interval: Seconds between task list syncs of an active project
+        archived_interval: Seconds between task list syncs of an archived project
+        concurrency: Maximum project task lists fetched at once
+    """
+
+    def __init__(
+        self,
+        mirror: OrgMirror,
+        fetch: Callable[[str, bool], Awaitable[Any]],
+        active_interval: float = 300.0,
+        archived_interval: float = 86400.0,
+        concurrency: int = 4,
+    ):
+        self.mirror = mirror
+        self.fetch = fetch
+        self.active_interval = active_interval
+        self.archived_interval = archived_interval
+        self.concurrency = max(1, concurrency)
+        self._directory_synced_at = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self.passes = 0
+        self.last_error: Optional[str] = None
+
+    async def sync_directory(self) -> None:
+        """Refresh the users and projects listings."""
+        users, active, everything = await asyncio.gather(
+            self.fetch("users", True),
+            self.fetch("projects", True),
+            self.fetch("projects?archived=true", True),
+        )
+        if isinstance(users, list):
+            self.mirror.replace_users(users)
+        if isinstance(active, list) and isinstance(everything, list):
+            active_ids = {p.get("id") for p in active if isinstance(p, dict)}
+            known = {p.get("id") for p in everything if isinstance(p, dict)}
+            projects = everything + [p for p in active if isinstance(p, dict) and p.get("id") not in known]
+            archived_ids = {p.get("id") for p in projects if isinstance(p, dict)} - active_ids
+            self.mirror.replace_projects(projects, archived_ids)
+        self._directory_synced_at = time.time()
+
+    async def sync_once(self) -> dict[str, int]:
+        """Sync the directory if due, then every project whose task list is due."""
+        if time.time() - self._directory_synced_at >= self.active_interval:
+            await self.sync_directory()
+        due = self.mirror.due_projects(time.time(), self.active_interval, self.archived_interval)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        totals = {"projects": 0, "changed": 0, "removed": 0, "failed": 0}
+
+        async def sync_project(project_id: str) -> None:
+            async with semaphore:
+                try:
+                    tasks = await self.fetch(f"project/{project_id}/tasks?closed=true", False)
+                except Exception as e:
+                    totals["failed"] += 1
+                    logger.warning("Mirror sync of project %s failed: %s", project_id, e)
+                    return
+            if isinstance(tasks, list):
+                changed, removed = self.mirror.apply_project_tasks(project_id, tasks, time.time())
+                totals["projects"] += 1
+                totals["changed"] += changed
+                totals["removed"] += removed
+
+        await asyncio.gather(*(sync_project(project_id) for project_id in due))
+        self.passes += 1
+        return totals
+
+    async def run(self, tick: Optional[float] = None) -> None:
+        """Sync forever, checking for due projects every tick seconds."""
+        tick = tick or max(5.0, min(60.0, self.active_interval / 4))
+        while True:
+            try:
+                totals = await self.sync_once()
+                self.last_error = None
+                if totals["projects"]:
+                    logger.info("Mirror sync: %s", totals)
+            except Exception as e:
+                self.last_error = str(e)
+                logger.warning("Mirror sync failed: %s", e)
+            await asyncio.sleep(tick)
+
+    def ensure_started(self) -> None:
+        """Start the background sync on the running event loop unless it is already running."""
+        if self._task is None or self._task.done():
+            # Run in a fresh context so the sync is not attributed to the tool call that started it
+            self._task = contextvars.Context().run(asyncio.ensure_future, self.run())
+
+    def stats(self) -> dict[str, Any]:
+        return {"running": self._task is not None and not self._task.done(), "passes": self.passes, "last_error": self.last_error}
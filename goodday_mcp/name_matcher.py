@@ -0,0 +1,201 @@
+"""
+Ranked fuzzy matching of names, such as project names, typed by a user.
+
+NameMatcher normalizes every name once and indexes it by its sorted form,
+its tokens and its character trigrams. A lookup ranks the items in tiers:
+exact match, prefix, every query word starting a word of the name,
+substring, and finally approximate matches: small edit distances, and
+names made only of words of the query (e.g. "ASTRA" for "astra project"),
+ranked by the characters they differ by. Closer matches come first within
+a tier. Exact and prefix matches are binary searches and token matches are
+index lookups, so only queries that fall through to the substring or edit
+distance tiers look at every name.
+"""
+
+import heapq
+import re
+from bisect import bisect_left
+from collections import Counter
+from itertools import combinations
+from typing import Any, Callable, Iterable, NamedTuple, Optional
+
+_SEPARATORS = re.compile(r"[\W_]+")
+
+EXACT, PREFIX, TOKEN, SUBSTRING, FUZZY = range(5)
+# Names sharing the most trigrams with the query are compared by edit distance, at most this many
+FUZZY_CANDIDATES = 32
+# Trigrams found in more names than this are not used to pick those candidates,
+# unless fewer than MIN_TRIGRAMS of the query's trigrams are rarer
+COMMON_TRIGRAM = 256
+MIN_TRIGRAMS = 3
+# Queries with more words than this are not checked for names made only of their words
+MAX_CONTAINED_WORDS = 8
+
+
+def normalize(name: str) -> str:
+    """Lowercase a name and collapse punctuation and whitespace to single spaces."""
+    return " ".join(part for part in _SEPARATORS.split(name.lower()) if part)
+
+
+def _trigrams(text: str) -> set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Levenshtein distance between a and b, or limit + 1 once it is known to exceed limit.
+
+    Only the diagonal band of width 2 * limit + 1 is computed, since cells
+    outside it are already further than limit apart.
+    """
+    over = limit + 1
+    if abs(len(a) - len(b)) > limit:
+        return over
+    if a == b:
+        return 0
+    previous = [j if j <= limit else over for j in range(len(b) + 1)]
+    for i in range(1, len(a) + 1):
+        char_a = a[i - 1]
+        current = [over] * (len(b) + 1)
+        current[0] = row_min = i if i <= limit else over
+        for j in range(max(1, i - limit), min(len(b), i + limit) + 1):
+            cost = previous[j - 1] + (char_a != b[j - 1])
+            if previous[j] + 1 < cost:
+                cost = previous[j] + 1
+            if current[j - 1] + 1 < cost:
+                cost = current[j - 1] + 1
+            current[j] = cost
+            if cost < row_min:
+                row_min = cost
+        if row_min > limit:
+            return over
+        previous = current
+    return min(previous[-1], over)
+
+
+class NameMatch(NamedTuple):
+    """A ranked candidate: the item, which of its names matched, the match tier and the rank within it."""
+    item: Any
+    name: str
+    tier: int
+    distance: int
+
+
+class NameMatcher:
+    """Index of items by one or more names each, answering ranked fuzzy lookups.
+
+    Args:
+        items: The items to match, e.g. project dicts
+        names: Returns the names an item can be found by
+    """
+
+    def __init__(self, items: Iterable[Any], names: Callable[[Any], Iterable[Optional[str]]] = lambda item: [item.get("name")]):
+        self.items = list(items)
+        entries = sorted(
+            (normalized, position, name)
+            for position, item in enumerate(self.items)
+            for name in names(item)
+            if name and (normalized := normalize(name))
+        )
+        self._keys = [key for key, _, _ in entries]
+        self._positions = [position for _, position, _ in entries]
+        self._names = [name for _, _, name in entries]
+        self._key_tokens = [frozenset(key.split()) for key in self._keys]
+        self._tokens: dict[str, list[int]] = {}
+        self._token_sets: dict[frozenset, list[int]] = {}
+        self._trigrams: dict[str, list[int]] = {}
+        for entry, key in enumerate(self._keys):
+            self._token_sets.setdefault(self._key_tokens[entry], []).append(entry)
+            for token in self._key_tokens[entry]:
+                self._tokens.setdefault(token, []).append(entry)
+            for trigram in _trigrams(key):
+                self._trigrams.setdefault(trigram, []).append(entry)
+        self._vocabulary = sorted(self._tokens)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def rank(self, query: str, limit: int = 5) -> list[NameMatch]:
+        """Return up to limit items matching query, best first."""
+        query = normalize(query)
+        if not query:
+            return []
+        # Best (tier, distance, name, entry) seen for each item
+        best: dict[int, tuple[int, int, str, int]] = {}
+
+        def offer(entry: int, tier: int, distance: int) -> None:
+            position = self._positions[entry]
+            current = best.get(position)
+            if current is None or (tier, distance) < current[:2]:
+                best[position] = (tier, distance, keys[entry], entry)
+
+        keys = self._keys
+        entry = bisect_left(keys, query)
+        while entry < len(keys) and keys[entry].startswith(query):
+            offer(entry, EXACT if keys[entry] == query else PREFIX, len(keys[entry]) - len(query))
+            entry += 1
+
+        query_tokens = query.split()
+        token_matches: Optional[set[int]] = None
+        for token in query_tokens:
+            entries: set[int] = set()
+            index = bisect_left(self._vocabulary, token)
+            while index < len(self._vocabulary) and self._vocabulary[index].startswith(token):
+                entries.update(self._tokens[self._vocabulary[index]])
+                index += 1
+            token_matches = entries if token_matches is None else token_matches & entries
+            if not token_matches:
+                break
+        for entry in token_matches or ():
+            offer(entry, TOKEN, len(self._key_tokens[entry]) - len(query_tokens))
+        # Names made only of words of a longer query, ranked by the query characters they leave out
+        query_token_set = sorted(set(query_tokens))
+        if 1 < len(query_token_set) <= MAX_CONTAINED_WORDS:
+            for size in range(1, len(query_token_set)):
+                for words in combinations(query_token_set, size):
+                    for entry in self._token_sets.get(frozenset(words), ()):
+                        offer(entry, FUZZY, len(query) - len(keys[entry]))
+
+        if len(best) < limit:
+            for entry, key in enumerate(keys):
+                if query in key:
+                    offer(entry, SUBSTRING, len(key) - len(query))
+
+        if len(best) < limit and len(query) >= 3:
+            max_distance = max(1, len(query) // 3)
+            # Trigrams shared by many names say little about closeness and would dominate the counting
+            postings = sorted((p for trigram in _trigrams(query) if (p := self._trigrams.get(trigram))), key=len)
+            rare = [p for p in postings if len(p) <= COMMON_TRIGRAM]
+            postings = rare if len(rare) >= MIN_TRIGRAMS else postings[:MIN_TRIGRAMS]
+            shared = Counter(entry for posting in postings for entry in posting)
+            for entry, _ in shared.most_common(FUZZY_CANDIDATES):
+                if self._positions[entry] in best:
+                    continue
+                key = keys[entry]
+                # A misspelled word, or a typo near the start of a longer name, still matches
+                targets = {key, key[:len(query)]}
+                if len(query_tokens) == 1:
+                    targets.update(self._key_tokens[entry])
+                distance = min(edit_distance(query, target, max_distance) for target in targets)
+                if distance <= max_distance:
+                    offer(entry, FUZZY, distance)
+
+        return [
+            NameMatch(self.items[self._positions[entry]], self._names[entry], tier, distance)
+            for tier, distance, _, entry in heapq.nsmallest(limit, best.values())
+        ]
+
+    def resolve(self, query: str, limit: int = 5) -> tuple[Optional[NameMatch], list[NameMatch]]:
+        """Return the single best match and the ranked candidates.
+
+        The match is None if nothing matches, or if the best tier is not an
+        exact match and holds several candidates: "astra" prefixes both
+        "ASTRA-Core" and "ASTRA-Legacy", and the shorter name is no better a guess.
+        """
+        candidates = self.rank(query, limit)
+        if not candidates:
+            return None, candidates
+        top = candidates[0]
+        if top.tier != EXACT and len(candidates) > 1 and candidates[1].tier == top.tier:
+            return None, candidates
+        return top, candidates
@@ -0,0 +1,106 @@
+"""
+Compact JSON output for the read tools.
+
+Read tools return Markdown by default. With output_format="json" they return
+the Goodday objects behind the Markdown as compact JSON instead: only the
+selected fields (by default the ones the Markdown shows), without nulls or
+indentation. Fields are dotted paths such as "status.name"; paths through a
+list apply to each item, and "*" selects every field.
+"""
+
+import json
+import os
+from typing import Any, Optional, Sequence
+
+OUTPUT_FORMATS = ("markdown", "json")
+# Format used when a tool call does not ask for one
+DEFAULT_OUTPUT_FORMAT = os.getenv("GOODDAY_OUTPUT_FORMAT", "markdown").strip().lower()
+
+TASK_FIELDS = (
+    "shortId", "name", "status.name", "project.name", "assignedToUserId",
+    "priority", "startDate", "endDate", "message",
+)
+TASK_DETAIL_FIELDS = (
+    "id", "shortId", "name", "project.name", "status.name", "taskType.name", "priority",
+    "assignedToUserId", "assignedToUserName", "actionRequiredUserId", "actionRequiredUserName",
+    "createdByUserId", "createdByUserName", "startDate", "endDate", "deadline", "estimate",
+    "reportedTime", "users", "subtasks.shortId", "subtasks.name", "customFieldsData", "description",
+)
+SPRINT_TASK_FIELDS = ("shortId", "name", "status.name", "assignedToUserName", "priority")
+SPRINT_SUMMARY_TASK_FIELDS = ("shortId", "name", "status.name", "assignedToUserName", "description")
+MESSAGE_FIELDS = (
+    "id", "dateCreated", "fromUserId", "fromUserName", "toUserId", "toUserName", "message", "taskStatusId",
+)
+SEARCH_RESULT_FIELDS = (
+    "shortId", "name", "status.name", "project.name", "assignedToUserId", "assignedToUserName",
+    "priority", "startDate", "endDate", "message", "score",
+)
+PROJECT_FIELDS = ("id", "name", "health", "status.name", "startDate", "endDate", "progress", "owner.name")
+USER_FIELDS = ("id", "name", "email", "role.name", "status")
+DOCUMENT_FIELDS = (
+    "id", "name", "projectId", "projectName", "createdByUserId", "createdByUserName",
+    "momentCreated", "momentUpdated", "content",
+)
+DOCUMENT_CONTENT_FIELDS = ("id", "name", "content", "text")
+
+
+def validate_output_format(output_format: Optional[str]) -> str:
+    """Return the output format a tool call asked for, falling back to GOODDAY_OUTPUT_FORMAT."""
+    chosen = (output_format or DEFAULT_OUTPUT_FORMAT).strip().lower()
+    if chosen not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output_format '{output_format}'; use 'markdown' or 'json'")
+    return chosen
+
+
+def wants_json(output_format: Optional[str]) -> bool:
+    """Whether a tool call asked for JSON, falling back to GOODDAY_OUTPUT_FORMAT."""
+    return validate_output_format(output_format) == "json"
+
+
+def parse_fields(fields: Optional[str], default: Sequence[str]) -> Optional[list[str]]:
+    """Turn a comma-separated fields argument into paths; None selects every field."""
+    if not fields:
+        return list(default)
+    paths = [f.strip() for f in fields.split(",") if f.strip()]
+    return None if "*" in paths else paths
+
+
+def prune(value: Any) -> Any:
+    """Drop null values from dicts, recursively."""
+    if isinstance(value, dict):
+        return {k: prune(v) for k, v in value.items() if v is not None}
+    if isinstance(value, list):
+        return [prune(v) for v in value]
+    return value
+
+
+def select(value: Any, fields: Optional[list[str]]) -> Any:
+    """Keep only the given dotted field paths of a value, mapping over lists."""
+    if fields is None:
+        return prune(value)
+    if isinstance(value, list):
+        return [select(item, fields) for item in value]
+    if not isinstance(value, dict):
+        return prune(value)
+    nested: dict[str, list[str]] = {}
+    for path in fields:
+        head, _, rest = path.partition(".")
+        nested.setdefault(head, []).append(rest)
+    selected = {}
+    for head, rests in nested.items():
+        if value.get(head) is None:
+            continue
+        # Selecting the field itself keeps all of it, even if sub-paths are selected too
+        picked = select(value[head], None if "" in rests else rests)
+        if picked != {}:
+            selected[head] = picked
+    return selected
+
+
+def to_json(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+def render_json(data: Any, fields: Optional[str], default: Sequence[str]) -> str:
+    """Render a Goodday object or list as compact JSON with the requested fields."""
+    return to_json(select(data, parse_fields(fields, default)))
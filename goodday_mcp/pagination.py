@@ -0,0 +1,109 @@
+"""
+Cursor pagination with a response byte budget for large listings.
+
+A page holds at most page_size items and stops early once the rendered
+items would exceed the byte budget. The cursor for the next page is an
+opaque token holding the listing it belongs to and the offset to resume
+from, so a cursor cannot be replayed against a different listing.
+"""
+
+import base64
+import hashlib
+import json
+from typing import Any, Callable, NamedTuple, Optional, Sequence
+
+from .output import to_json
+
+# Strings in a JSON item that alone exceeds the budget are cut down to no less than this
+MIN_STRING_CHARS = 16
+
+
+def _listing_key(listing: str) -> str:
+    return hashlib.sha256(listing.encode("utf-8")).hexdigest()[:12]
+
+
+def encode_cursor(listing: str, offset: int) -> str:
+    """Return the opaque cursor resuming a listing at offset."""
+    token = json.dumps({"l": _listing_key(listing), "o": offset}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(token.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, listing: str) -> int:
+    """Return the offset a cursor resumes at, or raise ValueError if it is not a cursor for this listing."""
+    try:
+        token = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        listing_key, offset = token["l"], int(token["o"])
+    except (ValueError, KeyError, TypeError):
+        raise ValueError(f"Invalid cursor '{cursor}'") from None
+    if listing_key != _listing_key(listing) or offset < 0:
+        raise ValueError("The cursor belongs to a different listing; request the first page again")
+    return offset
+
+
+def truncate_text(text: str, max_bytes: int) -> str:
+    """Cut text to at most max_bytes of UTF-8, marking the cut."""
+    data = text.encode("utf-8")
+    if len(data) <= max_bytes:
+        return text
+    marker = f"\n[... truncated: {len(data)} bytes, response budget reached ...]"
+    keep = max(0, max_bytes - len(marker.encode("utf-8")))
+    return data[:keep].decode("utf-8", errors="ignore") + marker
+
+
+def _cut_strings(value: Any, limit: int) -> Any:
+    if isinstance(value, str):
+        return value if len(value) <= limit else value[:limit] + "…"
+    if isinstance(value, dict):
+        return {k: _cut_strings(v, limit) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_cut_strings(v, limit) for v in value]
+    return value
+
+
+def fit_json(value: Any, max_bytes: int) -> str:
+    """Render a value as compact JSON, shortening its longest strings until it fits max_bytes if it can."""
+    text = to_json(value)
+    limit = len(text)
+    while len(text.encode("utf-8")) > max_bytes and limit > MIN_STRING_CHARS:
+        limit = max(MIN_STRING_CHARS, limit // 2)
+        text = to_json(_cut_strings(value, limit))
+    return text
+
+
+class Page(NamedTuple):
+    """Rendered items of one page, the offset of the next page (None on the last) and the listing size."""
+    parts: list[str]
+    start: int
+    next_offset: Optional[int]
+    total: int
+
+
+def paginate(
+    items: Sequence[Any],
+    offset: int,
+    page_size: int,
+    max_bytes: int,
+    render: Callable[[Any], str],
+    fit: Callable[[Any, int], str],
+    separator: str,
+) -> Page:
+    """Render the page of items starting at offset within page_size items and max_bytes.
+
+    Every page holds at least one item, so a listing always advances; an item
+    that alone exceeds the budget is rendered with fit, which shrinks it.
+    """
+    parts: list[str] = []
+    used = 0
+    separator_bytes = len(separator.encode("utf-8"))
+    for item in items[offset:offset + max(1, page_size)]:
+        part = render(item)
+        size = len(part.encode("utf-8")) + (separator_bytes if parts else 0)
+        if used + size > max_bytes:
+            if parts:
+                break
+            part = fit(item, max_bytes)
+            size = len(part.encode("utf-8"))
+        parts.append(part)
+        used += size
+    end = offset + len(parts)
+    return Page(parts, offset, end if end < len(items) else None, len(items))
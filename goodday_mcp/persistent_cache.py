@@ -0,0 +1,198 @@
+"""
+Persistent on-disk cache of Goodday GET responses backed by SQLite.
+
+Responses are keyed by a fingerprint of the API token plus the endpoint and
+expire per endpoint class (directory listings, task lists, messages). The
+file is shared safely between server processes and trimmed to a size bound
+by evicting the least recently used entries, so a restarted server comes up
+warm instead of re-downloading the organization directory.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import time
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Endpoint classes with their own TTLs; anything unmatched is not cached
+ENDPOINT_CLASSES = [
+    ("directory", re.compile(r"^(users|projects)(\?.*)?$|^(user|project)/[^/?]+(/users)?$")),
+    ("tasks", re.compile(r"^project/[^/?]+/tasks(\?.*)?$|^user/[^/?]+/(assigned|action-required)-tasks(\?.*)?$|^task/[^/?]+$")),
+    ("messages", re.compile(r"^task/[^/?]+/messages(\?.*)?$")),
+]
+
+DEFAULT_TTLS = {
+    "directory": 6 * 3600.0,
+    "tasks": 60.0,
+    "messages": 600.0,
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    body TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    stored_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at);
+"""
+
+
+def token_fingerprint(api_token: str) -> str:
+    """Short, non-reversible identifier for an API token."""
+    return hashlib.sha256(api_token.encode("utf-8")).hexdigest()[:16]
+
+
+def classify_endpoint(endpoint: str) -> Optional[str]:
+    """Return the cache class of an endpoint, or None if it is not cacheable."""
+    endpoint = endpoint.lstrip("/")
+    for name, pattern in ENDPOINT_CLASSES:
+        if pattern.match(endpoint):
+            return name
+    return None
+
+
+class ResponseCache:
+    """SQLite-backed GET response cache with per-class TTLs and LRU eviction.
+
+    Args:
+        path: SQLite database file, created on first use
+        ttls: Seconds each endpoint class stays fresh; 0 disables caching for that class
+        max_bytes: Upper bound on the total size of stored response bodies
+    """
+
+    # Check the size bound after this many writes rather than on every write
+    EVICT_EVERY = 50
+
+    def __init__(self, path: str, ttls: Optional[dict[str, float]] = None, max_bytes: int = 64 * 1024 * 1024):
+        self.path = path
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.max_bytes = max_bytes
+        self._conn: Optional[sqlite3.Connection] = None
+        self._writes = 0
+        # Bumped on invalidation; writes carrying an older generation are dropped
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_env(cls) -> Optional["ResponseCache"]:
+        """Build the cache from GOODDAY_CACHE_* variables, or return None if it is disabled."""
+        path = os.getenv("GOODDAY_CACHE_PATH")
+        if not path:
+            return None
+        ttls = {
+            name: float(os.getenv(f"GOODDAY_CACHE_TTL_{name.upper()}", default))
+            for name, default in DEFAULT_TTLS.items()
+        }
+        max_bytes = int(float(os.getenv("GOODDAY_CACHE_MAX_MB", "64")) * 1024 * 1024)
+        return cls(os.path.expanduser(path), ttls, max_bytes)
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, isolation_level=None, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def _ttl(self, endpoint: str) -> float:
+        endpoint_class = classify_endpoint(endpoint)
+        return self.ttls.get(endpoint_class, 0.0) if endpoint_class else 0.0
+
+    def get(self, api_token: str, endpoint: str) -> Any:
+        """Return the cached response for endpoint, or None if missing or expired."""
+        ttl = self._ttl(endpoint)
+        if ttl <= 0:
+            return None
+        key = f"{token_fingerprint(api_token)}:{endpoint}"
+        try:
+            conn = self._connect()
+            row = conn.execute("SELECT body, stored_at FROM responses WHERE key = ?", (key,)).fetchone()
+            now = time.time()
+            if row is None or now - row[1] >= ttl:
+                self.misses += 1
+                return None
+            conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            return json.loads(row[0])
+        except (sqlite3.Error, ValueError) as e:
+            logger.warning("Response cache read failed: %s", e)
+            return None
+
+    def put(self, api_token: str, endpoint: str, value: Any, generation: Optional[int] = None) -> None:
+        """Store a successful response if its endpoint class is cacheable.
+
+        Passing the generation read before the request was sent drops the
+        write if an invalidation happened while it was in flight.
+        """
+        if value is None or self._ttl(endpoint) <= 0:
+            return
+        if generation is not None and generation != self.generation:
+            return
+        if isinstance(value, dict) and "error" in value:
+            return
+        key = f"{token_fingerprint(api_token)}:{endpoint}"
+        try:
+            body = json.dumps(value, separators=(",", ":"))
+            now = time.time()
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, body, size, stored_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, body, len(body.encode("utf-8")), now, now),
+            )
+            self._writes += 1
+            if self._writes % self.EVICT_EVERY == 0:
+                self.evict()
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            logger.warning("Response cache write failed: %s", e)
+
+    def invalidate(self, api_token: str, pattern: str) -> None:
+        """Remove the token's entries whose endpoint matches pattern ('*' is a wildcard)."""
+        self.generation += 1
+        key = f"{token_fingerprint(api_token)}:{pattern}"
+        escaped = key.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_").replace("*", "%")
+        try:
+            self._connect().execute("DELETE FROM responses WHERE key LIKE ? ESCAPE '\\'", (escaped,))
+        except sqlite3.Error as e:
+            logger.warning("Response cache invalidation failed: %s", e)
+
+    def evict(self) -> None:
+        """Delete least recently used entries until the total size is within max_bytes."""
+        conn = self._connect()
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        excess = total - self.max_bytes
+        freed = 0
+        stale_keys = []
+        for key, size in conn.execute("SELECT key, size FROM responses ORDER BY accessed_at"):
+            stale_keys.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        conn.executemany("DELETE FROM responses WHERE key = ?", stale_keys)
+
+    def stats(self) -> dict[str, Any]:
+        try:
+            count, size = self._connect().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        except sqlite3.Error:
+            count, size = None, None
+        return {"path": self.path, "entries": count, "bytes": size, "hits": self.hits, "misses": self.misses}
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
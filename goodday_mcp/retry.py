@@ -0,0 +1,135 @@
+"""
+Retry and client-side rate limiting for Goodday API requests.
+
+RetryPolicy retries rate-limited and transient failures with jittered
+exponential backoff, honouring Retry-After, within a per-tool-call time
+budget. TokenBucket spaces requests out so the server stays under the
+organization's API quota in the first place.
+"""
+
+import asyncio
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Iterator, Optional
+
+# Methods that are safe to repeat after a failure whose outcome is unknown
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+_deadline: ContextVar[Optional[float]] = ContextVar("goodday_retry_deadline", default=None)
+
+
+@contextmanager
+def retry_budget(seconds: float) -> Iterator[None]:
+    """Bound the total time spent waiting to retry within the enclosed tool call."""
+    token = _deadline.set(time.monotonic() + seconds if seconds > 0 else None)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining_budget() -> Optional[float]:
+    """Return the seconds left in the current retry budget, or None if unbounded."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.monotonic())
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given either as seconds or as an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class RetryPolicy:
+    """Decide whether a failed request is retried and wait before the retry.
+
+    Transport errors and 5xx responses are only retried for idempotent
+    methods. A 429 is retried for any method because the request was
+    rejected before it was applied.
+
+    Args:
+        max_attempts: Total attempts per request, including the first
+        base_delay: Backoff ceiling in seconds for the first retry, doubled per attempt
+        max_delay: Upper bound in seconds for a single backoff
+    """
+
+    def __init__(self, max_attempts: int = 4, base_delay: float = 0.5, max_delay: float = 30.0):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def is_retryable(self, method: str, status_code: Optional[int] = None) -> bool:
+        """Whether a response status (or a transport error, when None) may be retried."""
+        if status_code == 429:
+            return True
+        if method.upper() not in IDEMPOTENT_METHODS:
+            return False
+        return status_code is None or status_code in RETRYABLE_STATUS_CODES
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Seconds to wait before retry number attempt + 1 (full jitter)."""
+        if retry_after is not None:
+            return retry_after
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    async def should_retry(
+        self,
+        method: str,
+        attempt: int,
+        status_code: Optional[int] = None,
+        retry_after: Optional[float] = None,
+    ) -> bool:
+        """Wait out the backoff and return True if the request should be sent again."""
+        if attempt + 1 >= self.max_attempts or not self.is_retryable(method, status_code):
+            return False
+        delay = self.backoff(attempt, retry_after)
+        remaining = remaining_budget()
+        if remaining is not None and delay > remaining:
+            return False
+        await asyncio.sleep(delay)
+        return True
+
+
+class TokenBucket:
+    """Client-side request rate limiter.
+
+    Args:
+        rate: Sustained requests per second; 0 disables limiting
+        burst: Requests that may be sent back-to-back before throttling
+    """
+
+    def __init__(self, rate: float, burst: float = 1.0):
+        self.rate = rate
+        self.capacity = max(1.0, burst)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+    async def acquire(self) -> None:
+        """Take one token, sleeping until it becomes available."""
+        if self.rate <= 0:
+            return
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        # Reserve the token up front; a negative balance queues callers in arrival order
+        self._tokens -= 1
+        if self._tokens < 0:
+            await asyncio.sleep(-self._tokens / self.rate)
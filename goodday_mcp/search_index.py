@@ -0,0 +1,222 @@
+"""
+In-process full-text task search with BM25 ranking.
+
+TaskSearchIndex keeps an inverted index over task names, shortIds and
+message bodies. It is updated incrementally from the task lists, tasks and
+message lists the server downloads, and periodically re-synced in full so
+removed tasks drop out; after each re-sync, the messages of tasks with new
+activity since their messages were indexed are fetched again. Queries are ranked with Okapi BM25 and can be
+restricted to projects, assignees and open tasks.
+"""
+
+import heapq
+import math
+import re
+import time
+from collections import Counter
+from typing import Any, Iterable, NamedTuple, Optional
+
+from .mirror import is_closed
+
+_TOKEN = re.compile(r"[0-9a-z]+(?:-[0-9a-z]+)*")
+_PROJECT_TASKS_ENDPOINT = re.compile(r"^/?project/([^/?]+)/tasks(?:\?|$)")
+_TASK_ENDPOINT = re.compile(r"^/?task/([^/?]+)(?:\?|$)")
+_TASK_MESSAGES_ENDPOINT = re.compile(r"^/?task/([^/?]+)/messages(?:\?|$)")
+
+# Task name terms count this many times, so a match in the title outranks one in a comment
+NAME_WEIGHT = 3
+# Characters of the first message kept to show as the task description
+DESCRIPTION_CHARS = 500
+
+
+def _activity(task: dict) -> Optional[str]:
+    return task.get("recentActivityMoment") or task.get("momentUpdated")
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase terms; hyphenated words such as shortIds also yield their parts."""
+    terms = []
+    for token in _TOKEN.findall(text.lower()):
+        terms.append(token)
+        if "-" in token:
+            terms.extend(token.split("-"))
+    return terms
+
+
+class SearchHit(NamedTuple):
+    """A ranked search result: the task as last downloaded, its description and BM25 score."""
+    task: dict
+    description: Optional[str]
+    score: float
+
+
+class _Document:
+    __slots__ = (
+        "task", "project_id", "assigned_to", "closed", "name_terms", "message_terms", "description", "length",
+        "messages_indexed", "messages_activity",
+    )
+
+    def __init__(self, task: dict, project_id: Optional[str]):
+        self.task = task
+        self.project_id = project_id
+        self.assigned_to = task.get("assignedToUserId")
+        self.closed = is_closed(task)
+        self.name_terms = Counter(tokenize(f"{task.get('shortId') or ''} {task.get('name') or ''}"))
+        self.message_terms: Counter = Counter()
+        self.description: Optional[str] = None
+        self.length = 0
+        # Whether the messages were indexed, and the task's activity moment when they were
+        self.messages_indexed = False
+        self.messages_activity: Optional[str] = None
+
+    def terms(self) -> Counter:
+        counts = Counter({term: count * NAME_WEIGHT for term, count in self.name_terms.items()})
+        counts.update(self.message_terms)
+        return counts
+
+
+class TaskSearchIndex:
+    """Inverted index of tasks ranked with BM25.
+
+    Args:
+        k1: Term frequency saturation
+        b: Document length normalization
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._documents: dict[str, _Document] = {}
+        self._postings: dict[str, dict[str, int]] = {}
+        self._total_length = 0
+        self._seen: Optional[set] = None
+        self.refreshed_at: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def _unindex(self, task_id: str) -> Optional[_Document]:
+        document = self._documents.pop(task_id, None)
+        if document is None:
+            return None
+        for term in document.terms():
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(task_id, None)
+                if not postings:
+                    del self._postings[term]
+        self._total_length -= document.length
+        return document
+
+    def _index(self, task_id: str, document: _Document) -> None:
+        terms = document.terms()
+        document.length = sum(terms.values())
+        for term, count in terms.items():
+            self._postings.setdefault(term, {})[task_id] = count
+        self._total_length += document.length
+        self._documents[task_id] = document
+
+    def add_task(self, task: dict, project_id: Optional[str] = None) -> None:
+        """Add or update a task, keeping any message text already indexed for it."""
+        task_id = task.get("id")
+        if not task_id:
+            return
+        previous = self._unindex(task_id)
+        document = _Document(task, task.get("projectId") or project_id or (previous.project_id if previous else None))
+        if previous is not None:
+            document.message_terms = previous.message_terms
+            document.description = previous.description
+            document.messages_indexed = previous.messages_indexed
+            document.messages_activity = previous.messages_activity
+        self._index(task_id, document)
+        if self._seen is not None:
+            self._seen.add(task_id)
+
+    def set_messages(self, task_id: str, messages: Iterable[Any]) -> None:
+        """Index the message bodies of a task already in the index."""
+        document = self._unindex(task_id)
+        if document is None:
+            return
+        bodies = [m.get("message") or "" for m in messages if isinstance(m, dict)]
+        document.message_terms = Counter(term for body in bodies for term in tokenize(body))
+        document.description = bodies[0][:DESCRIPTION_CHARS] if bodies else None
+        document.messages_indexed = True
+        document.messages_activity = _activity(document.task)
+        self._index(task_id, document)
+
+    def stale_messages(self) -> list[str]:
+        """IDs of tasks whose messages were never indexed or have had activity since."""
+        return [
+            task_id for task_id, document in self._documents.items()
+            if not document.messages_indexed or (_activity(document.task) or None) != document.messages_activity
+        ]
+
+    def remove_task(self, task_id: str) -> None:
+        self._unindex(task_id)
+
+    def begin_refresh(self) -> None:
+        """Start tracking which tasks a full re-sync sees."""
+        self._seen = set()
+
+    def finish_refresh(self, sweep: bool = True) -> None:
+        """End a full re-sync, removing tasks it did not see when sweep is True.
+
+        The re-sync counts as done either way, so a project that keeps failing
+        is retried with the next periodic re-sync rather than on every search.
+        """
+        seen, self._seen = self._seen, None
+        if sweep and seen is not None:
+            for task_id in [task_id for task_id in self._documents if task_id not in seen]:
+                self._unindex(task_id)
+        self.refreshed_at = time.monotonic()
+
+    def observe(self, endpoint: str, data: Any) -> None:
+        """Index the response of an API call if it is a task list, a task or a task's messages."""
+        match = _PROJECT_TASKS_ENDPOINT.match(endpoint)
+        if match and isinstance(data, list):
+            for task in data:
+                if isinstance(task, dict):
+                    self.add_task(task, match.group(1))
+            return
+        match = _TASK_MESSAGES_ENDPOINT.match(endpoint)
+        if match and isinstance(data, list):
+            self.set_messages(match.group(1), data)
+            return
+        if _TASK_ENDPOINT.match(endpoint) and isinstance(data, dict):
+            self.add_task(data)
+
+    def search(
+        self,
+        query: str,
+        limit: int = 10,
+        project_ids: Optional[set] = None,
+        user_ids: Optional[set] = None,
+        include_closed: bool = False,
+    ) -> list[SearchHit]:
+        """Return the best matching tasks, optionally limited to projects, assignees and open tasks."""
+        if not self._documents:
+            return []
+        documents = self._documents
+        count = len(documents)
+        average_length = self._total_length / count or 1.0
+        scores: dict[str, float] = {}
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for task_id, frequency in postings.items():
+                document = documents[task_id]
+                if not include_closed and document.closed:
+                    continue
+                if project_ids is not None and document.project_id not in project_ids:
+                    continue
+                if user_ids is not None and document.assigned_to not in user_ids:
+                    continue
+                norm = self.k1 * (1 - self.b + self.b * document.length / average_length)
+                scores[task_id] = scores.get(task_id, 0.0) + idf * frequency * (self.k1 + 1) / (frequency + norm)
+        best = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        return [SearchHit(documents[task_id].task, documents[task_id].description, score) for task_id, score in best]
+
+    def stats(self) -> dict[str, Any]:
+        return {"tasks": len(self._documents), "terms": len(self._postings), "refreshed_at": self.refreshed_at}
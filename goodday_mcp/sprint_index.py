@@ -0,0 +1,114 @@
+"""
+Index of sprints by parent project and sprint number.
+
+Sprints are system projects (systemType PROJECT) named like "Sprint 233"
+that live below a team's project, possibly inside folders. SprintIndex is
+built once from a projects listing and maps every project to the sprints
+in its subtree by number, so resolving "Sprint 233" for a project is a
+dict lookup that cannot pick another team's sprint 233. It also resolves
+the current sprint (the one whose dates include today) and the latest
+(highest-numbered) one.
+"""
+
+import re
+from datetime import date
+from typing import Any, Iterable, Optional
+
+_NUMBER = re.compile(r"(\d+)")
+
+# Sprint names that resolve by date or number instead of by name
+CURRENT_SPRINT = ("current", "current sprint", "active", "this sprint")
+LATEST_SPRINT = ("latest", "latest sprint", "last", "last sprint", "newest")
+
+
+def _sprint_key(name: str) -> str:
+    name = " ".join(name.lower().split())
+    return name if name.startswith("sprint") else f"sprint {name}"
+
+
+def _day(value: Any) -> Optional[str]:
+    return str(value)[:10] if value else None
+
+
+def sprint_number(sprint: dict) -> Optional[int]:
+    """The number in a sprint's name, e.g. 233 for "Sprint 233"."""
+    match = _NUMBER.search(sprint.get("name") or "")
+    return int(match.group(1)) if match else None
+
+
+class SprintIndex:
+    """Sprints of every project's subtree, keyed by sprint number and by name."""
+
+    def __init__(self, projects: Iterable[Any]):
+        projects = [p for p in projects if isinstance(p, dict) and p.get("id")]
+        parents = {p["id"]: p.get("parentProjectId") for p in projects}
+        # parent ID -> sprint number -> (depth below the parent, sprint); the shallowest sprint wins a clash
+        self._by_number: dict[str, dict[int, tuple[int, dict]]] = {}
+        self._by_name: dict[str, dict[str, dict]] = {}
+        self._sprints: dict[str, list[dict]] = {}
+        for sprint in projects:
+            name = (sprint.get("name") or "").strip()
+            if sprint.get("systemType") != "PROJECT" or not name.lower().startswith("sprint"):
+                continue
+            number = sprint_number(sprint)
+            ancestor, depth, seen = parents.get(sprint["id"]), 1, set()
+            while ancestor and ancestor not in seen:
+                seen.add(ancestor)
+                self._sprints.setdefault(ancestor, []).append(sprint)
+                self._by_name.setdefault(ancestor, {}).setdefault(_sprint_key(name), sprint)
+                if number is not None:
+                    numbers = self._by_number.setdefault(ancestor, {})
+                    if number not in numbers or depth < numbers[number][0]:
+                        numbers[number] = (depth, sprint)
+                ancestor, depth = parents.get(ancestor), depth + 1
+        # Newest first: highest number, then latest start date, with unnumbered sprints last
+        for sprints in self._sprints.values():
+            sprints.sort(key=lambda s: _day(s.get("startDate")) or "", reverse=True)
+            sprints.sort(key=lambda s: (sprint_number(s) is None, -(sprint_number(s) or 0)))
+
+    def sprints(self, parent_id: str) -> list[dict]:
+        """Sprints below a project, newest first."""
+        return self._sprints.get(parent_id, [])
+
+    def latest(self, parent_id: str, count: int = 1) -> list[dict]:
+        """The highest-numbered sprints below a project, newest first."""
+        return [s for s in self.sprints(parent_id) if sprint_number(s) is not None][:count]
+
+    def current(self, parent_id: str, today: Optional[date] = None) -> Optional[dict]:
+        """The sprint below a project running today, else the last one started, else the latest."""
+        today_key = (today or date.today()).isoformat()
+        started = []
+        for sprint in self.sprints(parent_id):
+            start, end = _day(sprint.get("startDate")), _day(sprint.get("endDate"))
+            if start and start <= today_key:
+                if not end or today_key <= end:
+                    return sprint
+                started.append((start, sprint))
+        if started:
+            return max(started, key=lambda item: item[0])[1]
+        latest = self.latest(parent_id)
+        return latest[0] if latest else None
+
+    def recent(self, parent_id: str, count: int = 1, today: Optional[date] = None) -> list[dict]:
+        """The current sprint below a project followed by the ones before it, newest first."""
+        current = self.current(parent_id, today)
+        if current is None or count < 1:
+            return []
+        sprints = self.sprints(parent_id)
+        start = next(i for i, sprint in enumerate(sprints) if sprint is current)
+        return sprints[start:start + count]
+
+    def find(self, parent_id: str, sprint_name: str, today: Optional[date] = None) -> Optional[dict]:
+        """Resolve a sprint name, number, "current" or "latest" below a project."""
+        name = " ".join(sprint_name.lower().split())
+        if name in CURRENT_SPRINT:
+            return self.current(parent_id, today)
+        if name in LATEST_SPRINT:
+            latest = self.latest(parent_id)
+            return latest[0] if latest else None
+        match = _NUMBER.search(name)
+        if match:
+            entry = self._by_number.get(parent_id, {}).get(int(match.group(1)))
+            if entry:
+                return entry[1]
+        return self._by_name.get(parent_id, {}).get(_sprint_key(name))
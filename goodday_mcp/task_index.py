@@ -0,0 +1,74 @@
+"""
+In-process index from task shortId to its task and project IDs.
+
+Each tenant's index is filled incrementally from every project task list
+downloaded with its token, so lookups by shortId (e.g. RAD-434) can skip
+scanning projects.
+"""
+
+import re
+from typing import Any, NamedTuple, Optional
+
+_PROJECT_TASKS_ENDPOINT = re.compile(r"^/?project/([^/?]+)/tasks(?:\?|$)")
+_TASK_ENDPOINT = re.compile(r"^/?task/([^/?]+)(?:\?|$)")
+
+
+class TaskLocation(NamedTuple):
+    """Where a task lives: its internal task ID and owning project ID."""
+    task_id: str
+    project_id: str
+
+
+class TaskIndex:
+    """Mapping of shortId to TaskLocation, updated as task lists are seen."""
+
+    def __init__(self):
+        self._locations: dict[str, TaskLocation] = {}
+        self._short_ids: dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._locations)
+
+    def get(self, short_id: str) -> Optional[TaskLocation]:
+        """Return the location of a task, or None if it has not been indexed."""
+        return self._locations.get(short_id)
+
+    def get_by_task_id(self, task_id: str) -> Optional[TaskLocation]:
+        """Return the location of a task by its internal ID, or None if it has not been indexed."""
+        short_id = self._short_ids.get(task_id)
+        return self._locations.get(short_id) if short_id else None
+
+    def add(self, short_id: str, task_id: str, project_id: str) -> None:
+        """Record (or move) a single task."""
+        if short_id and task_id and project_id:
+            self._locations[short_id] = TaskLocation(task_id, project_id)
+            self._short_ids[task_id] = short_id
+
+    def add_tasks(self, project_id: str, tasks: Any) -> None:
+        """Record every task from a project task list response.
+
+        Tasks of subfolder listings are recorded under their own project, not the listed one.
+        """
+        if not isinstance(tasks, list):
+            return
+        for task in tasks:
+            if isinstance(task, dict):
+                self.add(task.get("shortId"), task.get("id"), task.get("projectId") or project_id)
+
+    def remove(self, short_id: str) -> None:
+        """Forget a task, e.g. after a lookup proved the entry stale."""
+        location = self._locations.pop(short_id, None)
+        if location:
+            self._short_ids.pop(location.task_id, None)
+
+    def clear(self) -> None:
+        self._locations.clear()
+        self._short_ids.clear()
+
+    def observe(self, endpoint: str, data: Any) -> None:
+        """Index the response of an API call if it is a project task list or a single task."""
+        match = _PROJECT_TASKS_ENDPOINT.match(endpoint)
+        if match:
+            self.add_tasks(match.group(1), data)
+        elif _TASK_ENDPOINT.match(endpoint) and isinstance(data, dict):
+            self.add(data.get("shortId"), data.get("id"), data.get("projectId"))
@@ -0,0 +1,196 @@
+"""
+Filtering and sorting of a downloaded task listing.
+
+TaskListIndex wraps one task listing and builds per-field indexes on first
+use: statuses, assignees and task types map to the positions of their
+tasks, priorities and due dates are kept sorted for range lookups, and
+task names are lowercased once for text matching. A query intersects the
+candidate positions of its filters, smallest first, so narrow queries over
+large projects only touch the tasks they return.
+"""
+
+import re
+from bisect import bisect_left, bisect_right
+from functools import cached_property
+from typing import Any, Callable, Iterable, Optional
+
+_DATE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+_SHORT_ID = re.compile(r"^(.*?)(\d+)$")
+
+
+def _name(value: Any) -> str:
+    """Lowercased name of a nested {"name": ...} field such as status or taskType."""
+    return (value.get("name") or "").strip().lower() if isinstance(value, dict) else ""
+
+
+def _priority(task: dict) -> Optional[int]:
+    try:
+        return int(task.get("priority"))
+    except (TypeError, ValueError):
+        return None
+
+
+def _due_date(task: dict) -> Optional[str]:
+    """The task's deadline, falling back to its end date, as YYYY-MM-DD."""
+    due = task.get("deadline") or task.get("endDate")
+    return str(due)[:10] if due else None
+
+
+def _short_id_key(task: dict) -> Optional[tuple]:
+    """Sort key ordering shortIds such as RAD-9 before RAD-10."""
+    short_id = task.get("shortId")
+    if not short_id:
+        return None
+    match = _SHORT_ID.match(str(short_id))
+    return (match.group(1), int(match.group(2))) if match else (str(short_id), -1)
+
+
+# Sort keys accepted by TaskListIndex.query, each prefixed with "-" for descending order
+SORT_KEYS: dict[str, Callable[[dict], Any]] = {
+    "priority": _priority,
+    "due": _due_date,
+    "start": lambda task: str(task["startDate"])[:10] if task.get("startDate") else None,
+    "name": lambda task: (task.get("name") or "").lower() or None,
+    "status": lambda task: _name(task.get("status")) or None,
+    "shortId": _short_id_key,
+}
+
+
+def parse_date(value: Optional[str], argument: str) -> Optional[str]:
+    """Validate an optional YYYY-MM-DD date argument."""
+    if value is None:
+        return None
+    value = value.strip()
+    if not _DATE.match(value):
+        raise ValueError(f"{argument} must be a date in YYYY-MM-DD format, got '{value}'")
+    return value
+
+
+def parse_sort(sort: Optional[str]) -> list[tuple[str, bool]]:
+    """Turn a comma-separated sort argument such as "-priority,due" into (key, descending) pairs."""
+    keys = []
+    for part in (sort or "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        descending = part.startswith("-")
+        key = part.lstrip("+-")
+        if key not in SORT_KEYS:
+            raise ValueError(f"Unknown sort key '{key}'; use one of: {', '.join(SORT_KEYS)}")
+        keys.append((key, descending))
+    return keys
+
+
+def _group(tasks: list[dict], key: Callable[[dict], Any]) -> dict[Any, list[int]]:
+    groups: dict[Any, list[int]] = {}
+    for position, task in enumerate(tasks):
+        groups.setdefault(key(task), []).append(position)
+    return groups
+
+
+class _SortedField:
+    """Task positions ordered by a field value, for range lookups."""
+
+    def __init__(self, tasks: list[dict], key: Callable[[dict], Any]):
+        entries = sorted((value, position) for position, task in enumerate(tasks) if (value := key(task)) is not None)
+        self.values = [value for value, _ in entries]
+        self.positions = [position for _, position in entries]
+
+    def between(self, low: Any = None, high: Any = None) -> list[int]:
+        """Positions whose value lies in [low, high]; a missing bound is open."""
+        start = bisect_left(self.values, low) if low is not None else 0
+        end = bisect_right(self.values, high) if high is not None else len(self.values)
+        return self.positions[start:end]
+
+
+class TaskListIndex:
+    """A task listing with lazily built per-field indexes for filtering and sorting."""
+
+    def __init__(self, tasks: Iterable[Any]):
+        self.tasks = [task for task in tasks if isinstance(task, dict)]
+
+    def __len__(self) -> int:
+        return len(self.tasks)
+
+    @cached_property
+    def _by_status(self) -> dict[str, list[int]]:
+        return _group(self.tasks, lambda task: _name(task.get("status")))
+
+    @cached_property
+    def _by_assignee(self) -> dict[Any, list[int]]:
+        return _group(self.tasks, lambda task: task.get("assignedToUserId"))
+
+    @cached_property
+    def _by_task_type(self) -> dict[str, list[int]]:
+        return _group(self.tasks, lambda task: _name(task.get("taskType")))
+
+    @cached_property
+    def _by_priority(self) -> _SortedField:
+        return _SortedField(self.tasks, _priority)
+
+    @cached_property
+    def _by_due_date(self) -> _SortedField:
+        return _SortedField(self.tasks, _due_date)
+
+    @cached_property
+    def _text(self) -> list[str]:
+        return [f"{task.get('shortId') or ''} {task.get('name') or ''}".lower() for task in self.tasks]
+
+    def assignees(self) -> set:
+        """IDs of the users tasks in the listing are assigned to."""
+        return {user_id for user_id in self._by_assignee if user_id}
+
+    def query(
+        self,
+        statuses: Optional[Iterable[str]] = None,
+        assignee_ids: Optional[Iterable[str]] = None,
+        task_types: Optional[Iterable[str]] = None,
+        min_priority: Optional[int] = None,
+        max_priority: Optional[int] = None,
+        due_after: Optional[str] = None,
+        due_before: Optional[str] = None,
+        text: Optional[str] = None,
+        sort: Optional[list[tuple[str, bool]]] = None,
+    ) -> list[dict]:
+        """Return the tasks matching every given filter, in listing order unless sorted.
+
+        Status and task type names match case-insensitively; priority and due
+        date bounds are inclusive, and tasks without a value never match them.
+        """
+        candidates: list[list[int]] = []
+        if statuses is not None:
+            candidates.append([p for s in statuses for p in self._by_status.get(s.strip().lower(), [])])
+        if assignee_ids is not None:
+            candidates.append([p for user_id in assignee_ids for p in self._by_assignee.get(user_id, [])])
+        if task_types is not None:
+            candidates.append([p for t in task_types for p in self._by_task_type.get(t.strip().lower(), [])])
+        if min_priority is not None or max_priority is not None:
+            candidates.append(self._by_priority.between(min_priority, max_priority))
+        if due_after is not None or due_before is not None:
+            candidates.append(self._by_due_date.between(due_after, due_before))
+
+        if candidates:
+            candidates.sort(key=len)
+            matched = set(candidates[0])
+            for positions in candidates[1:]:
+                if not matched:
+                    break
+                matched.intersection_update(positions)
+            positions = sorted(matched)
+        else:
+            positions = range(len(self.tasks))
+
+        if text:
+            needle = text.strip().lower()
+            haystacks = self._text
+            positions = [p for p in positions if needle in haystacks[p]]
+
+        tasks = [self.tasks[p] for p in positions]
+        # Stable sorts applied from the last key to the first; tasks missing a value always go last
+        for key, descending in reversed(sort or []):
+            value = SORT_KEYS[key]
+            present = [task for task in tasks if value(task) is not None]
+            missing = [task for task in tasks if value(task) is None]
+            present.sort(key=value, reverse=descending)
+            tasks = present + missing
+        return tasks
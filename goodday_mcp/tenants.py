@@ -0,0 +1,103 @@
+"""
+Per-token isolation of the server's in-memory state.
+
+When one server is shared by several Goodday users, each API token sees
+different data, so the directory and listing caches, task, project name
+and sprint indexes, request coalescer and rate-limit bucket (and the local
+search index, if used) are kept per token in a Tenant. Tenants are keyed by a fingerprint of the
+token, and a bounded number of them are kept with the least recently used
+(or long idle) ones evicted.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+from .cache import SingleFlight, TTLCache
+from .persistent_cache import token_fingerprint
+from .retry import TokenBucket
+from .search_index import TaskSearchIndex
+from .task_index import TaskIndex
+
+
+class Tenant:
+    """In-memory state belonging to one API token."""
+
+    def __init__(self, fingerprint: str, directory_cache: TTLCache, listing_cache: TTLCache, rate_limiter: TokenBucket):
+        self.fingerprint = fingerprint
+        self.directory_cache = directory_cache
+        # Task listings being paged through or filtered, so they are not downloaded again
+        self.listing_cache = listing_cache
+        self.rate_limiter = rate_limiter
+        self.task_index = TaskIndex()
+        # Concurrent identical GET requests share one upstream call
+        self.coalescer = SingleFlight()
+        # Project name matcher and sprint index, with the directory listing and signature each was built from
+        self.directory_indexes: dict[str, tuple[Any, Any, Any]] = {}
+        # Created on first use by the local search backend
+        self.search_index: Optional[TaskSearchIndex] = None
+        self.last_used = time.monotonic()
+
+    def observe(self, endpoint: str, data: Any) -> None:
+        """Feed a downloaded GET response to the tenant's indexes."""
+        self.task_index.observe(endpoint, data)
+        if self.search_index is not None:
+            self.search_index.observe(endpoint, data)
+
+
+class TenantRegistry:
+    """Bounded LRU mapping of token fingerprints to tenants.
+
+    Args:
+        factory: Builds a new tenant for a token fingerprint
+        max_tenants: Number of tenants kept before the least recently used is evicted
+        idle_ttl: Seconds after which an unused tenant is evicted; 0 keeps tenants until displaced
+    """
+
+    def __init__(self, factory: Callable[[str], Tenant], max_tenants: int = 32, idle_ttl: float = 0.0):
+        self._factory = factory
+        self.max_tenants = max(1, max_tenants)
+        self.idle_ttl = idle_ttl
+        self._tenants: "OrderedDict[str, Tenant]" = OrderedDict()
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._tenants)
+
+    def get(self, api_token: str) -> Tenant:
+        """Return the tenant for a token, creating it (and evicting others) if needed."""
+        fingerprint = token_fingerprint(api_token)
+        now = time.monotonic()
+        self._evict_idle(now)
+        tenant = self._tenants.get(fingerprint)
+        if tenant is None:
+            tenant = self._factory(fingerprint)
+            self._tenants[fingerprint] = tenant
+            while len(self._tenants) > self.max_tenants:
+                # An evicted tenant's in-flight calls keep their reference and finish normally
+                self._tenants.popitem(last=False)
+                self.evictions += 1
+        else:
+            self._tenants.move_to_end(fingerprint)
+        tenant.last_used = now
+        return tenant
+
+    def peek(self, api_token: str) -> Optional[Tenant]:
+        """Return the tenant for a token if it exists, without creating or touching it."""
+        return self._tenants.get(token_fingerprint(api_token))
+
+    def clear(self) -> None:
+        self._tenants.clear()
+
+    def _evict_idle(self, now: float) -> None:
+        if self.idle_ttl <= 0:
+            return
+        while self._tenants:
+            fingerprint, oldest = next(iter(self._tenants.items()))
+            if now - oldest.last_used < self.idle_ttl:
+                break
+            del self._tenants[fingerprint]
+            self.evictions += 1
+
+    def stats(self) -> dict[str, int]:
+        return {"tenants": len(self._tenants), "max_tenants": self.max_tenants, "evictions": self.evictions}
@@ -0,0 +1,289 @@
+"""
+Upstream call tracing for the Goodday MCP server.
+
+Every request sent to the Goodday API or the search webhook is recorded with
+its endpoint template, status, response size and latency, and attributed to
+the MCP tool call that triggered it through a context variable. Aggregates
+are kept as fixed-bucket histograms and can be rendered as a report or in
+the Prometheus text exposition format.
+"""
+
+import logging
+import re
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Iterator, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the latency histogram buckets, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# Upper bounds of the upstream-requests-per-tool-call histogram buckets
+REQUEST_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 200)
+
+# Path segments following these resources are IDs
+_ID_RESOURCES = {"project", "task", "user", "document"}
+_LABEL_ESCAPES = re.compile(r'[\\"\n]')
+
+NO_TOOL = "(none)"
+
+
+class UpstreamCall(NamedTuple):
+    """One request sent to an upstream service."""
+    upstream: str
+    method: str
+    endpoint: str
+    status: Optional[int]
+    bytes: int
+    seconds: float
+
+
+def endpoint_template(endpoint: str) -> str:
+    """Reduce an endpoint to its template, e.g. 'project/abc/tasks?closed=true' -> 'project/{id}/tasks'."""
+    parts = endpoint.split("?", 1)[0].strip("/").split("/")
+    if len(parts) > 1 and parts[0] in _ID_RESOURCES:
+        parts[1] = "{id}"
+    return "/".join(parts)
+
+
+class Histogram:
+    """Cumulative-friendly histogram over fixed bucket upper bounds."""
+
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile as the upper bound of the bucket holding it (the maximum for the overflow bucket)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return min(self.buckets[i], self.max) if i < len(self.buckets) else self.max
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+
+class _EndpointStats:
+    def __init__(self):
+        self.statuses: dict[str, int] = {}
+        self.bytes = 0
+        self.latency = Histogram(LATENCY_BUCKETS)
+
+
+class _ToolStats:
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.upstream_requests = Histogram(REQUEST_COUNT_BUCKETS)
+
+
+_current_tool: ContextVar[Optional[str]] = ContextVar("goodday_current_tool", default=None)
+_current_calls: ContextVar[Optional[list]] = ContextVar("goodday_current_calls", default=None)
+
+
+class Tracer:
+    """Aggregates upstream calls per tool and per endpoint template.
+
+    Recording happens on the event loop; the lock only guards against the
+    metrics endpoint thread reading while a record is written.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tools: dict[str, _ToolStats] = {}
+        self._endpoints: dict[tuple[str, str, str, str], _EndpointStats] = {}
+
+    @contextmanager
+    def trace_tool(self, name: str) -> Iterator[list]:
+        """Attribute upstream calls made within the block to tool name and collect them in a list."""
+        calls: list[UpstreamCall] = []
+        tool_token = _current_tool.set(name)
+        calls_token = _current_calls.set(calls)
+        started = time.perf_counter()
+        failed = False
+        try:
+            yield calls
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            _current_calls.reset(calls_token)
+            _current_tool.reset(tool_token)
+            with self._lock:
+                stats = self._tools.setdefault(name, _ToolStats())
+                stats.calls += 1
+                stats.errors += failed
+                stats.latency.observe(time.perf_counter() - started)
+                stats.upstream_requests.observe(len(calls))
+
+    def record(self, upstream: str, method: str, endpoint: str, status: Optional[int], nbytes: int, seconds: float) -> None:
+        """Record one upstream request; status is None for transport errors."""
+        call = UpstreamCall(upstream, method.upper(), endpoint_template(endpoint), status, nbytes, seconds)
+        calls = _current_calls.get()
+        if calls is not None:
+            calls.append(call)
+        key = (_current_tool.get() or NO_TOOL, call.upstream, call.method, call.endpoint)
+        with self._lock:
+            stats = self._endpoints.setdefault(key, _EndpointStats())
+            status_label = str(status) if status is not None else "error"
+            stats.statuses[status_label] = stats.statuses.get(status_label, 0) + 1
+            stats.bytes += nbytes
+            stats.latency.observe(seconds)
+
+    def current_calls(self) -> Optional[list]:
+        """Return the upstream calls made so far by the active tool call, or None outside one."""
+        return _current_calls.get()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._tools.clear()
+            self._endpoints.clear()
+
+    def snapshot(self) -> dict[str, Any]:
+        """Summarize the aggregates per tool and per upstream endpoint."""
+        with self._lock:
+            tools = {
+                name: {
+                    "calls": s.calls,
+                    "errors": s.errors,
+                    "upstream_requests_mean": s.upstream_requests.mean,
+                    "upstream_requests_max": s.upstream_requests.max,
+                    "p50_seconds": s.latency.quantile(0.5),
+                    "p95_seconds": s.latency.quantile(0.95),
+                }
+                for name, s in self._tools.items()
+            }
+            endpoints = [
+                {
+                    "tool": tool,
+                    "upstream": upstream,
+                    "method": method,
+                    "endpoint": endpoint,
+                    "requests": s.latency.count,
+                    "statuses": dict(s.statuses),
+                    "bytes": s.bytes,
+                    "p50_seconds": s.latency.quantile(0.5),
+                    "p95_seconds": s.latency.quantile(0.95),
+                }
+                for (tool, upstream, method, endpoint), s in self._endpoints.items()
+            ]
+        return {"tools": tools, "endpoints": endpoints}
+
+    def render_prometheus(self) -> str:
+        """Render the aggregates in the Prometheus text exposition format."""
+        lines = [
+            "# HELP goodday_tool_calls_total MCP tool calls by outcome.",
+            "# TYPE goodday_tool_calls_total counter",
+        ]
+        with self._lock:
+            tools = list(self._tools.items())
+            endpoints = list(self._endpoints.items())
+            for name, s in tools:
+                lines.append(f'goodday_tool_calls_total{{tool="{_escape(name)}",outcome="ok"}} {s.calls - s.errors}')
+                lines.append(f'goodday_tool_calls_total{{tool="{_escape(name)}",outcome="error"}} {s.errors}')
+            lines += [
+                "# HELP goodday_tool_duration_seconds MCP tool call latency.",
+                "# TYPE goodday_tool_duration_seconds histogram",
+            ]
+            for name, s in tools:
+                lines += _histogram_lines("goodday_tool_duration_seconds", f'tool="{_escape(name)}"', s.latency)
+            lines += [
+                "# HELP goodday_tool_upstream_requests Upstream requests made per MCP tool call.",
+                "# TYPE goodday_tool_upstream_requests histogram",
+            ]
+            for name, s in tools:
+                lines += _histogram_lines("goodday_tool_upstream_requests", f'tool="{_escape(name)}"', s.upstream_requests)
+            lines += [
+                "# HELP goodday_upstream_requests_total Upstream requests by tool, endpoint template and status.",
+                "# TYPE goodday_upstream_requests_total counter",
+            ]
+            for key, s in endpoints:
+                for status, count in sorted(s.statuses.items()):
+                    lines.append(f'goodday_upstream_requests_total{{{_endpoint_labels(key)},status="{status}"}} {count}')
+            lines += [
+                "# HELP goodday_upstream_response_bytes_total Upstream response body bytes.",
+                "# TYPE goodday_upstream_response_bytes_total counter",
+            ]
+            for key, s in endpoints:
+                lines.append(f"goodday_upstream_response_bytes_total{{{_endpoint_labels(key)}}} {s.bytes}")
+            lines += [
+                "# HELP goodday_upstream_duration_seconds Upstream request latency.",
+                "# TYPE goodday_upstream_duration_seconds histogram",
+            ]
+            for key, s in endpoints:
+                lines += _histogram_lines("goodday_upstream_duration_seconds", _endpoint_labels(key), s.latency)
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return _LABEL_ESCAPES.sub(lambda m: "\\n" if m.group() == "\n" else "\\" + m.group(), value)
+
+
+def _endpoint_labels(key: tuple[str, str, str, str]) -> str:
+    tool, upstream, method, endpoint = key
+    return f'tool="{_escape(tool)}",upstream="{upstream}",method="{method}",endpoint="{_escape(endpoint)}"'
+
+
+def _histogram_lines(metric: str, labels: str, histogram: Histogram) -> list[str]:
+    lines = []
+    cumulative = 0
+    for bound, count in zip(histogram.buckets, histogram.counts):
+        cumulative += count
+        lines.append(f'{metric}_bucket{{{labels},le="{bound}"}} {cumulative}')
+    lines.append(f'{metric}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+    lines.append(f"{metric}_sum{{{labels}}} {histogram.sum}")
+    lines.append(f"{metric}_count{{{labels}}} {histogram.count}")
+    return lines
+
+
+tracer = Tracer()
+
+
+def start_metrics_server(port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """Serve tracer metrics at /metrics from a background thread."""
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = tracer.render_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    httpd = ThreadingHTTPServer((host, port), MetricsHandler)
+    httpd.daemon_threads = True
+    threading.Thread(target=httpd.serve_forever, name="goodday-metrics", daemon=True).start()
+    logger.info("Serving Prometheus metrics on http://%s:%s/metrics", host, httpd.server_address[1])
+    return httpd
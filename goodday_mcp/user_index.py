@@ -0,0 +1,72 @@
+"""
+Index of users by email, ID, name and name words.
+
+UserIndex is built once from a users listing. A lookup tries, in order, an
+exact email or user ID, the exact full name, then every word of the query
+being a whole word of the user's name or email address (so "john" or
+"smith" finds John Smith), and finally ranked fuzzy matching of names and
+email addresses. Every step but the last is a dict lookup. A query that
+matches several users equally well is ambiguous and returns all of them
+as candidates instead of picking the first.
+"""
+
+from typing import Any, Iterable, Optional
+
+from .name_matcher import NameMatcher, normalize
+
+
+def _local_part(email: Optional[str]) -> Optional[str]:
+    return email.split("@", 1)[0] if email else None
+
+
+class UserIndex:
+    """Users keyed by email, ID, normalized name and name words, with a fuzzy fallback."""
+
+    def __init__(self, users: Iterable[Any]):
+        self.users = [u for u in users if isinstance(u, dict)]
+        self._by_email: dict[str, dict] = {}
+        self._by_id: dict[str, dict] = {}
+        self._by_name: dict[str, list[dict]] = {}
+        self._by_token: dict[str, list[int]] = {}
+        for position, user in enumerate(self.users):
+            email = (user.get("email") or "").strip().lower()
+            if email:
+                self._by_email.setdefault(email, user)
+            if user.get("id"):
+                self._by_id.setdefault(str(user["id"]), user)
+            name = normalize(user.get("name") or "")
+            if name:
+                self._by_name.setdefault(name, []).append(user)
+            for token in set(name.split()) | set(normalize(_local_part(email) or "").split()):
+                self._by_token.setdefault(token, []).append(position)
+        self._matcher = NameMatcher(self.users, names=lambda u: [u.get("name"), _local_part(u.get("email"))])
+
+    def __len__(self) -> int:
+        return len(self.users)
+
+    def find(self, identifier: str, limit: int = 5) -> tuple[Optional[dict], list[dict]]:
+        """Return the user an identifier names (None if not found or ambiguous) and the candidate users.
+
+        Whole-word matches shared by several users return all of them;
+        fuzzy matches return at most limit candidates, best first.
+        """
+        identifier = identifier.strip()
+        user = self._by_email.get(identifier.lower()) or self._by_id.get(identifier)
+        if user:
+            return user, [user]
+        query = normalize(identifier)
+        if not query:
+            return None, []
+        named = self._by_name.get(query)
+        if named:
+            return (named[0] if len(named) == 1 else None), named
+        positions: Optional[set[int]] = None
+        for token in query.split():
+            positions = set(self._by_token.get(token, ())) if positions is None else positions & set(self._by_token.get(token, ()))
+            if not positions:
+                break
+        if positions:
+            users = [self.users[p] for p in sorted(positions)]
+            return (users[0] if len(users) == 1 else None), users
+        match, candidates = self._matcher.resolve(query, limit)
+        return (match.item if match else None), [candidate.item for candidate in candidates]
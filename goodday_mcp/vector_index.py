@@ -0,0 +1,561 @@
+"""
+Incremental vector index of Goodday tasks for the search webhook.
+
+VectorIndexer replaces the full rebuild of the n8n workflow in
+``openwebui/n8n-workflow-goodday-vectordb.json``: it lists every task, keeps
+a per-task content hash in a small SQLite state file, and only re-chunks
+and re-embeds tasks whose text changed. Points of removed tasks are deleted,
+and all other points are left in place. Chunks and payloads match the ones
+the workflow writes, so its search webhook keeps working unchanged.
+
+Embedders and vector stores are pluggable: OllamaEmbedder and QdrantStore
+talk to the services the workflow uses, while HashingEmbedder and
+MemoryVectorStore are dependency-free local stand-ins.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import os
+import re
+import sqlite3
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Optional
+
+from .http_client import get_client
+
+logger = logging.getLogger(__name__)
+
+# Chunk size of the workflow's text splitter
+DEFAULT_CHUNK_SIZE = 800
+# Embedding batch size of the workflow's Qdrant insert
+DEFAULT_BATCH_SIZE = 100
+# Point IDs are derived from the task ID and chunk number, so re-indexing a task overwrites its points
+POINT_NAMESPACE = uuid.UUID("6f1d3a52-8c1e-4c8e-9f5b-3f0f2b0a7d11")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    id TEXT PRIMARY KEY,
+    activity TEXT,
+    content_hash TEXT NOT NULL,
+    metadata_hash TEXT NOT NULL,
+    chunks INTEGER NOT NULL,
+    indexed_at REAL NOT NULL
+);
+"""
+
+
+def chunk_task(task: dict, messages: list, chunk_size: int = DEFAULT_CHUNK_SIZE) -> list[str]:
+    """Split a task's messages into chunks prefixed with its shortId and name, as the n8n workflow does."""
+    prefix = f"Task #{task.get('shortId')} - {task.get('name')}: "
+    body_size = max(1, chunk_size - len(prefix))
+    chunks = []
+    for message in messages:
+        text = message.get("message") if isinstance(message, dict) else None
+        if text and text.strip():
+            chunks.extend(prefix + text[i:i + body_size] for i in range(0, len(text), body_size))
+    # Tasks without any text are still findable by name
+    return chunks or [prefix]
+
+
+def task_metadata(task: dict) -> dict:
+    """Return the payload metadata stored with every chunk of a task."""
+    return {
+        "taskId": task.get("id"),
+        "shortId": task.get("shortId"),
+        "name": task.get("name"),
+        "projectId": task.get("projectId"),
+        "assignedToUserId": task.get("assignedToUserId"),
+        "status": task["status"].get("name") if isinstance(task.get("status"), dict) else task.get("status"),
+        "closed": bool(task.get("momentClosed") or task.get("closed")),
+    }
+
+
+def point_id(task_id: str, chunk: int) -> str:
+    return str(uuid.uuid5(POINT_NAMESPACE, f"{task_id}/{chunk}"))
+
+
+def _hash(value: Any) -> str:
+    return hashlib.sha1(json.dumps(value, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class Embedder:
+    """Turns texts into vectors. Subclasses implement embed."""
+
+    # Identifies the embedding space; indexes built with a different name are rebuilt
+    name = "embedder"
+
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        raise NotImplementedError
+
+
+class OllamaEmbedder(Embedder):
+    """Embeddings from an Ollama server's /api/embed endpoint.
+
+    Args:
+        url: Base URL of the Ollama server
+        model: Embedding model, the workflow's by default
+    """
+
+    def __init__(self, url: str = "http://localhost:11434", model: str = "mxbai-embed-large:latest"):
+        self.url = url.rstrip("/")
+        self.model = model
+        self.name = f"ollama:{model}"
+
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        response = await get_client("embeddings").post(f"{self.url}/api/embed", json={"model": self.model, "input": texts})
+        response.raise_for_status()
+        return response.json()["embeddings"]
+
+
+class HashingEmbedder(Embedder):
+    """Dependency-free stand-in embedding texts by hashing their words into a fixed number of dimensions.
+
+    Args:
+        dimensions: Vector size
+    """
+
+    def __init__(self, dimensions: int = 256):
+        self.dimensions = dimensions
+        self.name = f"hashing:{dimensions}"
+
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        vectors = []
+        for text in texts:
+            vector = [0.0] * self.dimensions
+            for word in re.findall(r"\w+", text.lower()):
+                digest = hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest()
+                vector[int.from_bytes(digest[:4], "little") % self.dimensions] += 1.0 if digest[4] & 1 else -1.0
+            norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+            vectors.append([x / norm for x in vector])
+        return vectors
+
+
+def embedder_from_name(name: str, ollama_url: str = "http://localhost:11434") -> Embedder:
+    """Rebuild the embedder an index was built with from its name, to embed queries in the same space."""
+    kind, _, detail = name.partition(":")
+    if kind == "ollama":
+        return OllamaEmbedder(ollama_url, detail)
+    if kind == "hashing":
+        return HashingEmbedder(int(detail))
+    raise ValueError(f"Unknown embedder: {name}")
+
+
+class VectorStore:
+    """Holds chunk vectors with their payloads. Subclasses implement the storage operations."""
+
+    name = "store"
+
+    async def ensure_collection(self, dimensions: int) -> None:
+        """Create the collection if it does not exist yet."""
+
+    async def upsert(self, points: list[dict]) -> None:
+        """Insert or replace points given as {"id", "vector", "payload"} dicts."""
+        raise NotImplementedError
+
+    async def set_metadata(self, point_ids: list[str], metadata: dict) -> None:
+        """Replace the payload metadata of existing points without re-embedding them."""
+        raise NotImplementedError
+
+    async def delete(self, point_ids: list[str]) -> None:
+        raise NotImplementedError
+
+    async def clear(self) -> None:
+        """Delete every point in the collection."""
+        raise NotImplementedError
+
+    async def commit(self) -> None:
+        """Persist the changes of an indexing run, for stores that do not write through."""
+
+
+class QdrantStore(VectorStore):
+    """A Qdrant collection accessed over its REST API.
+
+    Args:
+        url: Base URL of the Qdrant server
+        collection: Collection name, the workflow's by default
+        api_key: Optional Qdrant API key
+    """
+
+    def __init__(self, url: str = "http://localhost:6333", collection: str = "goodday-tasks", api_key: Optional[str] = None):
+        self.url = url.rstrip("/")
+        self.collection = collection
+        self.name = f"qdrant:{self.url}/{collection}"
+        self.headers = {"api-key": api_key} if api_key else {}
+
+    async def _request(self, method: str, path: str, body: Optional[dict] = None):
+        response = await get_client("vectors").request(
+            method, f"{self.url}/collections/{self.collection}{path}", json=body, headers=self.headers
+        )
+        if method == "GET" and response.status_code == 404:
+            return None
+        response.raise_for_status()
+        return response.json()
+
+    async def ensure_collection(self, dimensions: int) -> None:
+        if await self._request("GET", "") is None:
+            await self._request("PUT", "", {"vectors": {"size": dimensions, "distance": "Cosine"}})
+
+    async def upsert(self, points: list[dict]) -> None:
+        await self._request("PUT", "/points?wait=true", {"points": points})
+
+    async def set_metadata(self, point_ids: list[str], metadata: dict) -> None:
+        await self._request("POST", "/points/payload?wait=true", {"payload": {"metadata": metadata}, "points": point_ids})
+
+    async def delete(self, point_ids: list[str]) -> None:
+        await self._request("POST", "/points/delete?wait=true", {"points": point_ids})
+
+    async def clear(self) -> None:
+        if await self._request("GET", "") is not None:
+            await self._request("POST", "/points/delete?wait=true", {"filter": {"must": []}})
+
+
+class MemoryVectorStore(VectorStore):
+    """In-process stand-in for a vector store, with a brute-force cosine search for checking results."""
+
+    name = "memory"
+
+    def __init__(self):
+        self.points: dict[str, dict] = {}
+
+    async def upsert(self, points: list[dict]) -> None:
+        for point in points:
+            self.points[point["id"]] = point
+
+    async def set_metadata(self, point_ids: list[str], metadata: dict) -> None:
+        for point_id_ in point_ids:
+            if point_id_ in self.points:
+                self.points[point_id_]["payload"]["metadata"] = metadata
+
+    async def delete(self, point_ids: list[str]) -> None:
+        for point_id_ in point_ids:
+            self.points.pop(point_id_, None)
+
+    async def clear(self) -> None:
+        self.points.clear()
+
+    def search(self, vector: list[float], limit: int = 10) -> list[tuple[float, dict]]:
+        """Return (score, payload) pairs of the points closest to vector."""
+        scored = []
+        for point in self.points.values():
+            other = point["vector"]
+            norm = math.sqrt(sum(x * x for x in other)) * math.sqrt(sum(x * x for x in vector)) or 1.0
+            scored.append((sum(a * b for a, b in zip(vector, other)) / norm, point["payload"]))
+        scored.sort(key=lambda item: -item[0])
+        return scored[:limit]
+
+
+class IndexState:
+    """SQLite record of what is in the vector store: per task, its activity moment, hashes and chunk count.
+
+    Args:
+        path: SQLite database file, created on first use
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, isolation_level=None, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def signature(self) -> Optional[str]:
+        row = self._connect().execute("SELECT value FROM meta WHERE key = 'signature'").fetchone()
+        return row[0] if row else None
+
+    def reset(self, signature: str) -> None:
+        """Forget every indexed task and record the embedder and store the index is built with."""
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM tasks")
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('signature', ?)", (signature,))
+
+    def tasks(self) -> dict[str, tuple]:
+        """Return (activity, content_hash, metadata_hash, chunks) per indexed task ID."""
+        rows = self._connect().execute("SELECT id, activity, content_hash, metadata_hash, chunks FROM tasks").fetchall()
+        return {row[0]: row[1:] for row in rows}
+
+    def save(self, rows: list[tuple]) -> None:
+        """Record tasks as (id, activity, content_hash, metadata_hash, chunks) rows."""
+        now = time.time()
+        conn = self._connect()
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO tasks (id, activity, content_hash, metadata_hash, chunks, indexed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(*row, now) for row in rows],
+            )
+
+    def remove(self, task_ids: list[str]) -> None:
+        conn = self._connect()
+        with conn:
+            conn.executemany("DELETE FROM tasks WHERE id = ?", [(task_id,) for task_id in task_ids])
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+class VectorIndexer:
+    """Incremental sync of Goodday tasks into a vector store.
+
+    Args:
+        fetch: Coroutine function fetching a Goodday endpoint as (endpoint, subfolders)
+        embedder: Embeds chunk texts
+        store: Vector store the points are written to
+        state: Record of the tasks already in the store
+        chunk_size: Maximum characters per chunk, including the task prefix
+        batch_size: Chunks embedded and written per request
+        concurrency: Maximum concurrent Goodday requests
+        include_closed: Whether closed tasks are indexed; if not, they are removed from the store
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[str, bool], Awaitable[Any]],
+        embedder: Embedder,
+        store: VectorStore,
+        state: IndexState,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        concurrency: int = 4,
+        include_closed: bool = True,
+    ):
+        self.fetch = fetch
+        self.embedder = embedder
+        self.store = store
+        self.state = state
+        self.chunk_size = chunk_size
+        self.batch_size = max(1, batch_size)
+        self.concurrency = max(1, concurrency)
+        self.include_closed = include_closed
+
+    @property
+    def signature(self) -> str:
+        return f"{self.embedder.name}|{self.store.name}|{self.chunk_size}"
+
+    async def list_tasks(self) -> tuple[list[dict], bool]:
+        """Return every task of the organization, and whether every project could be listed."""
+        projects = await self.fetch("projects", True)
+        if not isinstance(projects, list):
+            raise Exception("Unable to list projects")
+        project_ids = {p.get("id") for p in projects if isinstance(p, dict)}
+        # A root project's task list includes its subfolders, so every task is listed once
+        roots = [p["id"] for p in projects if isinstance(p, dict) and p.get("id") and p.get("parentProjectId") not in project_ids]
+        semaphore = asyncio.Semaphore(self.concurrency)
+        closed = "?closed=true" if self.include_closed else ""
+
+        async def list_project(project_id: str) -> Optional[list]:
+            async with semaphore:
+                try:
+                    tasks = await self.fetch(f"project/{project_id}/tasks{closed}", True)
+                except Exception as e:
+                    logger.warning("Listing tasks of project %s failed: %s", project_id, e)
+                    return None
+            return tasks if isinstance(tasks, list) else None
+
+        listings = await asyncio.gather(*(list_project(project_id) for project_id in roots))
+        tasks: dict[str, dict] = {}
+        for listing in listings:
+            for task in listing or []:
+                if isinstance(task, dict) and task.get("id"):
+                    tasks[task["id"]] = task
+        if not self.include_closed:
+            tasks = {task_id: task for task_id, task in tasks.items() if not task_metadata(task)["closed"]}
+        return list(tasks.values()), all(listing is not None for listing in listings)
+
+    async def run(self, full: bool = False) -> dict[str, int]:
+        """Bring the vector store up to date, re-embedding only tasks whose text changed."""
+        totals = {
+            "tasks": 0, "unchanged": 0, "embedded_tasks": 0, "embedded_chunks": 0,
+            "metadata_updates": 0, "removed_tasks": 0, "deleted_points": 0, "failed": 0,
+        }
+        if full or self.state.signature() != self.signature:
+            # Points written by the n8n workflow or another embedder cannot be matched to tasks, so start over
+            await self.store.clear()
+            self.state.reset(self.signature)
+        indexed = self.state.tasks()
+
+        tasks, complete = await self.list_tasks()
+        totals["tasks"] = len(tasks)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        collection_ready = False
+        pending: list[tuple[dict, list[str], tuple]] = []
+        # State rows are recorded only once the store has committed, so a failed run re-embeds its tasks
+        saved: list[tuple] = []
+
+        async def prepare(task: dict) -> Optional[tuple[dict, list[str], tuple]]:
+            """Return the task's chunks and state row if it needs re-embedding, else None."""
+            task_id = task["id"]
+            activity = task.get("recentActivityMoment") or task.get("momentUpdated")
+            metadata = task_metadata(task)
+            metadata_hash = _hash(metadata)
+            previous = indexed.get(task_id)
+            if previous and activity and previous[0] == activity and previous[2] == metadata_hash:
+                # No new activity on the task: its messages need not be fetched again
+                totals["unchanged"] += 1
+                return None
+            async with semaphore:
+                try:
+                    messages = await self.fetch(f"task/{task_id}/messages", True)
+                except Exception as e:
+                    totals["failed"] += 1
+                    logger.warning("Fetching messages of task %s failed: %s", task_id, e)
+                    return None
+            chunks = chunk_task(task, messages if isinstance(messages, list) else [], self.chunk_size)
+            row = (task_id, activity, _hash(chunks), metadata_hash, len(chunks))
+            if previous and previous[1] == row[2]:
+                if previous[2] != metadata_hash:
+                    await self.store.set_metadata([point_id(task_id, i) for i in range(len(chunks))], metadata)
+                    totals["metadata_updates"] += 1
+                else:
+                    totals["unchanged"] += 1
+                saved.append(row)
+                return None
+            return task, chunks, row
+
+        async def flush() -> None:
+            """Embed and write the pending tasks, then delete chunks they no longer have."""
+            nonlocal collection_ready, pending
+            batch, pending = pending, []
+            texts = [chunk for _, chunks, _ in batch for chunk in chunks]
+            vectors = []
+            for start in range(0, len(texts), self.batch_size):
+                vectors.extend(await self.embedder.embed(texts[start:start + self.batch_size]))
+            if not collection_ready and vectors:
+                await self.store.ensure_collection(len(vectors[0]))
+                collection_ready = True
+            points = []
+            stale = []
+            for task, chunks, row in batch:
+                metadata = task_metadata(task)
+                for i, chunk in enumerate(chunks):
+                    points.append({"id": point_id(task["id"], i), "vector": vectors[len(points)], "payload": {"content": chunk, "metadata": metadata}})
+                previous = indexed.get(task["id"])
+                stale.extend(point_id(task["id"], i) for i in range(len(chunks), previous[3] if previous else 0))
+            for start in range(0, len(points), self.batch_size):
+                await self.store.upsert(points[start:start + self.batch_size])
+            if stale:
+                await self.store.delete(stale)
+            saved.extend(row for _, _, row in batch)
+            totals["embedded_tasks"] += len(batch)
+            totals["embedded_chunks"] += len(points)
+            totals["deleted_points"] += len(stale)
+
+        for start in range(0, len(tasks), self.batch_size):
+            for prepared in await asyncio.gather(*(prepare(task) for task in tasks[start:start + self.batch_size])):
+                if prepared is not None:
+                    pending.append(prepared)
+            if sum(len(chunks) for _, chunks, _ in pending) >= self.batch_size:
+                await flush()
+        if pending:
+            await flush()
+
+        removed = []
+        if complete:
+            # Only a complete listing proves a task is gone
+            seen = {task["id"] for task in tasks}
+            removed = [task_id for task_id in indexed if task_id not in seen]
+            if removed:
+                points = [point_id(task_id, i) for task_id in removed for i in range(indexed[task_id][3])]
+                await self.store.delete(points)
+                totals["removed_tasks"] = len(removed)
+                totals["deleted_points"] += len(points)
+        await self.store.commit()
+        self.state.save(saved)
+        if removed:
+            self.state.remove(removed)
+        return totals
+
+
+async def _run_from_args(args: argparse.Namespace) -> dict[str, int]:
+    from .auth import request_token
+    from .http_client import aclose_clients
+    from .main import make_goodday_request
+
+    async def fetch(endpoint: str, subfolders: bool) -> Any:
+        with request_token(os.getenv("GOODDAY_API_TOKEN")):
+            return await make_goodday_request(endpoint, subfolders=subfolders)
+
+    embedder = HashingEmbedder() if args.embedder == "hashing" else OllamaEmbedder(args.ollama_url, args.model)
+    if args.store == "local":
+        from .vector_search import LocalVectorStore
+
+        store = LocalVectorStore(os.path.expanduser(args.vector_path), os.getenv("GOODDAY_API_TOKEN"), embedder.name)
+    else:
+        store = QdrantStore(args.qdrant_url, args.collection, os.getenv("GOODDAY_QDRANT_API_KEY"))
+    state = IndexState(os.path.expanduser(args.state))
+    indexer = VectorIndexer(
+        fetch,
+        embedder,
+        store,
+        state,
+        chunk_size=args.chunk_size,
+        batch_size=args.batch_size,
+        concurrency=args.concurrency,
+        include_closed=not args.open_only,
+    )
+    try:
+        return await indexer.run(full=args.full)
+    finally:
+        state.close()
+        await aclose_clients()
+
+
+def run_cli():
+    """CLI entry point for the incremental vector indexer."""
+    parser = argparse.ArgumentParser(prog="goodday-vector-index", description="Incrementally index Goodday tasks into a vector store")
+    parser.add_argument(
+        "--store",
+        choices=["qdrant", "local"],
+        default="qdrant",
+        help="local writes a memory-mapped index for GOODDAY_SEARCH_BACKEND=vector (requires NumPy)",
+    )
+    parser.add_argument("--vector-path", default=os.getenv("GOODDAY_VECTOR_PATH", "~/.cache/goodday-mcp/vectors"))
+    parser.add_argument("--qdrant-url", default=os.getenv("GOODDAY_QDRANT_URL", "http://localhost:6333"))
+    parser.add_argument("--collection", default=os.getenv("GOODDAY_QDRANT_COLLECTION", "goodday-tasks"))
+    parser.add_argument("--ollama-url", default=os.getenv("GOODDAY_OLLAMA_URL", "http://localhost:11434"))
+    parser.add_argument("--model", default=os.getenv("GOODDAY_EMBEDDING_MODEL", "mxbai-embed-large:latest"))
+    parser.add_argument(
+        "--embedder",
+        choices=["ollama", "hashing"],
+        default="ollama",
+        help="hashing is a dependency-free stand-in for trying the indexer without an embedding server",
+    )
+    parser.add_argument(
+        "--state",
+        default=os.getenv("GOODDAY_VECTOR_STATE_PATH", "~/.cache/goodday-mcp/vector-index.db"),
+        help="SQLite file recording what has been indexed",
+    )
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--concurrency", type=int, default=4, help="Concurrent Goodday requests")
+    parser.add_argument("--open-only", action="store_true", help="Index only open tasks")
+    parser.add_argument("--full", action="store_true", help="Clear the collection and re-embed every task")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    totals = asyncio.run(_run_from_args(args))
+    print(json.dumps(totals))
+
+
+if __name__ == "__main__":
+    run_cli()
@@ -0,0 +1,344 @@
+"""
+Optional in-process vector search over a memory-mapped index (requires NumPy).
+
+The vector indexer can write chunk embeddings to a local directory instead
+of Qdrant (LocalVectorStore). The directory holds a float32 matrix of
+L2-normalized chunk vectors, the chunk texts, and a JSON sidecar mapping
+each row to its point and task. LocalVectorIndex memory-maps the matrix and
+answers search_goodday_tasks with blockwise cosine similarity, top-k
+selection with argpartition, and project/assignee/closed filters applied as
+cached boolean masks (selective filters score only their rows), without a
+webhook or Qdrant round trip.
+"""
+
+import json
+import os
+import uuid
+from collections import OrderedDict
+from typing import Any, NamedTuple, Optional
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is an optional dependency
+    np = None
+
+from .persistent_cache import token_fingerprint
+from .vector_index import Embedder, VectorStore, embedder_from_name
+
+SIDECAR = "index.json"
+# Rows scored per matrix product, bounding the memory of one search
+BLOCK_ROWS = 65536
+# Filter masks kept for repeated searches with the same filters
+MASK_CACHE_SIZE = 32
+# Filters allowing at most this share of rows score only those rows instead of masking all of them
+SELECTIVE_FILTER = 0.5
+# Times a reader re-reads the sidecar when a commit deletes the generation it names
+RELOAD_ATTEMPTS = 3
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("The local vector backend requires NumPy: pip install 'goodday-mcp[vector]'")
+
+
+class VectorHit(NamedTuple):
+    """A task matched by its best chunk: task metadata, the chunk text and its cosine similarity."""
+    metadata: dict
+    content: str
+    score: float
+
+
+def _read_sidecar(path: str) -> Optional[dict]:
+    try:
+        with open(os.path.join(path, SIDECAR), encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+class LocalVectorStore(VectorStore):
+    """Vector store kept as a memory-mappable matrix in a directory, written at the end of each indexing run.
+
+    Args:
+        path: Directory of the index, created on first commit
+        owner: The API token the index is built with; only this token is served from it
+        embedder: Name of the embedder the vectors come from
+    """
+
+    def __init__(self, path: str, owner: str, embedder: str):
+        _require_numpy()
+        self.path = path
+        self.owner = token_fingerprint(owner)
+        self.name = f"local:{os.path.abspath(path)}:{self.owner}"
+        self.embedder = embedder
+        # Point ID -> (vector, task ID, chunk text); vectors of unchanged points stay views into the old matrix
+        self._points: "OrderedDict[str, tuple]" = OrderedDict()
+        self._tasks: dict[str, dict] = {}
+        self._dimensions: Optional[int] = None
+        self._load()
+
+    def _load(self) -> None:
+        sidecar = _read_sidecar(self.path)
+        if not sidecar or sidecar.get("owner") != self.owner or sidecar.get("embedder") != self.embedder:
+            return
+        count, dimensions = sidecar["count"], sidecar["dimensions"]
+        vectors = np.memmap(os.path.join(self.path, sidecar["vectors"]), dtype=np.float32, mode="r", shape=(count, dimensions)) if count else None
+        with open(os.path.join(self.path, sidecar["chunks"]), encoding="utf-8") as f:
+            contents = [json.loads(line) for line in f]
+        for row, (point_id, task_id, _) in enumerate(sidecar["rows"]):
+            self._points[point_id] = (vectors[row], task_id, contents[row])
+        self._tasks = sidecar["tasks"]
+        self._dimensions = dimensions
+
+    async def ensure_collection(self, dimensions: int) -> None:
+        if self._dimensions not in (None, dimensions):
+            raise ValueError(f"Index has {self._dimensions}-dimensional vectors, got {dimensions}")
+        self._dimensions = dimensions
+
+    async def upsert(self, points: list[dict]) -> None:
+        for point in points:
+            vector = np.asarray(point["vector"], dtype=np.float32)
+            vector /= np.linalg.norm(vector) or 1.0
+            metadata = point["payload"]["metadata"]
+            self._tasks[metadata["taskId"]] = metadata
+            self._points[point["id"]] = (vector, metadata["taskId"], point["payload"]["content"])
+
+    async def set_metadata(self, point_ids: list[str], metadata: dict) -> None:
+        self._tasks[metadata["taskId"]] = metadata
+
+    async def delete(self, point_ids: list[str]) -> None:
+        for point_id in point_ids:
+            self._points.pop(point_id, None)
+
+    async def clear(self) -> None:
+        self._points.clear()
+        self._tasks.clear()
+
+    async def commit(self) -> None:
+        """Write a new generation of the matrix and chunk files, then switch the sidecar to it."""
+        os.makedirs(self.path, exist_ok=True)
+        previous = _read_sidecar(self.path)
+        generation = uuid.uuid4().hex[:12]
+        vectors_file, chunks_file = f"vectors-{generation}.f32", f"chunks-{generation}.jsonl"
+        rows = []
+        with open(os.path.join(self.path, vectors_file), "wb") as vectors, open(os.path.join(self.path, chunks_file), "wb") as chunks:
+            batch = []
+            for point_id, (vector, task_id, content) in self._points.items():
+                # The chunk's byte offset lets a search read just the chunks it returns
+                rows.append([point_id, task_id, chunks.tell()])
+                batch.append(vector)
+                chunks.write((json.dumps(content) + "\n").encode("utf-8"))
+                if len(batch) >= BLOCK_ROWS:
+                    np.stack(batch).astype(np.float32).tofile(vectors)
+                    batch = []
+            if batch:
+                np.stack(batch).astype(np.float32).tofile(vectors)
+        task_ids = {task_id for _, task_id, _ in rows}
+        sidecar = {
+            "owner": self.owner,
+            "embedder": self.embedder,
+            "dimensions": self._dimensions or 0,
+            "count": len(rows),
+            "vectors": vectors_file,
+            "chunks": chunks_file,
+            "rows": rows,
+            "tasks": {task_id: metadata for task_id, metadata in self._tasks.items() if task_id in task_ids},
+        }
+        temporary = os.path.join(self.path, f"{SIDECAR}.{generation}")
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump(sidecar, f)
+        os.replace(temporary, os.path.join(self.path, SIDECAR))
+        if previous:
+            # Open readers keep their memory maps of the old matrix and chunks until they reload
+            for name in (previous.get("vectors"), previous.get("chunks")):
+                if name:
+                    try:
+                        os.remove(os.path.join(self.path, name))
+                    except FileNotFoundError:
+                        pass
+        self._points.clear()
+        self._load()
+
+
+class LocalVectorIndex:
+    """Read side of a LocalVectorStore directory, reloaded whenever an indexing run replaces it.
+
+    Args:
+        path: Directory written by the indexer
+        ollama_url: Ollama server used to embed queries when the index was built with Ollama
+    """
+
+    def __init__(self, path: str, ollama_url: str = "http://localhost:11434"):
+        _require_numpy()
+        self.path = path
+        self.ollama_url = ollama_url
+        self._loaded_mtime: Optional[float] = None
+        self._sidecar: dict = {}
+        self._vectors = None
+        self._chunks = None
+        self._row_tasks: list[str] = []
+        self._closed = None
+        self._project_codes = None
+        self._user_codes = None
+        self._project_index: dict = {}
+        self._user_index: dict = {}
+        self._masks: "OrderedDict[tuple, Any]" = OrderedDict()
+        self._embedder: Optional[Embedder] = None
+        self.searches = 0
+
+    @classmethod
+    def from_env(cls) -> Optional["LocalVectorIndex"]:
+        """Build the index from GOODDAY_VECTOR_PATH, or return None if it is not set."""
+        path = os.getenv("GOODDAY_VECTOR_PATH")
+        if not path:
+            return None
+        return cls(os.path.expanduser(path), os.getenv("GOODDAY_OLLAMA_URL", "http://localhost:11434"))
+
+    def _reload(self) -> None:
+        """Map the current generation of the index if an indexing run replaced it.
+
+        Both the matrix and the chunk texts stay memory-mapped, so a search
+        keeps reading its generation after a commit deletes the files.
+        """
+        for _ in range(RELOAD_ATTEMPTS):
+            try:
+                mtime = os.stat(os.path.join(self.path, SIDECAR)).st_mtime
+            except FileNotFoundError:
+                raise ValueError(f"No vector index at {self.path}; build it with goodday-vector-index --store local")
+            if mtime == self._loaded_mtime:
+                return
+            sidecar = _read_sidecar(self.path)
+            count, dimensions = sidecar["count"], sidecar["dimensions"]
+            try:
+                vectors = np.memmap(os.path.join(self.path, sidecar["vectors"]), dtype=np.float32, mode="r", shape=(count, dimensions)) if count else np.zeros((0, dimensions), dtype=np.float32)
+                chunks = np.memmap(os.path.join(self.path, sidecar["chunks"]), dtype=np.uint8, mode="r") if count else None
+                break
+            except FileNotFoundError:
+                # A commit replaced this generation between reading the sidecar and mapping its files
+                continue
+        else:
+            raise ValueError("The vector index is being rewritten; try again")
+        self._vectors, self._chunks = vectors, chunks
+        tasks = sidecar["tasks"]
+        self._row_tasks = [task_id for _, task_id, _ in sidecar["rows"]]
+        metadata = [tasks.get(task_id, {}) for task_id in self._row_tasks]
+        self._closed = np.fromiter((bool(m.get("closed")) for m in metadata), dtype=bool, count=count)
+        # Projects and assignees are coded as integers so filters become vectorized comparisons
+        self._project_index = {}
+        self._user_index = {}
+        self._project_codes = np.fromiter((self._project_index.setdefault(m.get("projectId"), len(self._project_index)) for m in metadata), dtype=np.int32, count=count)
+        self._user_codes = np.fromiter((self._user_index.setdefault(m.get("assignedToUserId"), len(self._user_index)) for m in metadata), dtype=np.int32, count=count)
+        self._masks.clear()
+        if self._embedder is None or self._embedder.name != sidecar["embedder"]:
+            self._embedder = embedder_from_name(sidecar["embedder"], self.ollama_url)
+        self._sidecar = sidecar
+        self._loaded_mtime = mtime
+
+    def serves(self, api_token: str) -> bool:
+        """Whether queries made with api_token may be answered from the index."""
+        self._reload()
+        return self._sidecar.get("owner") == token_fingerprint(api_token)
+
+    def _mask(self, project_ids: Optional[set], user_ids: Optional[set], include_closed: bool) -> tuple:
+        """Return the row mask of a filter (None if every row is allowed) and, if it is selective, the allowed rows."""
+        if project_ids is None and user_ids is None and include_closed:
+            return None, None
+        key = (frozenset(project_ids) if project_ids is not None else None, frozenset(user_ids) if user_ids is not None else None, include_closed)
+        cached = self._masks.get(key)
+        if cached is None:
+            mask = np.ones(len(self._row_tasks), dtype=bool) if include_closed else ~self._closed
+            if project_ids is not None:
+                codes = [self._project_index[p] for p in project_ids if p in self._project_index]
+                mask &= np.isin(self._project_codes, codes)
+            if user_ids is not None:
+                codes = [self._user_index[u] for u in user_ids if u in self._user_index]
+                mask &= np.isin(self._user_codes, codes)
+            rows = np.flatnonzero(mask) if mask.sum() <= SELECTIVE_FILTER * len(mask) else None
+            cached = self._masks[key] = (mask, rows)
+            while len(self._masks) > MASK_CACHE_SIZE:
+                self._masks.popitem(last=False)
+        else:
+            self._masks.move_to_end(key)
+        return cached
+
+    async def search(
+        self,
+        query: str,
+        limit: int = 10,
+        project_ids: Optional[set] = None,
+        user_ids: Optional[set] = None,
+        include_closed: bool = False,
+    ) -> list[VectorHit]:
+        """Return the tasks whose best chunk is most similar to the query."""
+        self._reload()
+        self.searches += 1
+        if not self._row_tasks:
+            return []
+        while True:
+            embedder = self._embedder
+            embedded = (await embedder.embed([query]))[0]
+            # Nothing below awaits, so the generation loaded here is the one the search reads
+            self._reload()
+            if self._embedder is embedder:
+                break
+        count = len(self._row_tasks)
+        if not count:
+            return []
+        vector = np.asarray(embedded, dtype=np.float32)
+        vector /= np.linalg.norm(vector) or 1.0
+        mask, selected = self._mask(project_ids, user_ids, include_closed)
+        total = count if selected is None else len(selected)
+        if not total:
+            return []
+
+        # Several chunks of one task can match, so keep more candidates than results
+        candidates = min(total, limit * 4)
+        best_rows, best_scores = [], []
+        for start in range(0, total, BLOCK_ROWS):
+            if selected is not None:
+                block = selected[start:start + BLOCK_ROWS]
+                scores = self._vectors[block] @ vector
+            else:
+                block = None
+                scores = self._vectors[start:start + BLOCK_ROWS] @ vector
+                if mask is not None:
+                    scores = np.where(mask[start:start + BLOCK_ROWS], scores, -np.inf)
+            top = min(candidates, len(scores))
+            picked = np.argpartition(scores, len(scores) - top)[-top:]
+            best_rows.append(block[picked] if block is not None else picked + start)
+            best_scores.append(scores[picked])
+        rows = np.concatenate(best_rows)
+        scores = np.concatenate(best_scores)
+        order = np.argsort(-scores)
+
+        hits: list[tuple[int, float]] = []
+        seen = set()
+        for i in order:
+            if not np.isfinite(scores[i]) or len(hits) >= limit:
+                break
+            task_id = self._row_tasks[rows[i]]
+            if task_id not in seen:
+                seen.add(task_id)
+                hits.append((int(rows[i]), float(scores[i])))
+        contents = self._read_chunks({row for row, _ in hits})
+        tasks = self._sidecar["tasks"]
+        return [VectorHit(tasks.get(self._row_tasks[row], {}), contents.get(row, ""), score) for row, score in hits]
+
+    def _read_chunks(self, rows: set) -> dict[int, str]:
+        contents = {}
+        if not rows:
+            return contents
+        offsets = self._sidecar["rows"]
+        for row in rows:
+            end = offsets[row + 1][2] if row + 1 < len(offsets) else len(self._chunks)
+            contents[row] = json.loads(self._chunks[offsets[row][2]:end].tobytes())
+        return contents
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "chunks": len(self._row_tasks),
+            "tasks": len(self._sidecar.get("tasks", {})),
+            "embedder": self._sidecar.get("embedder"),
+            "cached_masks": len(self._masks),
+            "searches": self.searches,
+        }
@@ -7,6 +7,7 @@ version: 1.1.0
 required_open_webui_version: 0.5.3
 """
 
+import difflib
 import os
 import re
 import httpx
@@ -34,8 +35,8 @@ class Tools:
     def __init__(self):
         self.valves = self.Valves()
         self.user_agent = "goodday-openwebui-complete/1.1.0"
-        self._user_cache = None  # Cache for user data
-        self._cache_expiry = 0  # Cache expiry timestamp
+        self._user_index = None  # Users by email, ID, name and name word, and names by ID
+        self._user_index_time = 0  # When the user index was fetched
 
     async def _make_goodday_request(
         self, endpoint: str, method: str = "GET", data: dict = None, subfolders: bool = True
@@ -214,58 +215,37 @@ class Tools:
 """.strip()
 
     async def _get_user_mapping(self, __event_emitter__: Callable = None) -> dict:
-        """Get user ID to name mapping for displaying user names instead of IDs. Uses caching."""
-        import time
+        """Get user ID to name mapping for displaying user names instead of IDs. Uses the cached user index."""
+        cached = self._user_index_is_fresh()
+        if __event_emitter__:
+            description = (
+                f"Using cached user data ({len(self._user_index['users'])} users)"
+                if cached
+                else "Fetching fresh user data for name mapping..."
+            )
+            await __event_emitter__(
+                {
+                    "type": "status",
+                    "data": {"description": description, "done": False},
+                }
+            )
 
-        # Check if cache is still valid (5 minutes TTL)
-        current_time = time.time()
-        if self._user_cache and (current_time - self._cache_expiry) < 300:
-            if __event_emitter__:
-                await __event_emitter__(
-                    {
-                        "type": "status",
-                        "data": {
-                            "description": f"Using cached user data ({len(self._user_cache)} users)",
-                            "done": False,
-                        },
-                    }
-                )
-            return self._user_cache
+        index = await self._get_user_index()
+        if not index:
+            return {}
 
-        if __event_emitter__:
+        if __event_emitter__ and not cached:
             await __event_emitter__(
                 {
                     "type": "status",
                     "data": {
-                        "description": "Fetching fresh user data for name mapping...",
+                        "description": f"Loaded and cached {len(index['names'])} users for name mapping",
                         "done": False,
                     },
                 }
             )
 
-        users_data = await self._make_goodday_request("users")
-        user_id_to_name = {}
-        if isinstance(users_data, list):
-            for u in users_data:
-                if isinstance(u, dict):
-                    user_id_to_name[u.get("id")] = u.get("name", "Unknown")
-
-            if __event_emitter__:
-                await __event_emitter__(
-                    {
-                        "type": "status",
-                        "data": {
-                            "description": f"Loaded and cached {len(user_id_to_name)} users for name mapping",
-                            "done": False,
-                        },
-                    }
-                )
-
-            # Update cache
-            self._user_cache = user_id_to_name
-            self._cache_expiry = current_time
-
-        return user_id_to_name
+        return index["names"]
 
     def _create_user_display_function(self, user_id_to_name: dict):
         """Create a user display function with the given user mapping."""
@@ -480,10 +460,100 @@ class Tools:
 
         return result_sprint, available_sprints
 
+    def _user_index_is_fresh(self) -> bool:
+        """Whether the cached user index is under 5 minutes old."""
+        return self._user_index is not None and (time.time() - self._user_index_time) < 300
+
+    async def _get_user_index(self) -> dict:
+        """Get users indexed by email, ID, normalized name and name word, and user names by ID. Uses caching."""
+        if self._user_index_is_fresh():
+            return self._user_index
+        current_time = time.time()
+
+        users_data = await self._make_goodday_request("users")
+        if not isinstance(users_data, list):
+            return None
+
+        index = {"users": [], "email": {}, "id": {}, "name": {}, "token": {}, "names": {}}
+        for u in users_data:
+            if not isinstance(u, dict):
+                continue
+            index["users"].append(u)
+            index["names"][u.get("id")] = u.get("name", "Unknown")
+            email = (u.get("email") or "").strip().lower()
+            name = self._normalize_name(u.get("name") or "")
+            if email:
+                index["email"].setdefault(email, u)
+            if u.get("id"):
+                index["id"].setdefault(str(u["id"]), u)
+            if name:
+                index["name"].setdefault(name, []).append(u)
+            tokens = set(name.split()) | set(
+                self._normalize_name(email.split("@", 1)[0]).split()
+            )
+            for token in tokens:
+                index["token"].setdefault(token, []).append(u)
+
+        self._user_index = index
+        self._user_index_time = current_time
+        return index
+
+    def _normalize_name(self, name: str) -> str:
+        return " ".join(part for part in re.split(r"[\W_]+", name.lower()) if part)
+
+    def _match_user(self, index: dict, user_identifier: str) -> tuple:
+        """Match a user by exact email or ID, full name, name words, then spelling.
+
+        Returns (user_dict or None, candidate_users); a name shared by several
+        users is ambiguous and returns all of them.
+        """
+        identifier = user_identifier.strip()
+        user = index["email"].get(identifier.lower()) or index["id"].get(identifier)
+        if user:
+            return user, [user]
+
+        query = self._normalize_name(identifier)
+        if not query:
+            return None, []
+        named = index["name"].get(query)
+        if named:
+            return (named[0] if len(named) == 1 else None), named
+
+        # Every query word must be a whole word of the name or email address
+        matches = None
+        for token in query.split():
+            ids = {id(u) for u in index["token"].get(token, [])}
+            matches = ids if matches is None else matches & ids
+        if matches:
+            users = [u for u in index["users"] if id(u) in matches]
+            return (users[0] if len(users) == 1 else None), users
+
+        # Partial names, then misspellings
+        users = [
+            u
+            for name, named in index["name"].items()
+            if query in name
+            for u in named
+        ]
+        if users:
+            return (users[0] if len(users) == 1 else None), users
+        close = difflib.get_close_matches(query, list(index["name"]), n=5, cutoff=0.75)
+        users = [u for name in close for u in index["name"][name]]
+        ratios = [difflib.SequenceMatcher(None, query, name).ratio() for name in close]
+        # The closest spelling wins unless another user's name is as close
+        unique = close and len(index["name"][close[0]]) == 1
+        if unique and (len(ratios) == 1 or ratios[0] > ratios[1]):
+            return users[0], users
+        return None, users
+
     async def _find_user_by_name_or_email(
         self, user_identifier: str, __event_emitter__: Callable = None
     ) -> tuple:
-        """Find a user by name or email (case-insensitive). Returns (user_dict, available_users_list)."""
+        """Find a user by name or email (case-insensitive). Returns (user_dict, available_users_list).
+
+        Users are indexed once and cached for 5 minutes. When the name is
+        ambiguous no user is returned and the list holds every matching user.
+        """
         if __event_emitter__:
             await __event_emitter__(
                 {
@@ -495,27 +565,15 @@ class Tools:
                 }
             )
 
-        users_data = await self._make_goodday_request("users")
-        if not users_data or not isinstance(users_data, list):
+        index = await self._get_user_index()
+        if not index:
             return None, []
 
-        user_lower = user_identifier.lower().strip()
-        matched_user = None
-        available_users = []
-
-        for u in users_data:
-            if not isinstance(u, dict):
-                continue
-            available_users.append(u.get("name", "Unknown"))
-            name = u.get("name", "").lower().strip()
-            email = u.get("email", "").lower().strip()
-
-            if user_lower == name or user_lower == email:
-                matched_user = u
-                break
-            if user_lower in name or user_lower in email:
-                matched_user = u
-                break
+        matched_user, candidates = self._match_user(index, user_identifier)
+        # On a miss list the users that matched (all of them if none did)
+        available_users = [
+            u.get("name", "Unknown") for u in (candidates or index["users"])
+        ]
 
         if __event_emitter__:
             if matched_user:
@@ -1270,7 +1328,7 @@ Please try rephrasing your query with one of these patterns."""
             )
 
             if not matched_user:
-                return f"User '{user}' not found. Available users: {', '.join(available_users[:10])}{'...' if len(available_users) > 10 else ''}"
+                return f"User '{user}' not found or ambiguous. Available users: {', '.join(available_users[:10])}{'...' if len(available_users) > 10 else ''}"
 
             user_id = matched_user.get("id")
             actual_user_name = matched_user.get("name")